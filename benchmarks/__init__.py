@@ -0,0 +1,9 @@
+"""
+Performance benchmarks for the API.
+
+Each module is a standalone script that creates a throwaway test database, seeds
+it and prints its measurements. They use the configured settings (cache
+included), so run them against the same services as the deployment:
+
+    python -m benchmarks.task_list
+"""
@@ -0,0 +1,71 @@
+"""
+Authentication overhead per request: the stock JWTAuthentication, which loads
+the user, against TokenUserAuthentication, which builds it from the token and
+checks its cached status.
+
+"authenticate" times only the authentication class; "GET /tasks/" is a whole
+request served from the page cache, where authentication is most of the work.
+
+    python -m benchmarks.auth [--repeat 2000]
+"""
+
+import argparse
+from unittest import mock
+
+from benchmarks.utils import (
+    benchmark_database,
+    count_queries,
+    create_user,
+    measure,
+    print_table,
+    seed_tasks,
+    setup_django,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=2_000)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.test import APIClient, APIRequestFactory
+    from rest_framework.views import APIView
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from users.authentication import TokenUserAuthentication
+
+    rows = []
+    with benchmark_database():
+        user = create_user()
+        seed_tasks(user, 100)
+        header = f"Bearer {AccessToken.for_user(user)}"
+        request = APIRequestFactory().get("/tasks/", HTTP_AUTHORIZATION=header)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=header)
+        for authentication_class in (JWTAuthentication, TokenUserAuthentication):
+            authentication = authentication_class()
+            with mock.patch.object(
+                APIView, "authentication_classes", [authentication_class]
+            ):
+                client.get("/tasks/")  # Warms the page and the user status caches
+                for name, func in (
+                    ("authenticate", lambda a=authentication: a.authenticate(request)),
+                    ("GET /tasks/", lambda: client.get("/tasks/")),
+                ):
+                    queries = count_queries(func)
+                    result = measure(func, args.repeat)
+                    rows.append({
+                        "authentication": authentication_class.__name__,
+                        "measured": name,
+                        "queries": queries,
+                        "mean ms": result["mean"],
+                        "p50 ms": result["p50"],
+                        "p99 ms": result["p99"],
+                    })
+    print_table(f"Authentication overhead ({args.repeat} runs)", rows)
+
+
+if __name__ == "__main__":
+    main()
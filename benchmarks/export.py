@@ -0,0 +1,98 @@
+"""
+GET /tasks/export/ against paging GET /tasks/ 100 at a time, for accounts of
+growing size.
+
+The export streams from a server-side cursor, so its peak memory (measured
+with tracemalloc while the response is consumed) stays flat as the account
+grows; paging pays a COUNT and a deeper OFFSET per page.
+
+    python -m benchmarks.export [--sizes 10000 100000] [--page-size 100]
+"""
+
+import argparse
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from benchmarks.utils import (
+    benchmark_database,
+    count_queries,
+    create_user,
+    print_table,
+    seed_tasks,
+    setup_django,
+)
+
+
+def run(func: Callable[[], int]) -> dict[str, Any]:
+    """Time, peak traced memory, bytes and queries of one full read."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = 0
+
+    def read() -> None:
+        nonlocal size
+        size = func()
+
+    queries = count_queries(read)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "seconds": elapsed,
+        "peak MB": peak / 1024 / 1024,
+        "MB sent": size / 1024 / 1024,
+        "queries": queries,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.test import APIClient
+
+    from tasks.cache import bump_task_cache_generation
+
+    rows = []
+    with benchmark_database():
+        for size in args.sizes:
+            user = create_user()
+            seed_tasks(user, size)
+            client = APIClient()
+            client.force_authenticate(user)
+
+            def export(params: dict[str, str], client: APIClient = client) -> int:
+                response = client.get("/tasks/export/", params)
+                return sum(len(chunk) for chunk in response.streaming_content)
+
+            def pages(user_id: Any = user.id, client: APIClient = client) -> int:  # noqa: ANN401
+                bump_task_cache_generation(user_id)
+                sent, page = 0, 1
+                while page:
+                    response = client.get(
+                        "/tasks/", {"page": page, "page_size": args.page_size}
+                    )
+                    sent += len(response.content)
+                    page = page + 1 if response.data["next"] else 0
+                return sent
+
+            cases = {
+                "export ndjson": lambda export=export: export({}),
+                "export csv.gz": lambda export=export: export(
+                    {"format": "csv", "compress": "gzip"}
+                ),
+                f"pages of {args.page_size}": pages,
+            }
+            for name, func in cases.items():
+                print(f"{size} tasks: {name}...")
+                rows.append({"tasks": size, "read": name, **run(func)})
+    print_table("Reading a whole account", rows)
+
+
+if __name__ == "__main__":
+    main()
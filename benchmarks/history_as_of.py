@@ -0,0 +1,130 @@
+"""
+GET /tasks/{id}/as-of/ on a task with 10k versions, against fetching its whole
+history and replaying it on the client, the only way before the endpoint.
+
+The history is stored in full and as deltas with a few snapshot intervals.
+The endpoint reads the entries from the nearest snapshot to the requested
+version, so its latency follows the interval and not the history length.
+
+    python -m benchmarks.history_as_of [--versions 10000] [--intervals 20 100]
+"""
+
+import argparse
+import random
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from benchmarks.utils import (
+    SEED_BATCH_SIZE,
+    benchmark_database,
+    count_queries,
+    create_user,
+    measure,
+    print_table,
+    setup_django,
+)
+
+if TYPE_CHECKING:
+    from tasks.models import Task
+    from users.models import User
+
+
+def seed_versions(user: "User", versions: int, storage: str, interval: int) -> "Task":
+    """A task edited ``versions`` times, its history stored with ``storage``."""
+    from django.test.utils import override_settings
+
+    from tasks.models import Task, TaskHistory
+
+    task = Task.objects.create(title=f"History {storage} {interval}", user=user)
+    words = [f"word{number}" for number in range(300)]
+    state = {"title": task.title, "description": " ".join(words), "is_completed": False}
+    entries = []
+    with override_settings(
+        TASK_HISTORY_STORAGE=storage, TASK_HISTORY_SNAPSHOT_INTERVAL=interval
+    ):
+        for version in range(1, versions + 1):
+            words[version * 7 % len(words)] = f"edit{version}"
+            new = {**state, "description": " ".join(words)}
+            if version % 5 == 0:
+                new["is_completed"] = not state["is_completed"]
+            changes = {
+                field: {"old": state[field], "new": new[field]}
+                for field in state
+                if state[field] != new[field]
+            }
+            entries.append(TaskHistory(
+                task=task,
+                change_by=user,
+                version=version,
+                change_date=task.created_at + timedelta(minutes=version),
+                **TaskHistory.encode(version, changes, state),
+            ))
+            state = new
+    TaskHistory.objects.bulk_create(entries, batch_size=SEED_BATCH_SIZE)
+    Task.objects.filter(pk=task.pk).update(latest_version=versions, **state)
+    return task
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--versions", type=int, default=10_000)
+    parser.add_argument("--intervals", type=int, nargs="+", default=[20, 100])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--replay-repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.test import APIClient
+
+    from tasks.domain.history import replay
+
+    rng = random.Random(0)  # noqa: S311
+    rows = []
+    params: dict[str, Any] = {}  # Of the next request, set by the setups
+    with benchmark_database():
+        user = create_user()
+        client = APIClient()
+        client.force_authenticate(user)
+        layouts = [("full", 1), *(("delta", interval) for interval in args.intervals)]
+        for storage, interval in layouts:
+            print(f"Seeding {args.versions} versions ({storage}/{interval})...")
+            task = seed_versions(user, args.versions, storage, interval)
+            url = f"/tasks/{task.pk}/as-of/"
+
+            def pick_version() -> None:
+                params.clear()
+                params["version"] = rng.randint(1, args.versions)
+
+            def pick_time(task: "Task" = task) -> None:
+                params.clear()
+                at = task.created_at + timedelta(minutes=rng.randint(1, args.versions))
+                params["at"] = at.isoformat()
+
+            def request(url: str = url) -> None:
+                response = client.get(url, params)
+                assert response.status_code == 200  # noqa: S101
+
+            def replay_all(task: "Task" = task) -> None:
+                entries = client.get("/tasks-history/", {"task": str(task.pk)}).json()
+                entries.sort(key=lambda entry: entry["version"])
+                replay({**entry, "delta": None} for entry in entries)
+
+            cases = (
+                ("as-of ?version=", pick_version, request, args.repeat),
+                ("as-of ?at=", pick_time, request, args.repeat),
+                ("whole history", None, replay_all, args.replay_repeat),
+            )
+            for name, setup, func, repeat in cases:
+                rows.append({
+                    "storage": storage if storage == "full" else f"delta/{interval}",
+                    "read": name,
+                    **measure(func, repeat, setup=setup),
+                    "queries": count_queries(func),
+                })
+    print_table(
+        f"Task state at a past version, {args.versions} versions (latency in ms)", rows
+    )
+
+
+if __name__ == "__main__":
+    main()
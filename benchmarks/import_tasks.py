@@ -0,0 +1,87 @@
+"""
+POST /tasks/import/ against one POST /tasks/ per task, for files of growing
+size.
+
+The import reads the file in chunks of IMPORT_CHUNK_SIZE lines, so the peak
+memory of the job (measured with tracemalloc, the file already uploaded) stays
+flat as the file grows. The POSTs are timed on a sample and reported per task.
+
+    python -m benchmarks.import_tasks [--sizes 10000 50000] [--sample 500]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Any
+
+from benchmarks.utils import benchmark_database, create_user, print_table, setup_django
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000])
+    parser.add_argument("--sample", type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from django.test import override_settings
+    from rest_framework.test import APIClient
+
+    from tasks.services.import_service import run_import_job
+
+    rows: list[dict[str, Any]] = []
+    with benchmark_database(), override_settings(TASK_IMPORT_MODE="queue"):
+        for size in args.sizes:
+            client = APIClient()
+            client.force_authenticate(create_user())
+            content = "".join(
+                json.dumps({"title": f"Task {number}", "is_completed": number % 2 == 0})
+                + "\n"
+                for number in range(size)
+            ).encode()
+            response = client.post(
+                "/tasks/import/",
+                {"file": SimpleUploadedFile("tasks.ndjson", content)},
+            )
+            job_id = response.json()["id"]
+            print(f"{size} tasks: import...")
+            tracemalloc.start()
+            start = time.perf_counter()
+            job = run_import_job(job_id)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            rows.append({
+                "tasks": size,
+                "write": "import",
+                "created": job.created if job else 0,
+                "seconds": elapsed,
+                "ms per task": elapsed / size * 1000,
+                "peak MB": peak / 1024 / 1024,
+            })
+
+        client = APIClient()
+        client.force_authenticate(create_user())
+        print(f"{args.sample} POSTs...")
+        tracemalloc.start()  # Same overhead as the import
+        start = time.perf_counter()
+        for number in range(args.sample):
+            client.post("/tasks/", {"title": f"Task {number}"}, format="json")
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        rows.append({
+            "tasks": args.sample,
+            "write": "POST /tasks/",
+            "created": args.sample,
+            "seconds": elapsed,
+            "ms per task": elapsed / args.sample * 1000,
+            "peak MB": peak / 1024 / 1024,
+        })
+    print_table("Creating tasks from a file", rows)
+
+
+if __name__ == "__main__":
+    main()
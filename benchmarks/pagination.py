@@ -0,0 +1,75 @@
+"""
+Page 1 versus page 5000 of GET /tasks/ with page numbers and with the cursor.
+
+Page numbers pay an OFFSET scan and a COUNT(*) that grow with the page, the
+keyset cursor is a range scan on (user, created_at, id) at any depth. The list
+page cache is bypassed so every request reaches the database.
+
+    python -m benchmarks.pagination [--repeat 30] [--page-size 10]
+"""
+
+import argparse
+
+from benchmarks.utils import (
+    benchmark_database,
+    create_user,
+    measure,
+    print_table,
+    seed_tasks,
+    setup_django,
+)
+
+DEEP_PAGE = 5000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--page-size", type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.test import APIClient
+
+    from tasks.cache import bump_task_cache_generation
+    from tasks.models import Task
+    from tasks.pagination import TaskCursorPagination
+
+    with benchmark_database():
+        user = create_user()
+        seed_tasks(user, DEEP_PAGE * args.page_size)
+        client = APIClient()
+        client.force_authenticate(user)
+
+        paginator = TaskCursorPagination()
+        paginator.ordering = ["-created_at", "-id"]
+        last_of_previous_page = Task.objects.filter(user=user).order_by(
+            *paginator.ordering
+        )[(DEEP_PAGE - 1) * args.page_size - 1]
+        deep_cursor = paginator.encode_cursor(last_of_previous_page)
+
+        cases = {
+            ("page number", 1): {"page": 1},
+            ("page number", DEEP_PAGE): {"page": DEEP_PAGE},
+            ("cursor", 1): {"cursor": ""},
+            ("cursor", DEEP_PAGE): {"cursor": deep_cursor},
+        }
+        rows = []
+        for (mode, page), params in cases.items():
+            def request(params: dict = params) -> None:
+                response = client.get(
+                    "/tasks/", {**params, "page_size": args.page_size}
+                )
+                assert response.status_code == 200  # noqa: S101
+
+            timings = measure(
+                request,
+                args.repeat,
+                setup=lambda: bump_task_cache_generation(user.id),
+            )
+            rows.append({"mode": mode, "page": page, **timings})
+    print_table(f"GET /tasks/ latency (ms), page_size={args.page_size}", rows)
+
+
+if __name__ == "__main__":
+    main()
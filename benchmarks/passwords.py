@@ -0,0 +1,61 @@
+"""
+Password hashing cost per hasher profile: logins/sec on one core, and on all
+of them through the hasher thread pool used by the async login.
+
+    python -m benchmarks.passwords [--repeat 20] [--logins 50]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from importlib.util import find_spec
+
+from benchmarks.utils import measure, print_table, setup_django
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--logins", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.contrib.auth.hashers import make_password, verify_password
+    from django.test import override_settings
+
+    from users.hashers import run_hasher
+
+    async def parallel_logins(encoded: str) -> float:
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(run_hasher(verify_password, "password", encoded) for _ in range(args.logins))  # noqa: E501
+        )
+        return args.logins / (time.perf_counter() - start)
+
+    rows = []
+    for name, hasher in settings.PASSWORD_HASHER_PROFILES.items():
+        if name == "argon2" and find_spec("argon2") is None:
+            print("argon2: skipped, argon2-cffi is not installed")
+            continue
+        with override_settings(PASSWORD_HASHERS=[hasher]):
+            encoded = make_password("password")
+            hashing = measure(lambda: make_password("password"), args.repeat)
+            verifying = measure(
+                lambda encoded=encoded: verify_password("password", encoded),
+                args.repeat,
+            )
+            pool_rate = asyncio.run(parallel_logins(encoded))
+        rows.append({
+            "profile": name,
+            "hash ms": hashing["mean"],
+            "verify ms": verifying["mean"],
+            "logins/s, 1 core": 1000 / verifying["mean"],
+            f"logins/s, pool of {os.cpu_count()}": pool_rate,
+        })
+    print_table("Password hashing (costs from PASSWORD_HASHER_COST)", rows)
+
+
+if __name__ == "__main__":
+    main()
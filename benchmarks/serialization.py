@@ -0,0 +1,84 @@
+"""
+Per-item serialization cost of list pages: ModelSerializer vs .values() rows.
+
+Both paths include fetching the page, so the numbers compare what a list
+request really pays per item.
+
+    python -m benchmarks.serialization [--repeat 200]
+"""
+
+import argparse
+
+from benchmarks.utils import (
+    benchmark_database,
+    create_user,
+    measure,
+    print_table,
+    seed_history,
+    seed_tasks,
+    setup_django,
+)
+
+PAGE_SIZES = (10, 100)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from tasks.models import Task, TaskHistory
+    from tasks.serializers import (
+        TaskHistoryReadSerializer,
+        TaskHistorySerializer,
+        TaskReadSerializer,
+        TaskSerializer,
+    )
+
+    rows = []
+    with benchmark_database():
+        user = create_user()
+        seed_tasks(user, max(PAGE_SIZES))
+        seed_history(user, versions_per_task=1)
+        cases = (
+            (
+                "tasks",
+                Task.objects.filter(user=user).select_related("user"),
+                TaskSerializer,
+                TaskReadSerializer,
+            ),
+            (
+                "history",
+                TaskHistory.objects.filter(task__user=user),
+                TaskHistorySerializer,
+                TaskHistoryReadSerializer,
+            ),
+        )
+        for name, queryset, model_serializer, read_serializer in cases:
+            for page_size in PAGE_SIZES:
+                page = queryset[:page_size]
+                before = measure(
+                    lambda page=page, serializer=model_serializer: serializer(
+                        page.all(), many=True
+                    ).data,
+                    args.repeat,
+                )
+                after = measure(
+                    lambda page=page, serializer=read_serializer: serializer(
+                        serializer.prepare(page.all())
+                    ).data,
+                    args.repeat,
+                )
+                rows.append({
+                    "listing": name,
+                    "page_size": page_size,
+                    "model us/item": before["mean"] * 1000 / page_size,
+                    "values us/item": after["mean"] * 1000 / page_size,
+                    "speedup": before["mean"] / after["mean"],
+                })
+    print_table("List serialization cost (microseconds per item)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Requests/sec and latency of the sync deployment (gunicorn + WSGI) against the
+async one (uvicorn + ASGI with ASYNC_API=True), at the same worker count.
+
+The servers are started as subprocesses with the current environment, so they
+need a database they can share: this benchmark uses the configured database
+(migrated, not SQLite in memory), creates a throwaway user with tasks and
+deletes it at the end.
+
+    python -m benchmarks.server_load [--workers 1] [--concurrency 32] [--duration 10]
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
+
+from benchmarks.utils import (
+    create_user,
+    print_table,
+    seed_tasks,
+    setup_django,
+    summarize,
+)
+
+HOST = "127.0.0.1"
+ENDPOINTS = (
+    "/tasks/",
+    "/tasks/?status=pending&ordering=title&page_size=100",
+    "/tasks/stats/",
+    "/tasks/metrics/?days=30",
+)
+SERVERS = {
+    "sync (gunicorn, WSGI)": (
+        [sys.executable, "-m", "gunicorn", "core.wsgi:application",
+         "--bind", "{host}:{port}"],
+        {"ASYNC_API": "False"},
+    ),
+    "async (uvicorn, ASGI)": (
+        [sys.executable, "-m", "uvicorn", "core.asgi:application",
+         "--host", "{host}", "--port", "{port}", "--no-access-log"],
+        {"ASYNC_API": "True"},
+    ),
+}
+
+
+@contextmanager
+def run_server(command: list[str], env: dict[str, str], port: int, workers: int) -> Iterator[None]:  # noqa: E501
+    args = [part.format(host=HOST, port=port) for part in command]
+    process = subprocess.Popen(  # noqa: S603
+        [*args, "--workers", str(workers)],
+        env={**os.environ, **env},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            with suppress(OSError):
+                urllib.request.urlopen(f"http://{HOST}:{port}/health/", timeout=1)
+                break
+            if time.monotonic() > deadline or process.poll() is not None:
+                msg = f"Server did not start: {' '.join(args)}"
+                raise RuntimeError(msg)
+            time.sleep(0.2)
+        yield
+    finally:
+        process.terminate()
+        process.wait()
+
+
+async def _client(
+    port: int, path: str, token: str, stop_at: float, timings: list[float]
+) -> None:
+    """
+    One connection sending requests until ``stop_at``. It is kept alive unless
+    the server closes it (gunicorn's sync workers do after every response).
+    """
+    request = (
+        f"GET {path} HTTP/1.1\r\nHost: {HOST}\r\n"
+        f"Authorization: Bearer {token}\r\n\r\n"
+    ).encode()
+    writer = None
+    try:
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            if writer is None:
+                reader, writer = await asyncio.open_connection(HOST, port)
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            if not head.startswith(b"HTTP/1.1 200"):
+                msg = f"{path}: {head.splitlines()[0].decode()}"
+                raise RuntimeError(msg)
+            headers = dict(
+                line.lower().split(b":", 1) for line in head.splitlines()[1:] if line
+            )
+            await reader.readexactly(int(headers[b"content-length"]))
+            timings.append((time.perf_counter() - start) * 1000)
+            if headers.get(b"connection", b"").strip() == b"close":
+                writer.close()
+                writer = None
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+async def load(port: int, path: str, token: str, concurrency: int, duration: float) -> dict[str, float]:  # noqa: E501
+    timings: list[float] = []
+    stop_at = time.perf_counter() + duration
+    await asyncio.gather(
+        *(_client(port, path, token, stop_at, timings) for _ in range(concurrency))
+    )
+    return {"rps": len(timings) / duration, **summarize(timings)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--tasks", type=int, default=1_000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    os.environ["ALLOWED_HOSTS"] = ",".join(
+        filter(None, [os.environ.get("ALLOWED_HOSTS", ""), HOST])
+    )
+    user = create_user()
+    try:
+        seed_tasks(user, args.tasks)
+        token = str(AccessToken.for_user(user))
+        rows = []
+        for name, (command, env) in SERVERS.items():
+            with run_server(command, env, args.port, args.workers):
+                for path in ENDPOINTS:
+                    result = asyncio.run(
+                        load(args.port, path, token, args.concurrency, args.duration)
+                    )
+                    rows.append({
+                        "server": name,
+                        "endpoint": path,
+                        "req/s": result["rps"],
+                        "p50 ms": result["p50"],
+                        "p99 ms": result["p99"],
+                    })
+    finally:
+        user.delete()
+    print_table(
+        f"{args.workers} worker(s), {args.concurrency} connections, "
+        f"{args.duration:.0f}s per endpoint",
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Cache stampede on the stats and metrics endpoints: ``--threads`` requests of
+the same user miss the same key at once (the generation was just bumped), with
+and without single-flight.
+
+"computations" and "queries" are totals per miss, over all the threads; "wall
+ms" is how long the slowest request of a miss took.
+
+    python -m benchmarks.stampede [--tasks 50000] [--threads 16] [--misses 5]
+"""
+
+import argparse
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from benchmarks.utils import (
+    benchmark_database,
+    create_user,
+    print_table,
+    seed_tasks,
+    setup_django,
+)
+
+
+def without_single_flight(
+    cached: Callable, keys: Callable, timeout: int
+) -> Callable[..., Any]:
+    """The plain get-or-compute-and-set the views did before."""
+    from django.core.cache import cache
+
+    def wrapper(*args: Any) -> Any:  # noqa: ANN401
+        cache_key = keys(*args).key
+        if (cached_data := cache.get(cache_key)) is not None:
+            return cached_data
+        data = cached.__wrapped__(*args)
+        cache.set(cache_key, data, timeout)
+        return data
+
+    return wrapper
+
+
+def stampede(
+    func: Callable[[], Any], threads: int, computed: list[int]
+) -> tuple[int, float]:
+    """Runs ``func`` in ``threads`` threads at once; returns (queries, wall ms)."""
+    from django.db import connection
+
+    barrier = threading.Barrier(threads)
+    queries = []
+
+    def counter(execute: Callable, *args: Any) -> Any:  # noqa: ANN401
+        queries.append(1)  # list.append is atomic: safe across threads
+        return execute(*args)
+
+    def request() -> None:
+        barrier.wait()
+        with connection.execute_wrapper(counter):
+            func()
+        connection.close()
+
+    computed.clear()
+    workers = [threading.Thread(target=request) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return len(queries), (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=50_000)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--misses", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from unittest import mock
+    from zoneinfo import ZoneInfo
+
+    from tasks.cache import (
+        TASK_METRICS_TIMEOUT,
+        TASK_STATS_TIMEOUT,
+        bump_task_cache_generation,
+        task_metrics_cache_keys,
+        task_stats_cache_keys,
+    )
+    from tasks.services import statistics_service
+
+    rows = []
+    with benchmark_database():
+        user = create_user()
+        seed_tasks(user, args.tasks)
+        tz = ZoneInfo("UTC")
+        computed: list[int] = []
+
+        def counted(func: Callable) -> Callable:
+            def wrapper(*call_args: Any) -> Any:  # noqa: ANN401
+                computed.append(1)
+                return func(*call_args)
+
+            return wrapper
+
+        endpoints = (
+            ("stats", statistics_service.cached_task_stats, task_stats_cache_keys,
+             TASK_STATS_TIMEOUT, "calculate_task_stats", (user,)),
+            ("metrics", statistics_service.cached_task_metrics, task_metrics_cache_keys,
+             TASK_METRICS_TIMEOUT, "calculate_task_distribution", (user, 30, tz, True)),
+        )
+        for name, cached, keys, timeout, compute, call_args in endpoints:
+            key_args = (user.id, *call_args[1:])
+            plain = without_single_flight(cached, lambda *_, k=keys, a=key_args: k(*a), timeout)  # noqa: E501
+            for mode, func in (("without", plain), ("single-flight", cached)):
+                original = getattr(statistics_service, compute)
+                totals = {"computations": 0, "queries": 0, "wall": 0.0}
+                with mock.patch.object(statistics_service, compute, counted(original)):
+                    for _ in range(args.misses):
+                        bump_task_cache_generation(user.id)
+                        queries, wall = stampede(
+                            lambda f=func, a=call_args: f(*a), args.threads, computed
+                        )
+                        totals["computations"] += len(computed)
+                        totals["queries"] += queries
+                        totals["wall"] += wall
+                rows.append({
+                    "endpoint": name,
+                    "mode": mode,
+                    "computations": totals["computations"] / args.misses,
+                    "queries": totals["queries"] / args.misses,
+                    "wall ms": totals["wall"] / args.misses,
+                })
+    print_table(
+        f"Concurrent misses ({args.threads} threads, {args.tasks} tasks, "
+        f"mean of {args.misses} misses)",
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+Every endpoint against a skewed dataset, with a stored baseline to catch
+regressions.
+
+A few users own ``--heavy-tasks`` tasks each, the rest a long-tailed number
+around ``--median-tasks``. Each scenario runs for the heaviest and the median
+user (login once) and records its throughput, latency percentiles and
+queries per request. The task caches are invalidated before every read, so
+reads always reach the database and their query counts are deterministic.
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json
+    python -m benchmarks.suite --update-baseline benchmarks/baseline.json
+
+With ``--baseline`` the run fails (exit status 1) when a scenario issues more
+queries than the baseline, or its p95 grows more than ``--tolerance``. Query
+counts hold on any machine; latencies only compare on the machine (and
+settings) the baseline was recorded on, so record it there.
+"""
+
+import argparse
+import itertools
+import json
+import statistics
+import sys
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from benchmarks.utils import (
+    benchmark_database,
+    count_queries,
+    print_table,
+    seed_history,
+    seed_skewed_users,
+    setup_django,
+    summarize,
+)
+
+if TYPE_CHECKING:
+    from rest_framework.test import APIClient
+
+    from users.models import User
+
+LOGIN_PASSWORD = "bench-password"  # noqa: S105
+# Noise floor: a p95 within this many ms of the baseline never fails
+LATENCY_SLACK_MS = 1.0
+
+_numbers = itertools.count()  # Titles must be unique per user
+
+
+@dataclass
+class Account:
+    label: str
+    user: "User"
+    client: "APIClient"
+    task_id: uuid.UUID
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: str
+    data: Callable[[Account], dict[str, Any]] = lambda _account: {}
+    # Runs before each request, untimed; returns the id of the task to use
+    setup: Callable[[Account], uuid.UUID | None] = lambda _account: None
+    expected_status: int = 200
+
+
+def _existing_task(account: Account) -> uuid.UUID:
+    from tasks.cache import bump_task_cache_generation
+
+    bump_task_cache_generation(account.user.id)
+    return account.task_id
+
+
+def _fresh_task(account: Account) -> uuid.UUID:
+    from tasks.models import Task
+
+    title = f"Bench task {next(_numbers)}"
+    return Task.objects.create(title=title, user=account.user).pk
+
+
+SCENARIOS = (
+    Scenario("list", "get", "/tasks/", setup=_existing_task),
+    Scenario(
+        "list_filtered", "get", "/tasks/",
+        data=lambda _a: {"status": "pending", "ordering": "title"},
+        setup=_existing_task,
+    ),
+    Scenario("retrieve", "get", "/tasks/{task}/", setup=_existing_task),
+    Scenario(
+        "create", "post", "/tasks/",
+        data=lambda _a: {"title": f"New task {next(_numbers)}", "description": "Bench"},
+        expected_status=201,
+    ),
+    Scenario(
+        "update", "put", "/tasks/{task}/",
+        data=lambda _a: {"title": f"Renamed {next(_numbers)}", "is_completed": False},
+        setup=_existing_task,
+    ),
+    Scenario(
+        "toggle", "patch", "/tasks/{task}/",
+        data=lambda _a: {"is_completed": True}, setup=_fresh_task,
+    ),
+    Scenario("delete", "delete", "/tasks/{task}/", setup=_fresh_task, expected_status=204),  # noqa: E501
+    Scenario("stats", "get", "/tasks/stats/", setup=_existing_task),
+    Scenario(
+        "metrics", "get", "/tasks/metrics/",
+        data=lambda _a: {"days": 30}, setup=_existing_task,
+    ),
+    Scenario("history", "get", "/tasks-history/", setup=_existing_task),
+    Scenario(
+        "history_task", "get", "/tasks-history/",
+        data=lambda a: {"task": a.task_id}, setup=_existing_task,
+    ),
+)
+
+
+def run_scenario(scenario: Scenario, account: Account, repeat: int) -> dict[str, Any]:
+    timings, queries = [], []
+    for _ in range(repeat):
+        task = scenario.setup(account)
+        path = scenario.path.format(task=task)
+        data = scenario.data(account)
+        send = getattr(account.client, scenario.method)
+        responses = []
+        start = time.perf_counter()
+        queries.append(count_queries(
+            lambda: responses.append(send(path, data, format="json" if data else None))  # noqa: B023
+        ))
+        timings.append((time.perf_counter() - start) * 1000)
+        if (status := responses[0].status_code) != scenario.expected_status:
+            msg = f"{scenario.method.upper()} {path} returned {status}."
+            raise RuntimeError(msg)
+    return result_row(timings, queries)
+
+
+def run_login(repeat: int) -> dict[str, Any]:
+    from rest_framework.test import APIClient
+
+    from benchmarks.utils import create_user
+
+    user = create_user()
+    user.set_password(LOGIN_PASSWORD)
+    user.save(update_fields=["password"])
+    client = APIClient()
+    credentials = {"username": user.username, "password": LOGIN_PASSWORD}
+    timings, queries = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        queries.append(count_queries(lambda: client.post("/users/login/", credentials)))
+        timings.append((time.perf_counter() - start) * 1000)
+    return result_row(timings, queries)
+
+
+def result_row(timings: list[float], queries: list[int]) -> dict[str, Any]:
+    return {
+        "requests": len(timings),
+        "throughput rps": len(timings) / (sum(timings) / 1000),
+        **{f"{name} ms": value for name, value in summarize(timings).items()},
+        # The median: a one-off query (a counters row created on first use)
+        # doesn't change it, and it doesn't depend on --repeat
+        "queries": statistics.median_low(queries),
+    }
+
+
+def compare(
+    results: dict[str, dict[str, Any]], baseline: dict[str, dict[str, Any]], tolerance: float  # noqa: E501
+) -> list[str]:
+    """The regressions of ``results`` against ``baseline``, as messages."""
+    regressions = []
+    for name, expected in baseline.items():
+        if (actual := results.get(name)) is None:
+            continue
+        if actual["queries"] > expected["queries"]:
+            regressions.append(
+                f"{name}: {actual['queries']:g} queries per request, "
+                f"baseline {expected['queries']:g}"
+            )
+        limit = max(expected["p95 ms"] * (1 + tolerance), expected["p95 ms"] + LATENCY_SLACK_MS)  # noqa: E501
+        if actual["p95 ms"] > limit:
+            regressions.append(
+                f"{name}: p95 {actual['p95 ms']:.2f} ms, "
+                f"baseline {expected['p95 ms']:.2f} ms (+{tolerance:.0%} allowed)"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--heavy-users", type=int, default=2)
+    parser.add_argument("--heavy-tasks", type=int, default=100_000)
+    parser.add_argument("--median-tasks", type=int, default=100)
+    parser.add_argument("--versions-per-task", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--login-repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Fail on regressions against it")
+    parser.add_argument("--update-baseline", type=Path, help="Store the results as it")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.db import connection
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from tasks.models import Task
+
+    results: dict[str, dict[str, Any]] = {}
+    with benchmark_database():
+        print(f"Seeding {args.users} users ({args.heavy_users} x {args.heavy_tasks} tasks)...")  # noqa: E501
+        seeded = seed_skewed_users(
+            args.users, args.heavy_users, args.heavy_tasks, args.median_tasks, args.seed
+        )
+        accounts = []
+        for label, (user, _count) in (("heavy", seeded[0]), ("median", seeded[len(seeded) // 2])):  # noqa: E501
+            seed_history(user, args.versions_per_task)
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")  # noqa: E501
+            task_id = Task.objects.filter(user=user).values_list("id", flat=True)[0]
+            accounts.append(Account(label, user, client, task_id))
+        for scenario in SCENARIOS:
+            for account in accounts:
+                name = f"{scenario.name}:{account.label}"
+                results[name] = run_scenario(scenario, account, args.repeat)
+        results["login"] = run_login(args.login_repeat)
+        environment = {
+            "database": connection.vendor,
+            "cache": settings.CACHES["default"]["BACKEND"],
+            **{name: getattr(args, name) for name in (
+                "users", "heavy_users", "heavy_tasks", "median_tasks", "seed", "repeat"
+            )},
+        }
+
+    print_table(
+        "Endpoint suite", [{"scenario": name, **row} for name, row in results.items()]
+    )
+    report = {"environment": environment, "results": results}
+    for path in (args.output, args.update_baseline):
+        if path is not None:
+            path.write_text(json.dumps(report, indent=2) + "\n")
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline["environment"] != environment:
+            print("\nWarning: the baseline was recorded with other data or settings:")
+            print(f"  {baseline['environment']}")
+        if regressions := compare(results, baseline["results"], args.tolerance):
+            print("\nRegressions against the baseline:", *regressions, sep="\n  ")
+            sys.exit(1)
+        print("\nNo regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
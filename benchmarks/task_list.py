@@ -0,0 +1,70 @@
+"""
+GET /tasks/ latency by account size, with the page cache cold and warm.
+
+"cold" clears the user's cached pages before each request (database path),
+"warm" serves the same page from the per-user generation cache.
+
+    python -m benchmarks.task_list [--repeat 50]
+"""
+
+import argparse
+
+from benchmarks.utils import (
+    benchmark_database,
+    create_user,
+    measure,
+    print_table,
+    seed_tasks,
+    setup_django,
+)
+
+TASK_COUNTS = (10, 100, 1_000, 10_000, 100_000)
+QUERIES = (
+    {},
+    {"status": "pending", "ordering": "title"},
+    {"page": "last", "page_size": 100},
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.test import APIClient
+
+    from tasks.cache import bump_task_cache_generation
+
+    rows = []
+    with benchmark_database():
+        for count in TASK_COUNTS:
+            user = create_user()
+            seed_tasks(user, count)
+            client = APIClient()
+            client.force_authenticate(user)
+            for params in QUERIES:
+                def request(params: dict = params, client: APIClient = client) -> None:
+                    response = client.get("/tasks/", params)
+                    assert response.status_code == 200  # noqa: S101
+
+                cold = measure(
+                    request,
+                    args.repeat,
+                    setup=lambda user=user: bump_task_cache_generation(user.id),
+                )
+                request()
+                warm = measure(request, args.repeat)
+                rows.append({
+                    "tasks": count,
+                    "query": "&".join(f"{k}={v}" for k, v in params.items()) or "-",
+                    "cold p50": cold["p50"],
+                    "cold p99": cold["p99"],
+                    "warm p50": warm["p50"],
+                    "warm p99": warm["p99"],
+                })
+    print_table("GET /tasks/ latency (ms)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import os
+import random
+import statistics
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+import django
+
+if TYPE_CHECKING:
+    from users.models import User
+
+SEED_BATCH_SIZE = 5_000
+
+
+def setup_django() -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    django.setup()
+
+
+@contextmanager
+def benchmark_database() -> Iterator[None]:
+    """Runs the block against a freshly migrated test database."""
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def create_user(username: str | None = None) -> "User":
+    from users.models import User
+
+    return User.objects.create_user(
+        username=username or f"bench-{uuid.uuid4().hex[:12]}", password=uuid.uuid4().hex
+    )
+
+
+def seed_tasks(user: "User", count: int, completed_ratio: float = 0.5) -> None:
+    """Inserts ``count`` tasks for the user in batches, bypassing the signals."""
+    from tasks.models import Task
+
+    completed_every = round(1 / completed_ratio) if completed_ratio else 0
+    for start in range(0, count, SEED_BATCH_SIZE):
+        Task.objects.bulk_create(
+            Task(
+                title=f"Task {number}",
+                description=f"Description of task {number}",
+                is_completed=bool(completed_every) and number % completed_every == 0,
+                user=user,
+            )
+            for number in range(start, min(start + SEED_BATCH_SIZE, count))
+        )
+
+
+def seed_skewed_users(
+    users: int, heavy_users: int, heavy_tasks: int, median_tasks: int, seed: int = 0
+) -> list[tuple["User", int]]:
+    """
+    Creates ``users`` accounts with a long-tailed task count: ``heavy_users`` of
+    them own ``heavy_tasks`` tasks, the others a Pareto-distributed number
+    around ``median_tasks``. The same seed always generates the same data.
+    Returns the users with their task counts, heaviest first.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    counts = [heavy_tasks] * heavy_users + sorted(
+        (
+            # The median of paretovariate(alpha) is 2 ** (1 / alpha)
+            min(heavy_tasks, round(median_tasks * rng.paretovariate(1.2) / 2 ** (1 / 1.2)))  # noqa: E501
+            for _ in range(users - heavy_users)
+        ),
+        reverse=True,
+    )
+    seeded = []
+    for count in counts:
+        user = create_user()
+        seed_tasks(user, count)
+        seeded.append((user, count))
+    return seeded
+
+
+def count_queries(func: Callable[[], Any]) -> int:
+    """
+    Queries run by ``func``, counted as they execute: connection.queries can't
+    be used, every request resets it.
+    """
+    from django.db import connection
+
+    executed = 0
+
+    def counter(execute: Callable, *args: Any) -> Any:  # noqa: ANN401
+        nonlocal executed
+        executed += 1
+        return execute(*args)
+
+    with connection.execute_wrapper(counter):
+        func()
+    return executed
+
+
+def measure(
+    func: Callable[[], Any], repeat: int = 50, setup: Callable[[], Any] | None = None
+) -> dict[str, float]:
+    """Calls ``func`` ``repeat`` times and returns its latency percentiles in ms."""
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return summarize(timings)
+
+
+def summarize(timings: list[float]) -> dict[str, float]:
+    timings = sorted(timings)
+    quantiles = statistics.quantiles(timings, n=100) if len(timings) > 1 else timings * 99  # noqa: E501
+    return {
+        "mean": statistics.fmean(timings),
+        "p50": quantiles[49],
+        "p95": quantiles[94],
+        "p99": quantiles[98],
+    }
+
+
+def print_table(title: str, rows: list[dict[str, Any]]) -> None:
+    print(format_table(title, rows))
+
+
+def format_table(title: str, rows: list[dict[str, Any]]) -> str:
+    lines = ["", title]
+    if rows:
+        columns = list(rows[0])
+        cells = [[_format(row[column]) for column in columns] for row in rows]
+        widths = [
+            max(len(column), *(len(line[i]) for line in cells))
+            for i, column in enumerate(columns)
+        ]
+        for line in (columns, *cells):
+            lines.append("  ".join(cell.rjust(width) for cell, width in zip(line, widths, strict=True)))  # noqa: E501
+    return "\n".join(lines)
+
+
+def _format(value: Any) -> str:  # noqa: ANN401
+    return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+
+
+def seed_history(user: "User", versions_per_task: int) -> None:
+    """Inserts ``versions_per_task`` history entries for every task of the user."""
+    from tasks.models import Task, TaskHistory
+
+    task_ids = Task.objects.filter(user=user).values_list("id", flat=True)
+    TaskHistory.objects.bulk_create(
+        (
+            TaskHistory(
+                task_id=task_id,
+                change_by=user,
+                version=version,
+                changes={"is_completed": {"old": False, "new": True}},
+                previous_states={
+                    "title": "", "description": "", "is_completed": False
+                },
+            )
+            for task_id in task_ids.iterator()
+            for version in range(1, versions_per_task + 1)
+        ),
+        batch_size=SEED_BATCH_SIZE,
+    )
+    Task.objects.filter(user=user).update(latest_version=versions_per_task)
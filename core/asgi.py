@@ -2,6 +2,9 @@
 ASGI config for core project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with ASYNC_API=True to use the async task views:
+
+    ASYNC_API=True uvicorn core.asgi:application --workers 2
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
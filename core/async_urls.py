@@ -0,0 +1,11 @@
+from django.urls import include, path
+
+from core.urls import urlpatterns as sync_urlpatterns
+
+# URLconf of the async serving mode (ASYNC_API=True): the task read endpoints
+# and the login are async views, everything else is the same as in core.urls
+urlpatterns = [
+    path("", include("tasks.async_urls")),
+    path("", include("users.async_urls")),
+    *sync_urlpatterns,
+]
@@ -0,0 +1,155 @@
+"""
+Cache stampede protection for expensive reads.
+
+``single_flight`` (and ``asingle_flight`` for coroutines) caches the result of
+the decorated function. On a miss only the caller that takes a short lock
+recomputes it; concurrent callers wait briefly for that result, then fall
+back to the last value computed (the stale copy), and only compute it
+themselves if there is none. Entries are also refreshed early, with a
+probability that grows as they near expiry and with how long they take to
+compute (the XFetch algorithm), so a hot key is usually recomputed before it
+expires rather than after.
+"""
+
+import asyncio
+import math
+import random
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from functools import wraps
+from typing import Any, NamedTuple
+
+from django.core.cache import cache
+
+LOCK_TIMEOUT = 10  # Seconds: a crashed holder blocks its key no longer than this
+WAIT_TIMEOUT = 1.0
+WAIT_INTERVAL = 0.02
+EARLY_REFRESH_BETA = 1.0  # > 1 refreshes earlier, < 1 later
+STALE_TIMEOUT = 3600
+
+
+class CacheKeys(NamedTuple):
+    """
+    Where a value is cached. ``stale_key`` must survive the invalidation of
+    ``key`` (e.g. leave out the generation of a generation-based key).
+    """
+
+    key: str
+    stale_key: str | None = None
+
+
+def _entry(value: Any, delta: float, timeout: int) -> dict[str, Any]:  # noqa: ANN401
+    return {"value": value, "delta": delta, "expires_at": time.time() + timeout}
+
+
+def _is_fresh(entry: dict[str, Any]) -> bool:
+    """False when XFetch picks this read to refresh the entry early."""
+    jitter = entry["delta"] * EARLY_REFRESH_BETA * -math.log(1.0 - random.random())  # noqa: S311
+    return time.time() + jitter < entry["expires_at"]
+
+
+def _lock_key(key: str) -> str:
+    return f"{key}_lock"
+
+
+def _store(cache_keys: CacheKeys, entry: dict[str, Any], ttl: int) -> None:
+    cache.set(cache_keys.key, entry, ttl)
+    if cache_keys.stale_key is not None:
+        cache.set(cache_keys.stale_key, entry, STALE_TIMEOUT)
+
+
+def _wait(cache_keys: CacheKeys) -> dict[str, Any] | None:
+    """The value another caller is computing, or the stale copy if it is slow."""
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_INTERVAL)
+        if (entry := cache.get(cache_keys.key)) is not None:
+            return entry
+    return cache.get(cache_keys.stale_key) if cache_keys.stale_key else None
+
+
+def _release(lock_key: str, token: str) -> None:
+    if cache.get(lock_key) == token:  # Not if it expired and was taken again
+        cache.delete(lock_key)
+
+
+def single_flight[**P, T](
+    keys: Callable[P, CacheKeys], timeout: int
+) -> Callable[[Callable[P, T]], Callable[P, T]]:
+    """Caches the result under ``keys(*args, **kwargs)`` for ``timeout`` seconds."""
+
+    def decorator(func: Callable[P, T]) -> Callable[P, T]:
+        @wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            cache_keys = keys(*args, **kwargs)
+            entry = cache.get(cache_keys.key)
+            if entry is not None and _is_fresh(entry):
+                return entry["value"]
+            lock_key, token = _lock_key(cache_keys.key), uuid.uuid4().hex
+            if not cache.add(lock_key, token, LOCK_TIMEOUT):
+                # Being computed by another caller (or refreshed early)
+                if entry is None:
+                    entry = _wait(cache_keys)
+                return entry["value"] if entry is not None else func(*args, **kwargs)
+            try:
+                start = time.perf_counter()
+                value = func(*args, **kwargs)
+                _store(cache_keys, _entry(value, time.perf_counter() - start, timeout), timeout)  # noqa: E501
+                return value
+            finally:
+                _release(lock_key, token)
+
+        return wrapper
+
+    return decorator
+
+
+async def _astore(cache_keys: CacheKeys, entry: dict[str, Any], ttl: int) -> None:
+    await cache.aset(cache_keys.key, entry, ttl)
+    if cache_keys.stale_key is not None:
+        await cache.aset(cache_keys.stale_key, entry, STALE_TIMEOUT)
+
+
+async def _await(cache_keys: CacheKeys) -> dict[str, Any] | None:
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(WAIT_INTERVAL)
+        if (entry := await cache.aget(cache_keys.key)) is not None:
+            return entry
+    return await cache.aget(cache_keys.stale_key) if cache_keys.stale_key else None
+
+
+async def _arelease(lock_key: str, token: str) -> None:
+    if await cache.aget(lock_key) == token:
+        await cache.adelete(lock_key)
+
+
+def asingle_flight[**P, T](
+    keys: Callable[P, Awaitable[CacheKeys]], timeout: int
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    """``single_flight`` for coroutine functions, with an async ``keys``."""
+
+    def decorator(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        @wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            cache_keys = await keys(*args, **kwargs)
+            entry = await cache.aget(cache_keys.key)
+            if entry is not None and _is_fresh(entry):
+                return entry["value"]
+            lock_key, token = _lock_key(cache_keys.key), uuid.uuid4().hex
+            if not await cache.aadd(lock_key, token, LOCK_TIMEOUT):
+                if entry is None:
+                    entry = await _await(cache_keys)
+                return entry["value"] if entry is not None else await func(*args, **kwargs)  # noqa: E501
+            try:
+                start = time.perf_counter()
+                value = await func(*args, **kwargs)
+                await _astore(cache_keys, _entry(value, time.perf_counter() - start, timeout), timeout)  # noqa: E501
+                return value
+            finally:
+                await _arelease(lock_key, token)
+
+        return wrapper
+
+    return decorator
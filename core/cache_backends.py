@@ -0,0 +1,305 @@
+"""
+Two-tier cache backend: a small LRU in each process in front of the shared
+cache (Redis), behind the usual ``django.core.cache`` API.
+
+    CACHES = {
+        "default": {
+            "BACKEND": "core.cache_backends.TwoTierCache",
+            "LOCATION": "redis",  # Alias of the shared cache
+            "OPTIONS": {"LOCAL_TIMEOUT": 1, "LOCAL_MAX_ENTRIES": 10_000},
+        },
+        "redis": {"BACKEND": "django_redis.cache.RedisCache", ...},
+    }
+
+Only the keys matching LOCAL_KEY_PATTERN (the hot per-user data by default)
+are kept locally, for at most LOCAL_TIMEOUT seconds. A write through this
+backend drops the key from the local tier and publishes it on a Redis channel
+that every process listens to, so they drop it too. A process that misses a
+message (disconnected or not yet subscribed) serves the old value no longer
+than LOCAL_TIMEOUT. Locks, counters and everything else go straight to Redis.
+"""
+
+import logging
+import os
+import pickle
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+# User ids as str(uuid) writes them, as in the keys of tasks.cache and users.cache
+USER_ID_PATTERN = r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+# Per-user task reads and auth status, except the single-flight locks and the
+# generation counter
+DEFAULT_LOCAL_KEY_PATTERN = (
+    rf"^user_{USER_ID_PATTERN}_(tasks_(?!generation$)(?!.*_lock$)|auth_status$)"
+)
+INVALIDATION_CHANNEL = "cache_invalidation"
+RECONNECT_DELAY = 1.0
+
+_MISSING = object()
+
+
+class LocalTier:
+    """
+    The LRU of a process, shared by all its threads (Django creates a cache
+    backend per thread) along with the hit counters of both tiers.
+    """
+
+    def __init__(self, max_entries: int, timeout: float) -> None:
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every eviction: a value read from Redis before an
+        # invalidation is not stored locally after it
+        self.epoch = 0
+        self._counts = {"local": [0, 0], "remote": [0, 0]}  # [hits, misses]
+        self._listener_pid: int | None = None
+
+    def get(self, key: str) -> Any:  # noqa: ANN401
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and item[0] <= time.monotonic():
+                del self._entries[key]
+                item = None
+            self._count("local", hit=item is not None)
+            if item is None:
+                return _MISSING
+            self._entries.move_to_end(key)
+        return pickle.loads(item[1])  # noqa: S301 # A copy: callers may mutate it
+
+    def set(self, key: str, value: Any, epoch: int) -> None:  # noqa: ANN401
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            if epoch != self.epoch:
+                return
+            self._entries[key] = (time.monotonic() + self.timeout, pickled)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def evict(self, keys: list[str]) -> None:
+        with self._lock:
+            self.epoch += 1
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.epoch += 1
+            self._entries.clear()
+
+    def count_remote(self, *, hit: bool) -> None:
+        with self._lock:
+            self._count("remote", hit=hit)
+
+    def _count(self, tier: str, *, hit: bool) -> None:
+        self._counts[tier][0 if hit else 1] += 1
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            counts = {tier: list(count) for tier, count in self._counts.items()}
+            size = len(self._entries)
+        stats: dict[str, dict[str, Any]] = {}
+        for tier, (hits, misses) in counts.items():
+            reads = hits + misses
+            stats[tier] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": round(hits / reads, 4) if reads else None,
+            }
+        stats["local"]["entries"] = size
+        return stats
+
+    def start_listener(self, remote_alias: str, channel: str) -> None:
+        """Starts the invalidation listener of this process, once per fork."""
+        with self._lock:
+            if self._listener_pid == os.getpid():
+                return
+            self._listener_pid = os.getpid()
+            self._entries.clear()  # Inherited from the parent process
+        threading.Thread(
+            target=self._listen,
+            args=(remote_alias, channel),
+            name="cache-invalidation",
+            daemon=True,
+        ).start()
+
+    def _listen(self, remote_alias: str, channel: str) -> None:
+        while True:
+            try:
+                client = caches[remote_alias].client.get_client(write=True)
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(channel)
+                self.clear()  # Messages may have been missed while unsubscribed
+                for message in pubsub.listen():
+                    keys = message["data"].decode().split("\n")
+                    if keys == [""]:
+                        self.clear()
+                    else:
+                        self.evict(keys)
+            except Exception:  # Any connection error: resubscribe
+                logger.warning("Invalidation listener reconnecting", exc_info=True)
+                self.clear()
+                time.sleep(RECONNECT_DELAY)
+
+
+_tiers: dict[str, LocalTier] = {}
+_tiers_lock = threading.Lock()
+
+
+class TwoTierCache(BaseCache):
+    def __init__(self, location: str, params: dict[str, Any]) -> None:
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._remote_alias = location
+        self._channel = options.get("INVALIDATION_CHANNEL", INVALIDATION_CHANNEL)
+        self._local_keys = re.compile(
+            options.get("LOCAL_KEY_PATTERN", DEFAULT_LOCAL_KEY_PATTERN)
+        )
+        with _tiers_lock:
+            if location not in _tiers:
+                _tiers[location] = LocalTier(
+                    int(options.get("LOCAL_MAX_ENTRIES", 10_000)),
+                    float(options.get("LOCAL_TIMEOUT", 1)),
+                )
+            self._tier = _tiers[location]
+
+    @cached_property
+    def _remote(self) -> BaseCache:
+        return caches[self._remote_alias]
+
+    @cached_property
+    def _publisher(self) -> Any:  # noqa: ANN401
+        """The Redis client of the shared cache, None if it isn't django-redis."""
+        client = getattr(self._remote, "client", None)
+        return client.get_client(write=True) if hasattr(client, "get_client") else None
+
+    def _is_local(self, key: str) -> bool:
+        return self._local_keys.match(key) is not None
+
+    def _local_key(self, key: str, version: int | None) -> str:
+        return self._remote.make_key(key, version)
+
+    def _store_locally(self, local_key: str, value: Any, epoch: int) -> None:  # noqa: ANN401
+        if self._publisher is not None:
+            self._tier.start_listener(self._remote_alias, self._channel)
+        self._tier.set(local_key, value, epoch)
+
+    def _invalidate(self, keys: list[str], version: int | None = None) -> None:
+        local_keys = [self._local_key(key, version) for key in keys if self._is_local(key)]  # noqa: E501
+        if not local_keys:
+            return
+        self._tier.evict(local_keys)
+        self._publish(local_keys)
+
+    def _publish(self, local_keys: list[str]) -> None:
+        """Tells the other processes to drop the keys ([] drops everything)."""
+        if self._publisher is None:
+            return
+        try:
+            self._publisher.publish(self._channel, "\n".join(local_keys))
+        except Exception:
+            # The others serve their copy until it expires, LOCAL_TIMEOUT at most
+            logger.warning("Could not publish a cache invalidation", exc_info=True)
+
+    def tier_stats(self) -> dict[str, dict[str, Any]]:
+        """Hits, misses and hit ratio of each tier in this process."""
+        return self._tier.stats()
+
+    def get(self, key: str, default: Any = None, version: int | None = None) -> Any:  # noqa: ANN401
+        if not self._is_local(key):
+            return self._get_remote(key, default, version)
+        local_key = self._local_key(key, version)
+        if (value := self._tier.get(local_key)) is not _MISSING:
+            return value
+        epoch = self._tier.epoch
+        if (value := self._get_remote(key, _MISSING, version)) is _MISSING:
+            return default
+        self._store_locally(local_key, value, epoch)
+        return value
+
+    async def aget(self, key: str, default: Any = None, version: int | None = None) -> Any:  # noqa: ANN401, E501
+        # A local hit is served without leaving the event loop
+        if not self._is_local(key):
+            return await self._aget_remote(key, default, version)
+        local_key = self._local_key(key, version)
+        if (value := self._tier.get(local_key)) is not _MISSING:
+            return value
+        epoch = self._tier.epoch
+        if (value := await self._aget_remote(key, _MISSING, version)) is _MISSING:
+            return default
+        self._store_locally(local_key, value, epoch)
+        return value
+
+    def _get_remote(self, key: str, default: Any, version: int | None) -> Any:  # noqa: ANN401
+        value = self._remote.get(key, _MISSING, version)
+        self._tier.count_remote(hit=value is not _MISSING)
+        return default if value is _MISSING else value
+
+    async def _aget_remote(self, key: str, default: Any, version: int | None) -> Any:  # noqa: ANN401
+        value = await self._remote.aget(key, _MISSING, version)
+        self._tier.count_remote(hit=value is not _MISSING)
+        return default if value is _MISSING else value
+
+    def get_many(self, keys: list[str], version: int | None = None) -> dict[str, Any]:
+        return self._remote.get_many(keys, version)
+
+    def has_key(self, key: str, version: int | None = None) -> bool:
+        return self._remote.has_key(key, version)
+
+    def add(
+        self, key: str, value: Any, timeout: float | None = DEFAULT_TIMEOUT, version: int | None = None  # noqa: ANN401, E501
+    ) -> bool:
+        added = self._remote.add(key, value, timeout, version)
+        if added:
+            self._invalidate([key], version)
+        return added
+
+    def set(
+        self, key: str, value: Any, timeout: float | None = DEFAULT_TIMEOUT, version: int | None = None  # noqa: ANN401, E501
+    ) -> None:
+        self._remote.set(key, value, timeout, version)
+        self._invalidate([key], version)
+
+    def set_many(
+        self, data: dict[str, Any], timeout: float | None = DEFAULT_TIMEOUT, version: int | None = None  # noqa: E501
+    ) -> list[str]:
+        failed = self._remote.set_many(data, timeout, version)
+        self._invalidate(list(data), version)
+        return failed
+
+    def touch(
+        self, key: str, timeout: float | None = DEFAULT_TIMEOUT, version: int | None = None  # noqa: E501
+    ) -> bool:
+        return self._remote.touch(key, timeout, version)
+
+    def incr(self, key: str, delta: int = 1, version: int | None = None) -> int:
+        value = self._remote.incr(key, delta, version)
+        self._invalidate([key], version)
+        return value
+
+    def delete(self, key: str, version: int | None = None) -> bool:
+        deleted = self._remote.delete(key, version)
+        self._invalidate([key], version)
+        return deleted
+
+    def delete_many(self, keys: list[str], version: int | None = None) -> None:
+        self._remote.delete_many(keys, version)
+        self._invalidate(list(keys), version)
+
+    def clear(self) -> None:
+        self._remote.clear()
+        self._tier.clear()
+        self._publish([])
+
+    def close(self, **kwargs: Any) -> None:  # noqa: ANN401
+        self._remote.close(**kwargs)
@@ -0,0 +1,86 @@
+"""
+Gunicorn settings for production, used by the Dockerfile:
+
+    gunicorn --config python:core.gunicorn_config
+
+Every value can be overridden with an environment variable. Workers and
+threads are sized from the CPUs available to the container. With
+ASYNC_API=True the app is served through ASGI by uvicorn workers.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+from decouple import config as env  # "config" is a gunicorn setting name
+
+logger = logging.getLogger("gunicorn.error")
+
+
+def available_cpus() -> int:
+    """CPUs the process may use: the cgroup quota if any, else its affinity."""
+    cpus = len(os.sched_getaffinity(0))
+    cpu_max = Path("/sys/fs/cgroup/cpu.max")  # cgroup v2: "<quota> <period>"
+    if cpu_max.exists():
+        quota, period = cpu_max.read_text().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(quota) // int(period)))
+    return cpus
+
+
+ASYNC_API = env("ASYNC_API", default=False, cast=bool)
+
+bind = f"0.0.0.0:{env('PORT', default='8000')}"
+wsgi_app = "core.asgi:application" if ASYNC_API else "core.wsgi:application"
+
+# Sync: a few processes with threads, which wait on Postgres/Redis in parallel.
+# Async: one event loop per CPU already multiplexes the I/O.
+workers = env(
+    "WEB_CONCURRENCY",
+    default=available_cpus() if ASYNC_API else available_cpus() * 2 + 1,
+    cast=int,
+)
+threads = env("GUNICORN_THREADS", default=1 if ASYNC_API else 4, cast=int)
+worker_class = (
+    "uvicorn.workers.UvicornWorker"
+    if ASYNC_API
+    else env("GUNICORN_WORKER_CLASS", default="gthread")
+)
+
+# Import Django once in the master, the workers fork with it loaded
+preload_app = env("GUNICORN_PRELOAD", default=True, cast=bool)
+
+# Recycle workers to bound memory growth; the jitter keeps them from
+# restarting all at once
+max_requests = env("GUNICORN_MAX_REQUESTS", default=1000, cast=int)
+max_requests_jitter = env("GUNICORN_MAX_REQUESTS_JITTER", default=100, cast=int)
+
+timeout = env("GUNICORN_TIMEOUT", default=30, cast=int)
+graceful_timeout = env("GUNICORN_GRACEFUL_TIMEOUT", default=30, cast=int)
+keepalive = env("GUNICORN_KEEPALIVE", default=5, cast=int)
+
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(_server: Any, worker: Any) -> None:  # noqa: ANN401
+    """
+    Drops the connections inherited from the master, then creates the worker's
+    cache client (its pool is shared by the worker's threads) and checks the
+    database, so a broken dependency shows up in the logs at startup rather
+    than on the first request. With the sync worker class the database
+    connection opened here is also the one its requests use.
+    """
+    from django.core.cache import caches
+    from django.db import connections
+
+    connections.close_all()  # Never share the master's sockets between workers
+    for cache in caches.all(initialized_only=True):
+        cache.close()
+    try:
+        for connection in connections.all():
+            connection.ensure_connection()
+        caches["default"].get("warmup")  # Creates the cache client and its pool
+    except Exception:
+        logger.exception("Worker %s could not warm up its connections", worker.pid)
@@ -0,0 +1,53 @@
+import logging
+import os
+
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from django.http import JsonResponse
+from django.http.request import HttpRequest
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+
+def liveness(_request: HttpRequest) -> JsonResponse:
+    """
+    The process answers. Nothing else is checked, so an outage of a dependency
+    never gets the instance restarted.
+    """
+    return JsonResponse({"status": "OK"})
+
+
+def readiness(_request: HttpRequest) -> JsonResponse:
+    """The instance can serve traffic: every database and the cache answer."""
+    checks = {}
+    for connection in connections.all():
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            checks[f"database:{connection.alias}"] = "OK"
+        except DatabaseError:
+            logger.exception("Readiness check failed for database %s", connection.alias)
+            checks[f"database:{connection.alias}"] = "unavailable"
+    try:
+        cache.set("health_check", "OK", timeout=5)
+        checks["cache"] = "OK" if cache.get("health_check") == "OK" else "unavailable"
+    except Exception:  # Each backend raises its own connection errors
+        logger.exception("Readiness check failed for the cache")
+        checks["cache"] = "unavailable"
+    ready = all(status == "OK" for status in checks.values())
+    return JsonResponse(
+        {"status": "OK" if ready else "unavailable", "checks": checks},
+        status=200 if ready else 503,
+    )
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])  # Process and cache internals: staff only
+def cache_stats(_request: Request) -> Response:
+    """Hit ratios of the local and Redis cache tiers in this worker process."""
+    tier_stats = getattr(cache, "tier_stats", None)
+    return Response({"pid": os.getpid(), "tiers": tier_stats() if tier_stats else {}})
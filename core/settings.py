@@ -62,7 +62,9 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
-ROOT_URLCONF = "core.urls"
+# Modo assíncrono (servidor ASGI): as leituras de tarefas usam views async
+ASYNC_API = config("ASYNC_API", default=False, cast=bool)
+ROOT_URLCONF = "core.async_urls" if ASYNC_API else "core.urls"
 
 TEMPLATES = [
     {
@@ -86,33 +88,56 @@ WSGI_APPLICATION = "core.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+DB_ENGINE = config("DB_ENGINE", default="django.db.backends.sqlite3")
 DATABASES = {
     "default": {
-        "ENGINE": config("DB_ENGINE", default="django.db.backends.sqlite3"),
+        "ENGINE": DB_ENGINE,
         "NAME": config("DB_NAME", default="db.sqlite3"),
         "USER": config("DB_USER", default=""),
         "PASSWORD": config("DB_PASSWORD", default=""),
         "HOST": config("DB_HOST", default="localhost"),
         "PORT": config("DB_PORT", default="5432"),
         "CONN_MAX_AGE": config("CONN_MAX_AGE", default=600, cast=int),
-        "OPTIONS": {
-            "sslmode": "require",
-        },
+        # sslmode é uma opção do Postgres: o SQLite não a aceita
+        "OPTIONS": (
+            {"sslmode": config("DB_SSLMODE", default="require")}
+            if DB_ENGINE == "django.db.backends.postgresql"
+            else {}
+        ),
     },
 }
 
 # Redis Caches
-CACHES = {
-    "default": {
-        "BACKEND": "django_redis.cache.RedisCache",
-        "LOCATION": (
-            f"rediss://default:{config('REDIS_PASSWORD', default='127.0.0.1')}"
-            f"@{config('REDIS_HOST')}:{config('REDIS_PORT', default=6379)}"
-        ),
-        "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient", "SSL": True},
-    }
+REDIS_CACHE = {
+    "BACKEND": "django_redis.cache.RedisCache",
+    "LOCATION": (
+        f"rediss://default:{config('REDIS_PASSWORD', default='127.0.0.1')}"
+        f"@{config('REDIS_HOST')}:{config('REDIS_PORT', default=6379)}"
+    ),
+    "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient", "SSL": True},
 }
 
+# Cache local de cada processo na frente do Redis para os dados quentes de cada
+# usuário (ver core/cache_backends.py); 0 desativa
+CACHE_LOCAL_TIMEOUT = config("CACHE_LOCAL_TIMEOUT", default=1.0, cast=float)
+CACHES = (
+    {
+        "default": {
+            "BACKEND": "core.cache_backends.TwoTierCache",
+            "LOCATION": "redis",
+            "OPTIONS": {
+                "LOCAL_TIMEOUT": CACHE_LOCAL_TIMEOUT,
+                "LOCAL_MAX_ENTRIES": config(
+                    "CACHE_LOCAL_MAX_ENTRIES", default=10_000, cast=int
+                ),
+            },
+        },
+        "redis": REDIS_CACHE,
+    }
+    if CACHE_LOCAL_TIMEOUT
+    else {"default": REDIS_CACHE}
+)
+
 SIMPLE_JWT = {
     "ALGORITHM": config("JWT_ALGORITHM", default="HS256"),
     "SIGNING_KEY": config("JWT_SIGNING_KEY"),
@@ -128,8 +153,76 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": config(
         "JWT_BLACKLIST_AFTER_ROTATION", cast=bool
     ),  # Invalida o token antigo após a rotação
+    # A blacklist fica no cache (uma chave por token, que expira com ele) e o
+    # refresh não consulta o banco; ver users/serializers.py
+    "TOKEN_REFRESH_SERIALIZER": "users.serializers.TokenRefreshSerializer",
+    "TOKEN_VERIFY_SERIALIZER": "users.serializers.TokenVerifySerializer",
+    "TOKEN_BLACKLIST_SERIALIZER": "users.serializers.TokenBlacklistSerializer",
 }
 
+# Limite de renovações de token por usuário, no formato do DRF ("10/min")
+JWT_REFRESH_RATE = config("JWT_REFRESH_RATE", default="10/min")
+
+# Autenticação sem consultar o usuário a cada requisição: o usuário é montado a
+# partir do token e carregado só quando a view usa outros campos. Usuários
+# desativados continuam barrados por um status em cache, renovado em até
+# USER_STATUS_CACHE_TIMEOUT segundos (na hora, se salvos pelo ORM)
+JWT_LAZY_USER = config("JWT_LAZY_USER", default=False, cast=bool)
+USER_STATUS_CACHE_TIMEOUT = config("USER_STATUS_CACHE_TIMEOUT", default=60, cast=int)
+
+# Histórico das tarefas: "sync" grava na própria requisição; "outbox" grava uma
+# fila compacta que o comando drain_task_history move para o histórico em lotes
+TASK_HISTORY_MODE = config("TASK_HISTORY_MODE", default="sync")
+# "full" guarda o estado anterior completo em cada entrada; "delta" guarda só os
+# novos valores (com diff de texto na descrição) e uma entrada completa a cada
+# TASK_HISTORY_SNAPSHOT_INTERVAL versões. O comando compact_task_history converte
+# as entradas existentes
+TASK_HISTORY_STORAGE = config("TASK_HISTORY_STORAGE", default="full")
+TASK_HISTORY_SNAPSHOT_INTERVAL = config(
+    "TASK_HISTORY_SNAPSHOT_INTERVAL", default=20, cast=int
+)
+# Retenção: o comando archive_task_history move as entradas com mais de
+# TASK_HISTORY_RETENTION_DAYS dias (0 mantém tudo) para arquivos JSONL compactados
+# em TASK_HISTORY_ARCHIVE_DIR, que continuam acessíveis em /tasks-history/?archived=
+TASK_HISTORY_RETENTION_DAYS = config("TASK_HISTORY_RETENTION_DAYS", default=0, cast=int)
+TASK_HISTORY_ARCHIVE_DIR = Path(
+    config("TASK_HISTORY_ARCHIVE_DIR", default=BASE_DIR / "archive" / "task_history")
+)
+# Importação de tarefas (POST /tasks/import/): "queue" deixa o arquivo para o
+# comando process_task_imports, "thread" o processa numa thread do próprio
+# processo e "sync" durante a requisição. O comando também retoma as importações
+# interrompidas (por exemplo, quando o worker é reiniciado no meio de uma thread).
+# Os arquivos ficam em TASK_IMPORT_DIR até o fim do processamento
+TASK_IMPORT_MODE = config("TASK_IMPORT_MODE", default="queue")
+TASK_IMPORT_DIR = Path(config("TASK_IMPORT_DIR", default=BASE_DIR / "imports"))
+
+
+# Hash de senhas: "pbkdf2" (padrão do Django), "scrypt" ou "argon2" (requer o
+# extra argon2). Os hashes antigos continuam válidos e são convertidos para o
+# perfil e o custo atuais no próximo login de cada usuário
+PASSWORD_HASHER = config("PASSWORD_HASHER", default="pbkdf2")
+PASSWORD_HASHER_COST = {
+    "pbkdf2_iterations": config("PBKDF2_ITERATIONS", default=870_000, cast=int),
+    "scrypt_work_factor": config("SCRYPT_WORK_FACTOR", default=2**14, cast=int),
+    "argon2_time_cost": config("ARGON2_TIME_COST", default=2, cast=int),
+    "argon2_memory_cost": config(
+        "ARGON2_MEMORY_COST", default=102_400, cast=int
+    ),  # KiB
+    "argon2_parallelism": config("ARGON2_PARALLELISM", default=8, cast=int),
+}
+PASSWORD_HASHER_PROFILES = {
+    "pbkdf2": "users.hashers.TunedPBKDF2PasswordHasher",
+    "scrypt": "users.hashers.TunedScryptPasswordHasher",
+    "argon2": "users.hashers.TunedArgon2PasswordHasher",
+}
+PASSWORD_HASHERS = [
+    PASSWORD_HASHER_PROFILES[PASSWORD_HASHER],
+    *(
+        path
+        for name, path in PASSWORD_HASHER_PROFILES.items()
+        if name != PASSWORD_HASHER
+    ),
+]
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -151,7 +244,9 @@ AUTH_PASSWORD_VALIDATORS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.TokenUserAuthentication"
+        if JWT_LAZY_USER
+        else "users.authentication.AsyncJWTAuthentication",
     ],
 }
 
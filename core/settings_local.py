@@ -0,0 +1,68 @@
+"""
+Settings for running, testing and benchmarking the API on a plain machine,
+without the TLS Redis and Postgres of the deployment:
+
+    DJANGO_SETTINGS_MODULE=core.settings_local python manage.py migrate
+    DJANGO_SETTINGS_MODULE=core.settings_local python manage.py bench
+
+SQLite runs in WAL mode, so reads don't wait for writes, and the cache is
+in memory. Set LOCAL_REDIS_URL (e.g. redis://localhost:6379/0) to use a local
+Redis without TLS instead, which is shared by every worker process.
+"""
+
+import os
+
+# Values the deployment must provide, harmless on a developer machine
+for name, value in {
+    "SECRET_KEY": "local-insecure-secret-key",
+    "ALLOWED_HOSTS": "localhost,127.0.0.1,testserver",
+    "REDIS_HOST": "localhost",
+    "JWT_SIGNING_KEY": "local-insecure-jwt-signing-key-with-32-bytes",
+    "JWT_ROTATE_REFRESH_TOKENS": "True",
+    "JWT_BLACKLIST_AFTER_ROTATION": "True",
+    "DB_ENGINE": "django.db.backends.sqlite3",
+}.items():
+    os.environ.setdefault(name, value)
+
+from core.settings import *  # noqa: E402, F403
+from core.settings import BASE_DIR, CACHE_LOCAL_TIMEOUT, DATABASES, config  # noqa: E402
+
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    DATABASES["default"]["OPTIONS"] = {
+        # Writers take the lock when the transaction starts, instead of failing
+        # with "database is locked" when a reader upgrades to a writer
+        "transaction_mode": "IMMEDIATE",
+        "timeout": 20,
+        "init_command": (
+            "PRAGMA journal_mode=WAL;"
+            "PRAGMA synchronous=NORMAL;"  # Durable enough with WAL, fewer fsyncs
+            "PRAGMA temp_store=MEMORY;"
+            "PRAGMA cache_size=-65536;"  # 64 MB of page cache
+            "PRAGMA mmap_size=268435456"  # 256 MB
+        ),
+    }
+    # A file, not the default in-memory database: WAL needs one, and the
+    # benchmarks should pay for the disk like the deployment does
+    DATABASES["default"]["TEST"] = {"NAME": str(BASE_DIR / "test_db.sqlite3")}
+
+LOCAL_REDIS_URL = config("LOCAL_REDIS_URL", default="")
+if LOCAL_REDIS_URL:
+    REDIS_CACHE = {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": LOCAL_REDIS_URL,
+        "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"},
+    }
+    CACHES = (
+        {
+            "default": {
+                "BACKEND": "core.cache_backends.TwoTierCache",
+                "LOCATION": "redis",
+                "OPTIONS": {"LOCAL_TIMEOUT": CACHE_LOCAL_TIMEOUT},
+            },
+            "redis": REDIS_CACHE,
+        }
+        if CACHE_LOCAL_TIMEOUT
+        else {"default": REDIS_CACHE}
+    )
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
@@ -0,0 +1,217 @@
+import threading
+import time
+from contextlib import suppress
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache, caches
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core import cache as single_flight_cache
+from core import cache_backends
+from core.cache import CacheKeys, single_flight
+from tasks.cache import (
+    bump_task_cache_generation,
+    get_task_cache_generation,
+    task_list_cache_key,
+    task_stats_cache_keys,
+)
+from users.cache import (
+    USER_ACTIVE,
+    USER_INACTIVE,
+    get_user_status,
+    set_user_status,
+)
+from users.models import User
+
+
+class HealthCheckTest(TestCase):
+    def test_liveness_checks_nothing_else(self) -> None:
+        for url in ("/health/", "/health/live/"):
+            with self.assertNumQueries(0):
+                response = self.client.get(url)
+            self.assertEqual(response.json(), {"status": "OK"})
+
+    def test_readiness_checks_database_and_cache(self) -> None:
+        response = self.client.get("/health/ready/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["checks"], {"database:default": "OK", "cache": "OK"}
+        )
+
+    def test_readiness_fails_when_a_dependency_is_down(self) -> None:
+        with (
+            mock.patch.object(cache, "set", side_effect=ConnectionError),
+            self.assertLogs("core.health", "ERROR"),
+        ):
+            response = self.client.get("/health/ready/")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["checks"]["cache"], "unavailable")
+        self.assertEqual(self.client.get("/health/live/").status_code, 200)
+
+
+class SingleFlightTest(TestCase):
+    keys = CacheKeys("answer", "answer_stale")
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.calls = 0
+
+        @single_flight(lambda: self.keys, 60)
+        def compute() -> int:
+            self.calls += 1
+            return self.calls
+
+        self.compute = compute
+
+    def test_result_is_cached(self) -> None:
+        self.assertEqual(self.compute(), 1)
+        self.assertEqual(self.compute(), 1)
+        self.assertEqual(self.calls, 1)
+
+    def test_waiters_get_the_stale_copy_while_the_key_is_locked(self) -> None:
+        self.compute()
+        cache.delete(self.keys.key)  # Invalidated
+        cache.add(f"{self.keys.key}_lock", "other caller")
+        with mock.patch.object(single_flight_cache, "WAIT_TIMEOUT", 0.05):
+            self.assertEqual(self.compute(), 1)
+            cache.delete(self.keys.stale_key)
+            self.assertEqual(self.compute(), 2)  # Nothing to serve: computes
+        self.assertIsNone(cache.get(self.keys.key))  # Only the holder stores
+
+    def test_entry_is_refreshed_early_near_expiry(self) -> None:
+        # Took a second to compute and expires in half a second
+        entry = {"value": 0, "delta": 1.0, "expires_at": time.time() + 0.5}
+        cache.set(self.keys.key, entry)
+        with mock.patch("core.cache.random.random", return_value=0.01):
+            self.assertEqual(self.compute(), 0)  # Unlikely draw: still fresh
+        with mock.patch("core.cache.random.random", return_value=0.99):
+            self.assertEqual(self.compute(), 1)  # Refreshed ahead of expiry
+        self.assertGreater(cache.get(self.keys.key)["expires_at"], time.time() + 30)
+
+    def test_concurrent_misses_compute_once(self) -> None:
+        started = threading.Barrier(5)
+        release = threading.Event()
+
+        @single_flight(lambda: self.keys, 60)
+        def slow() -> str:
+            self.calls += 1
+            release.wait(1)
+            return "done"
+
+        def call() -> None:
+            started.wait()
+            results.append(slow())
+
+        results: list[str] = []
+        threads = [threading.Thread(target=call) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        threading.Timer(0.1, release.set).start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ["done"] * 5)
+        self.assertEqual(self.calls, 1)
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "core.cache_backends.TwoTierCache",
+            "LOCATION": "remote",
+            "OPTIONS": {"LOCAL_TIMEOUT": 60},
+        },
+        "remote": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+)
+class TwoTierCacheTest(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="João", password="João123")
+        self.key = task_stats_cache_keys(self.user.id).key
+        # A fresh backend and local tier, with no counts from the other tests
+        cache_backends._tiers.clear()  # noqa: SLF001
+        with suppress(AttributeError):
+            del caches["default"]
+        cache.clear()
+
+    def test_hot_keys_are_served_from_the_local_tier(self) -> None:
+        cache.set(self.key, {"total_tasks": 1})
+        self.assertEqual(cache.get(self.key), {"total_tasks": 1})
+        caches["remote"].set(self.key, {"total_tasks": 2})  # Behind its back
+        self.assertEqual(cache.get(self.key), {"total_tasks": 1})
+        self.assertEqual(async_to_sync(cache.aget)(self.key), {"total_tasks": 1})
+        cache.set(self.key, {"total_tasks": 3})  # Through it: invalidated
+        self.assertEqual(cache.get(self.key), {"total_tasks": 3})
+        stats = cache.tier_stats()
+        self.assertEqual(
+            (stats["local"]["hits"], stats["local"]["misses"]), (2, 2)
+        )
+        self.assertEqual(stats["remote"]["hit_ratio"], 1.0)
+
+    def test_other_keys_always_go_to_the_shared_cache(self) -> None:
+        refreshes = f"user_{self.user.id}_refreshes_9"
+        generation = f"user_{self.user.id}_tasks_generation"
+        for key in (f"{self.key}_lock", generation, "token_blacklist_abc", refreshes):
+            cache.set(key, 1)
+            cache.get(key)
+            caches["remote"].set(key, 2)
+            self.assertEqual(cache.get(key), 2)
+        self.assertEqual(cache.tier_stats()["local"]["hits"], 0)
+
+    def test_user_keys_are_kept_locally(self) -> None:
+        backend = caches["default"]
+        local_keys = [
+            self.key,
+            task_stats_cache_keys(self.user.id).stale_key,
+            task_list_cache_key(self.user.id, "testserver", QueryDict("page=2")),
+            f"user_{self.user.id}_auth_status",
+        ]
+        for key in local_keys:
+            self.assertTrue(backend._is_local(key), key)  # noqa: SLF001
+        get_user_status(self.user.id)  # Computed and stored in the shared cache
+        self.assertEqual(get_user_status(self.user.id), USER_ACTIVE)  # Kept locally
+        caches["remote"].set(local_keys[-1], USER_INACTIVE)  # Behind its back
+        self.assertEqual(get_user_status(self.user.id), USER_ACTIVE)
+        set_user_status(self.user.id, USER_INACTIVE)  # Through it: invalidated
+        self.assertEqual(get_user_status(self.user.id), USER_INACTIVE)
+
+    def test_generation_bump_is_seen_at_once(self) -> None:
+        bump_task_cache_generation(self.user.id)
+        generation = get_task_cache_generation(self.user.id)
+        bump_task_cache_generation(self.user.id)
+        self.assertEqual(get_task_cache_generation(self.user.id), generation + 1)
+
+    def test_local_copies_expire(self) -> None:
+        cache.set(self.key, 1)
+        cache.get(self.key)
+        caches["remote"].set(self.key, 2)
+        with mock.patch(
+            "core.cache_backends.time.monotonic", return_value=time.monotonic() + 61
+        ):
+            self.assertEqual(cache.get(self.key), 2)
+
+    def test_writes_are_published_to_the_other_processes(self) -> None:
+        publisher = mock.Mock()
+        with (
+            mock.patch.object(caches["default"], "_publisher", publisher),
+            mock.patch.object(cache_backends.LocalTier, "start_listener"),
+        ):
+            cache.set(self.key, 1)
+            cache.delete(f"{self.key}_lock")
+        publisher.publish.assert_called_once_with(
+            "cache_invalidation", caches["remote"].make_key(self.key)
+        )
+
+    def test_hit_ratios_are_exposed(self) -> None:
+        cache.set(self.key, 1)
+        cache.get(self.key)
+        cache.get(self.key)
+        client = APIClient()
+        self.assertEqual(client.get("/health/cache/").status_code, 401)
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get("/health/cache/").status_code, 403)
+        self.user.is_staff = True
+        response = client.get("/health/cache/")
+        self.assertEqual(response.json()["tiers"]["local"]["hit_ratio"], 0.5)
@@ -1,14 +1,13 @@
 from django.contrib import admin
-from django.http import JsonResponse
-from django.http.request import HttpRequest
 from django.urls import include, path
 
-
-def health_check(_request: HttpRequest) -> JsonResponse:
-    return JsonResponse({"status": "OK"})
+from core.health import cache_stats, liveness, readiness
 
 urlpatterns = [
-    path("health/", health_check),
+    path("health/", liveness),
+    path("health/live/", liveness),
+    path("health/ready/", readiness),
+    path("health/cache/", cache_stats),
     path("admin/", admin.site.urls),
     path("users/", include("users.urls")),
     path("", include("tasks.urls"))
@@ -0,0 +1,11 @@
+from django.urls import path
+
+from tasks.views.async_task import task_detail, task_list, task_metrics, task_stats
+
+# Async read endpoints, mounted in front of tasks.urls by core.async_urls
+urlpatterns = [
+    path("tasks/", task_list),
+    path("tasks/stats/", task_stats),
+    path("tasks/metrics/", task_metrics),
+    path("tasks/<uuid:pk>/", task_detail),
+]
@@ -0,0 +1,141 @@
+"""
+Per-user cache of the task reads: list pages, stats and metrics.
+
+Every key embeds the user's current generation, so a single INCR of the
+generation invalidates all of them. A read that started before a write can't
+bring stale data back: it stores under the generation it read, which the write
+has already left behind.
+"""
+
+import hashlib
+import time
+from collections.abc import Iterable
+from contextlib import suppress
+from datetime import tzinfo
+from typing import Any
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.http.request import QueryDict
+
+from core.cache import CacheKeys
+
+TASK_LIST_TIMEOUT = 300  # 5 minutes
+TASK_LIST_PARAMS = ("status", "ordering", "page", "page_size", "cursor")
+TASK_STATS_TIMEOUT = 300
+TASK_METRICS_TIMEOUT = 300
+
+
+def _generation_key(user_id: Any) -> str:  # noqa: ANN401
+    return f"user_{user_id}_tasks_generation"
+
+
+def get_task_cache_generation(user_id: Any) -> int:  # noqa: ANN401
+    """
+    Returns the current generation of the user's task caches.
+
+    A missing counter (first use or evicted) starts from the current time in
+    milliseconds, so it never goes back to a generation used before.
+    """
+    key = _generation_key(user_id)
+    if (generation := cache.get(key)) is None:
+        cache.add(key, time.time_ns() // 1_000_000, timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+async def aget_task_cache_generation(user_id: Any) -> int:  # noqa: ANN401
+    key = _generation_key(user_id)
+    if (generation := await cache.aget(key)) is None:
+        await cache.aadd(key, time.time_ns() // 1_000_000, timeout=None)
+        generation = await cache.aget(key)
+    return generation
+
+
+def _incr_generation(user_id: Any) -> None:  # noqa: ANN401
+    # A missing counter needs no bump: the next read starts a new generation
+    with suppress(ValueError):
+        cache.incr(_generation_key(user_id))
+
+
+def bump_task_cache_generation(user_id: Any) -> None:  # noqa: ANN401
+    """
+    Invalidates every cached list page, stats and metrics of the user.
+
+    Inside a transaction it bumps again on commit: a read between the first
+    bump and the commit still sees the old rows and may cache them under the
+    new generation, which the second bump discards.
+    """
+    _incr_generation(user_id)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _incr_generation(user_id))
+
+
+def _cache_key(
+    user_id: Any, generation: int | str, name: str, parts: Iterable[str] = ()  # noqa: ANN401
+) -> str:
+    key = f"user_{user_id}_tasks_{generation}_{name}"
+    if parts := list(parts):
+        digest = hashlib.md5("\x1f".join(parts).encode(), usedforsecurity=False)
+        key = f"{key}_{digest.hexdigest()}"
+    return key
+
+
+def _params(params: QueryDict, names: Iterable[str]) -> list[str]:
+    return [f"{name}={params[name]}" for name in names if name in params]
+
+
+def task_list_cache_key(user_id: Any, host: str, params: QueryDict) -> str:  # noqa: ANN401
+    """Builds the key of a serialized list page: (generation, filter, ordering, page, page_size)."""  # noqa: E501
+    generation = get_task_cache_generation(user_id)
+    return _cache_key(user_id, generation, "list", [host, *_params(params, TASK_LIST_PARAMS)])  # noqa: E501
+
+
+async def atask_list_cache_key(user_id: Any, host: str, params: QueryDict) -> str:  # noqa: ANN401
+    generation = await aget_task_cache_generation(user_id)
+    return _cache_key(user_id, generation, "list", [host, *_params(params, TASK_LIST_PARAMS)])  # noqa: E501
+
+
+def _stale_key(user_id: Any, name: str, parts: Iterable[str] = ()) -> str:  # noqa: ANN401
+    """Key of the last value computed, whatever the generation (see core.cache)."""
+    return _cache_key(user_id, "stale", name, parts)
+
+
+def task_stats_cache_keys(user_id: Any) -> CacheKeys:  # noqa: ANN401
+    generation = get_task_cache_generation(user_id)
+    return CacheKeys(
+        _cache_key(user_id, generation, "stats"), _stale_key(user_id, "stats")
+    )
+
+
+async def atask_stats_cache_keys(user_id: Any) -> CacheKeys:  # noqa: ANN401
+    generation = await aget_task_cache_generation(user_id)
+    return CacheKeys(
+        _cache_key(user_id, generation, "stats"), _stale_key(user_id, "stats")
+    )
+
+
+def _metrics_parts(days: int, tz: tzinfo, include_completed: bool) -> list[str]:  # noqa: FBT001
+    return [f"days={days}", f"tz={tz}", f"completed={include_completed}"]
+
+
+def task_metrics_cache_keys(
+    user_id: Any, days: int, tz: tzinfo, include_completed: bool  # noqa: ANN401, FBT001
+) -> CacheKeys:
+    generation = get_task_cache_generation(user_id)
+    parts = _metrics_parts(days, tz, include_completed)
+    return CacheKeys(
+        _cache_key(user_id, generation, "metrics", parts),
+        _stale_key(user_id, "metrics", parts),
+    )
+
+
+async def atask_metrics_cache_keys(
+    user_id: Any, days: int, tz: tzinfo, include_completed: bool  # noqa: ANN401, FBT001
+) -> CacheKeys:
+    generation = await aget_task_cache_generation(user_id)
+    parts = _metrics_parts(days, tz, include_completed)
+    return CacheKeys(
+        _cache_key(user_id, generation, "metrics", parts),
+        _stale_key(user_id, "metrics", parts),
+    )
@@ -1,3 +1,3 @@
-from .statistics import TaskStats
+from .statistics import DailyTaskCount, TaskDistribution, TaskStats
 
-__all__ = ["TaskStats"]
+__all__ = ["DailyTaskCount", "TaskDistribution", "TaskStats"]
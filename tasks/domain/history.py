@@ -0,0 +1,151 @@
+"""
+Delta encoding of the task history.
+
+A delta entry stores only the new value of each changed field; for the
+description it stores a text diff against the previous value when that is
+smaller than the text itself. The values before the change are not stored:
+they are rebuilt by replaying the entries since the last full one (the
+snapshot), which keeps ``changes`` and ``previous_states`` in full.
+"""
+
+import json
+import re
+from collections.abc import Iterable
+from difflib import SequenceMatcher
+from typing import Any
+
+# Diff ops: n > 0 copies n characters of the old text, n < 0 skips them,
+# a string is inserted
+TextDiff = list[int | str]
+
+_TOKENS = re.compile(r"\s+|\S+")
+DIFFED_FIELDS = frozenset({"description"})
+# SequenceMatcher is quadratic: when the changed span (the text between the
+# common prefix and suffix) has more tokens on either side, it is replaced whole
+DIFF_MAX_TOKENS = 500
+
+
+def diff_text(old: str, new: str) -> TextDiff | str:
+    """The ops turning ``old`` into ``new``, or ``new`` if they aren't smaller."""
+    old_tokens, new_tokens = _TOKENS.findall(old), _TOKENS.findall(new)
+    prefix, suffix = _common_affixes(old_tokens, new_tokens)
+    ops: TextDiff = []
+    if prefix:
+        _append(ops, sum(len(token) for token in old_tokens[:prefix]))
+    old_tokens = old_tokens[prefix:len(old_tokens) - suffix]
+    new_tokens = new_tokens[prefix:len(new_tokens) - suffix]
+    if max(len(old_tokens), len(new_tokens)) > DIFF_MAX_TOKENS:
+        opcodes = [("replace", 0, len(old_tokens), 0, len(new_tokens))]
+    else:
+        matcher = SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
+        opcodes = matcher.get_opcodes()
+    old_offsets = _offsets(old_tokens)
+    for tag, i1, i2, j1, j2 in opcodes:
+        length = old_offsets[i2] - old_offsets[i1]
+        if tag == "equal":
+            _append(ops, length)
+            continue
+        if length:
+            _append(ops, -length)
+        if j2 > j1:
+            _append(ops, "".join(new_tokens[j1:j2]))
+    if ops and isinstance(ops[-1], int) and ops[-1] > 0:
+        ops.pop()  # The rest of the old text is copied anyway
+    if len(json.dumps(ops)) >= len(json.dumps(new)):
+        return new
+    return ops
+
+
+def patch_text(old: str, diff: TextDiff | str) -> str:
+    if isinstance(diff, str):
+        return diff
+    parts, position = [], 0
+    for op in diff:
+        if isinstance(op, str):
+            parts.append(op)
+        elif op > 0:
+            parts.append(old[position:position + op])
+            position += op
+        else:
+            position -= op
+    parts.append(old[position:])
+    return "".join(parts)
+
+
+def _common_affixes(old: list[str], new: list[str]) -> tuple[int, int]:
+    """How many tokens ``old`` and ``new`` share at the start and at the end."""
+    limit = min(len(old), len(new))
+    prefix = 0
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    return prefix, suffix
+
+
+def _offsets(tokens: list[str]) -> list[int]:
+    offsets = [0]
+    for token in tokens:
+        offsets.append(offsets[-1] + len(token))
+    return offsets
+
+
+def _append(ops: TextDiff, op: int | str) -> None:
+    # Merges runs of the same kind: two copies, two skips or two inserts
+    if ops and type(ops[-1]) is type(op) and (isinstance(op, str) or (ops[-1] > 0) == (op > 0)):  # type: ignore[operator]  # noqa: E501
+        ops[-1] += op  # type: ignore[operator]
+    else:
+        ops.append(op)
+
+
+def is_snapshot_version(version: int, interval: int) -> bool:
+    """Versions 1, interval + 1, 2 * interval + 1... are stored in full."""
+    return interval <= 1 or version % interval == 1
+
+
+def encode_changes(changes: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    """The forward delta of an entry: the new values, diffed where it pays."""
+    return {
+        field: diff_text(change["old"] or "", change["new"] or "")
+        if field in DIFFED_FIELDS else change["new"]
+        for field, change in changes.items()
+    }
+
+
+def apply_delta(
+    previous_states: dict[str, Any], delta: dict[str, Any]
+) -> dict[str, dict[str, Any]]:
+    """The ``changes`` of a delta entry, given the state before it."""
+    return {
+        field: {
+            "old": previous_states[field],
+            "new": patch_text(previous_states[field] or "", value)
+            if field in DIFFED_FIELDS else value,
+        }
+        for field, value in delta.items()
+    }
+
+
+def replay(entries: Iterable[dict[str, Any]]) -> None:
+    """
+    Fills ``changes`` and ``previous_states`` of the delta entries (``delta``
+    not None) in place. ``entries`` are one task's, by ascending version; each
+    delta entry needs every entry since the last snapshot before it, and is
+    left as stored when some is missing.
+    """
+    state: dict[str, Any] | None = None
+    last_version = None
+    for entry in entries:
+        if entry["delta"] is None:
+            state = dict(entry["previous_states"])
+        elif state is not None and entry["version"] == last_version + 1:  # type: ignore[operator]
+            entry["previous_states"] = dict(state)
+            entry["changes"] = apply_delta(state, entry["delta"])
+        else:
+            state = None  # A gap: nothing after it can be rebuilt
+        if state is not None:
+            state.update(
+                {field: change["new"] for field, change in entry["changes"].items()}
+            )
+        last_version = entry["version"]
@@ -1,4 +1,7 @@
 from dataclasses import dataclass
+from datetime import date
+
+DISTRIBUTION_DATE_FORMAT = "%d/%m/%Y"
 
 
 @dataclass(frozen=True)
@@ -8,6 +11,15 @@ class TaskStats:
     pending_tasks: int
     completion_percentage: float
 
+    @classmethod
+    def from_counts(cls, total: int, completed: int) -> "TaskStats":
+        return cls(
+            total_tasks=total,
+            completed_tasks=completed,
+            pending_tasks=total - completed,
+            completion_percentage=(completed / total * 100) if total > 0 else 0.0,
+        )
+
     def as_dict(self) -> dict[str, str | int]:
         return {
             "total_tasks": self.total_tasks,
@@ -15,3 +27,31 @@ class TaskStats:
             "pending_tasks": self.pending_tasks,
             "completion_percentage": f"{self.completion_percentage:.2f}%",
         }
+
+
+@dataclass(frozen=True)
+class DailyTaskCount:
+    day: date
+    created: int
+    completed: int
+
+
+@dataclass(frozen=True)
+class TaskDistribution:
+    days: int
+    daily_counts: tuple[DailyTaskCount, ...]
+
+    def as_dict(self, *, include_completed: bool = False) -> dict[str, object]:
+        data: dict[str, object] = {
+            "days": self.days,
+            "task_distribution": {
+                count.day.strftime(DISTRIBUTION_DATE_FORMAT): count.created
+                for count in self.daily_counts
+            },
+        }
+        if include_completed:
+            data["completed_distribution"] = {
+                count.day.strftime(DISTRIBUTION_DATE_FORMAT): count.completed
+                for count in self.daily_counts
+            }
+        return data
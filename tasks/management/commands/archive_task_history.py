@@ -0,0 +1,61 @@
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.utils import timezone
+
+from tasks.services.history_service import archive_task_history
+from tasks.services.partition_service import (
+    drop_history_partitions,
+    ensure_history_partitions,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves the task history entries older than --older-than days (default "
+        "TASK_HISTORY_RETENTION_DAYS) to a compressed archive file, or deletes them "
+        "with --delete. On PostgreSQL it also creates the coming monthly partitions "
+        "and drops the emptied ones. Meant to run daily."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=settings.TASK_HISTORY_RETENTION_DAYS,
+            help="Age in days of the entries to archive.",
+        )
+        parser.add_argument(
+            "--delete", action="store_true", help="Delete the entries, unarchived."
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=200, help="Tasks per batch."
+        )
+
+    def handle(self, *_args: Any, **options: Any) -> None:  # noqa: ANN401
+        if options["older_than"] <= 0:
+            msg = "Set TASK_HISTORY_RETENTION_DAYS or pass --older-than."
+            raise CommandError(msg)
+        cutoff = timezone.now() - timedelta(days=options["older_than"])
+        for name in ensure_history_partitions():
+            self.stdout.write(f"Created partition {name}")
+        result = archive_task_history(
+            cutoff, batch_size=options["batch_size"], delete=options["delete"]
+        )
+        for name in drop_history_partitions(cutoff):
+            self.stdout.write(f"Dropped partition {name}")
+        summary = (
+            f"{result.entries} history entries of {result.tasks} tasks older than "
+            f"{cutoff:%Y-%m-%d}"
+        )
+        if options["delete"]:
+            self.stdout.write(self.style.SUCCESS(f"Deleted {summary}."))
+        else:
+            where = ", ".join(result.files) or "no file"
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Archived {summary} to {where} ({result.bytes_written} bytes)."
+                )
+            )
@@ -0,0 +1,114 @@
+from http import HTTPStatus
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from benchmarks.utils import (
+    create_user,
+    format_table,
+    measure,
+    seed_history,
+    seed_tasks,
+)
+from tasks.cache import bump_task_cache_generation
+from tasks.management.commands.check_query_plans import ENDPOINTS
+from tasks.models import Task
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds N users x M tasks inside a rolled back transaction and prints the "
+        "latency percentiles of every task endpoint, with the cache cold and warm."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--users", type=int, default=10)
+        parser.add_argument("--tasks-per-user", type=int, default=1_000)
+        parser.add_argument("--versions-per-task", type=int, default=2)
+        parser.add_argument("--repeat", type=int, default=50)
+
+    def handle(self, *_args: Any, **options: Any) -> None:  # noqa: ANN401
+        # The test client sends requests to the "testserver" host
+        allowed_hosts = [*settings.ALLOWED_HOSTS, "testserver"]
+        with override_settings(ALLOWED_HOSTS=allowed_hosts), transaction.atomic():
+            rows = self.run_endpoints(self.seed(options), options["repeat"])
+            transaction.set_rollback(True)  # Discard the seeded data
+        self.stdout.write(format_table(
+            f"{options['users']} users x {options['tasks_per_user']} tasks, "
+            f"{options['repeat']} requests per endpoint ({connection.vendor})",
+            rows,
+        ))
+
+    def seed(self, options: dict[str, Any]) -> list[User]:
+        self.stdout.write(
+            f"Seeding {options['users']} users x {options['tasks_per_user']} tasks..."
+        )
+        users = [create_user() for _ in range(options["users"])]
+        for user in users:
+            seed_tasks(user, options["tasks_per_user"])
+            seed_history(user, options["versions_per_task"])
+            # Entries cached inside the rolled back transaction must not be reused
+            bump_task_cache_generation(user.id)
+        return users
+
+    def run_endpoints(self, users: list[User], repeat: int) -> list[dict[str, Any]]:
+        accounts = []
+        for user in users:
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")  # noqa: E501
+            accounts.append((user, client, Task.objects.filter(user=user).first()))
+        rows = []
+        for path, params in ENDPOINTS:
+            for state in ("cold", "warm"):
+                bench = EndpointBench(accounts, path, params, cold=state == "cold")
+                if state == "warm":
+                    for _ in accounts:
+                        bench.next_account()
+                        bench.request()
+                result = measure(bench.request, repeat, setup=bench.next_account)
+                rows.append({
+                    "endpoint": f"GET {path} {params or ''}".strip(),
+                    "cache": state,
+                    "mean ms": result["mean"],
+                    "p50 ms": result["p50"],
+                    "p95 ms": result["p95"],
+                    "p99 ms": result["p99"],
+                })
+        return rows
+
+
+class EndpointBench:
+    """
+    Requests one endpoint for each account in turn, so every account is
+    measured. "cold" invalidates the account's caches before each request.
+    """
+
+    def __init__(
+        self, accounts: list[tuple[User, APIClient, Task]], path: str,
+        params: dict[str, Any], *, cold: bool,
+    ) -> None:
+        self.accounts = accounts
+        self.path = path
+        self.params = params
+        self.cold = cold
+        self.requests = 0
+
+    def next_account(self) -> None:
+        self.user, self.client, task = self.accounts[self.requests % len(self.accounts)]
+        self.requests += 1
+        self.url = self.path.format(task=task.pk)
+        self.query = {key: str(value).format(task=task.pk) for key, value in self.params.items()}  # noqa: E501
+        if self.cold:
+            bump_task_cache_generation(self.user.id)
+
+    def request(self) -> None:
+        response = self.client.get(self.url, self.query)
+        if response.status_code != HTTPStatus.OK:
+            msg = f"GET {self.url} {self.query} returned {response.status_code}."
+            raise CommandError(msg)
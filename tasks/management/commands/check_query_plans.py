@@ -0,0 +1,114 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+from benchmarks.utils import create_user, seed_history, seed_tasks
+from tasks.models import Task
+from users.models import User
+
+ENDPOINTS = (
+    ("/tasks/", {}),
+    ("/tasks/", {"status": "completed"}),
+    ("/tasks/", {"status": "pending", "ordering": "title"}),
+    ("/tasks/", {"ordering": "-title", "page": 3}),
+    ("/tasks/", {"cursor": ""}),
+    ("/tasks/{task}/", {}),
+    ("/tasks/stats/", {}),
+    ("/tasks/metrics/", {"days": 30}),
+    ("/tasks-history/", {}),
+    ("/tasks-history/", {"task": "{task}"}),
+    ("/tasks/{task}/as-of/", {"version": 1}),
+    ("/tasks/{task}/as-of/", {"at": "2100-01-01T00:00:00Z"}),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a large dataset inside a rolled back transaction, runs EXPLAIN for "
+        "every query issued by the task endpoints and fails if any of them does a "
+        "sequential scan."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--tasks-per-user", type=int, default=2_000)
+        parser.add_argument("--versions-per-task", type=int, default=3)
+
+    def handle(self, *_args: Any, **options: Any) -> None:  # noqa: ANN401
+        if connection.vendor not in {"postgresql", "sqlite"}:
+            msg = f"Query plans cannot be checked on {connection.vendor}."
+            raise CommandError(msg)
+        # The test client sends requests to the "testserver" host
+        allowed_hosts = [*settings.ALLOWED_HOSTS, "testserver"]
+        with override_settings(ALLOWED_HOSTS=allowed_hosts), transaction.atomic():
+            offenders = self.check_plans(options)
+            transaction.set_rollback(True)  # Discard the seeded data
+        if offenders:
+            msg = f"{len(offenders)} endpoint queries do sequential scans."
+            raise CommandError(msg)
+        self.stdout.write(self.style.SUCCESS("No sequential scans found."))
+
+    def check_plans(self, options: dict[str, Any]) -> list[str]:
+        user = self.seed(options)
+        task = Task.objects.filter(user=user).first()
+        client = APIClient()
+        client.force_authenticate(user)
+        offenders = []
+        for path, params in ENDPOINTS:
+            url = path.format(task=task.pk)  # type: ignore[union-attr]
+            query = {key: str(value).format(task=task.pk) for key, value in params.items()}  # type: ignore[union-attr]  # noqa: E501
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url, query)
+            if response.status_code != 200:
+                msg = f"GET {url} {query} returned {response.status_code}."
+                raise CommandError(msg)
+            self.stdout.write(f"GET {url} {query}")
+            statements = dict.fromkeys(
+                captured["sql"] for captured in queries.captured_queries
+                if captured["sql"].lstrip().upper().startswith("SELECT")
+            )
+            for sql in statements:
+                plan = explain(sql)
+                scans = find_sequential_scans(plan)
+                status = self.style.ERROR("SEQ SCAN") if scans else self.style.SUCCESS("ok")  # noqa: E501
+                self.stdout.write(f"  [{status}] {sql[:120]}...")
+                for line in plan:
+                    self.stdout.write(f"      {line}")
+                offenders.extend(scans)
+        return offenders
+
+    def seed(self, options: dict[str, Any]) -> User:
+        self.stdout.write(
+            f"Seeding {options['users']} users x {options['tasks_per_user']} tasks..."
+        )
+        users = [create_user() for _ in range(options["users"])]
+        for user in users:
+            seed_tasks(user, options["tasks_per_user"])
+            seed_history(user, options["versions_per_task"])
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")  # Fresh planner statistics for the seeded rows
+        return users[0]
+
+
+def explain(sql: str) -> list[str]:
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(f"EXPLAIN {sql}")
+            return [row[0] for row in cursor.fetchall()]
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def find_sequential_scans(plan: list[str]) -> list[str]:
+    """Returns the plan lines that read a whole table instead of an index."""
+    if connection.vendor == "postgresql":
+        return [line.strip() for line in plan if "Seq Scan" in line]
+    # SQLite: "SCAN table" is a full table scan, "SEARCH"/"USING INDEX" are not
+    return [
+        line for line in plan
+        if line.startswith("SCAN ") and "USING" not in line and "CONSTANT" not in line
+    ]
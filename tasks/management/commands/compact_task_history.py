@@ -0,0 +1,64 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from tasks.models import TaskHistory
+from tasks.services.history_service import HistoryRewrite, rewrite_task_history
+
+
+class Command(BaseCommand):
+    help = (
+        "Converts the existing task history to delta entries with a snapshot every "
+        "--interval versions (or back to full entries with --expand) and reports "
+        "the space saved."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--interval", type=int, default=settings.TASK_HISTORY_SNAPSHOT_INTERVAL
+        )
+        parser.add_argument(
+            "--expand", action="store_true", help="Store every entry in full again."
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=200, help="Tasks per batch."
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Only report the space saved."
+        )
+
+    def handle(self, *_args: Any, **options: Any) -> None:  # noqa: ANN401
+        task_ids = list(
+            TaskHistory.objects.order_by("task_id")
+            .values_list("task_id", flat=True)
+            .distinct()
+        )
+        total = HistoryRewrite()
+        size = options["batch_size"]
+        for start in range(0, len(task_ids), size):
+            self.rewrite(task_ids[start:start + size], total, options)
+        saved = total.bytes_before - total.bytes_after
+        percent = saved / total.bytes_before * 100 if total.bytes_before else 0.0
+        action = "Would rewrite" if options["dry_run"] else "Rewrote"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{action} {total.rewritten} of {total.entries} history entries: "
+                f"{total.bytes_before} -> {total.bytes_after} bytes of JSON "
+                f"({saved} saved, {percent:.1f}%)."
+            )
+        )
+
+    def rewrite(
+        self, task_ids: list[Any], total: HistoryRewrite, options: dict[str, Any]
+    ) -> None:
+        result = rewrite_task_history(
+            task_ids,
+            options["interval"],
+            expand=options["expand"],
+            dry_run=options["dry_run"],
+        )
+        total.entries += result.entries
+        total.rewritten += result.rewritten
+        total.bytes_before += result.bytes_before
+        total.bytes_after += result.bytes_after
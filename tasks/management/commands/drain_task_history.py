@@ -0,0 +1,34 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from tasks.services.history_service import drain_history_outbox
+
+
+class Command(BaseCommand):
+    help = (
+        'Moves the history entries written in "outbox" mode (TASK_HISTORY_MODE) '
+        "to the task history, in batches."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep draining, sleeping --interval seconds when the outbox is empty.",
+        )
+        parser.add_argument("--interval", type=float, default=1.0)
+
+    def handle(self, *_args: Any, **options: Any) -> None:  # noqa: ANN401
+        total = 0
+        while True:
+            moved = drain_history_outbox(options["batch_size"])
+            total += moved
+            if moved:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS(f"Moved {total} history entries."))
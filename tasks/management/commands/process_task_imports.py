@@ -0,0 +1,34 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from tasks.services.import_service import run_pending_imports
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs the pending task imports (POST /tasks/import/) of "queue" mode '
+        "(TASK_IMPORT_MODE), oldest first, and resumes the ones a stopped worker "
+        "left running."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running, sleeping --interval seconds when no import is pending.",
+        )
+        parser.add_argument("--interval", type=float, default=1.0)
+
+    def handle(self, *_args: Any, **options: Any) -> None:  # noqa: ANN401
+        total = 0
+        while True:
+            ran = run_pending_imports()
+            total += ran
+            if ran:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS(f"Ran {total} task imports."))
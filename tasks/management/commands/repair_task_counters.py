@@ -0,0 +1,61 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from django.db.models import Count, Q
+
+from tasks.models import Task, UserTaskCounters
+
+BATCH_SIZE = 1_000
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the denormalized task counters of every user from the tasks "
+        "table and fixes the ones that drifted."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Only report the drifted counters."
+        )
+
+    def handle(self, *_args: Any, **options: Any) -> None:  # noqa: ANN401
+        with transaction.atomic():
+            # Locked before counting, so no increment lands between the count and
+            # the write: those waiting on the lock apply on top of the new values
+            locked = list(UserTaskCounters.objects.select_for_update().order_by("pk"))
+            counts = {
+                row["user_id"]: (row["total"], row["completed"])
+                for row in Task.objects.order_by()
+                .values("user_id")
+                .annotate(
+                    total=Count("id"), completed=Count("id", filter=Q(is_completed=True))  # noqa: E501
+                )
+                .iterator()
+            }
+            stale: list[UserTaskCounters] = []
+            for counters in locked:
+                total, completed = counts.pop(counters.user_id, (0, 0))  # type: ignore[attr-defined]
+                if (counters.total, counters.completed) != (total, completed):
+                    self.stdout.write(
+                        f"User {counters.user_id}: {counters.total}/{counters.completed} "  # type: ignore[attr-defined]  # noqa: E501
+                        f"-> {total}/{completed}"
+                    )
+                    counters.total, counters.completed = total, completed
+                    stale.append(counters)
+            missing = [
+                UserTaskCounters(user_id=user_id, total=total, completed=completed)
+                for user_id, (total, completed) in counts.items()
+            ]
+            if not options["dry_run"]:
+                UserTaskCounters.objects.bulk_update(
+                    stale, ["total", "completed"], batch_size=BATCH_SIZE
+                )
+                UserTaskCounters.objects.bulk_create(missing, batch_size=BATCH_SIZE)
+        action = "Found" if options["dry_run"] else "Repaired"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{action} {len(stale)} drifted and {len(missing)} missing counters."
+            )
+        )
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.15 on 2026-10-18 19:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def populate_counters(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    UserTaskCounters = apps.get_model('tasks', 'UserTaskCounters')
+    counts = (
+        Task.objects.order_by()
+        .values('user_id')
+        .annotate(total=Count('id'), completed=Count('id', filter=Q(is_completed=True)))
+    )
+    UserTaskCounters.objects.bulk_create(
+        (UserTaskCounters(user_id=row['user_id'], total=row['total'], completed=row['completed']) for row in counts.iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_task_query_shape_indexes'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserTaskCounters',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='task_counters', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'User task counters',
+                'verbose_name_plural': 'User task counters',
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
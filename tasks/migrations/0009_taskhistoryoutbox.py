@@ -0,0 +1,39 @@
+# Generated by Django 5.1.15 on 2026-10-18 19:36
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_usertaskcounters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='taskhistory',
+            name='change_date',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.CreateModel(
+            name='TaskHistoryOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField()),
+                ('change_date', models.DateTimeField(default=django.utils.timezone.now)),
+                ('changes', models.JSONField()),
+                ('previous_states', models.JSONField()),
+                ('change_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pending_history', to='tasks.task')),
+            ],
+            options={
+                'verbose_name': 'Task history outbox entry',
+                'verbose_name_plural': 'Task history outbox',
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.15 on 2026-10-18 20:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0009_taskhistoryoutbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='taskhistory',
+            name='delta',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='taskhistoryoutbox',
+            name='delta',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.15 on 2026-10-18 20:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0010_taskhistory_delta'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='taskhistory',
+            index=models.Index(fields=['task', 'change_date', 'version'], name='taskhistory_task_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskhistory',
+            index=models.Index(condition=models.Q(('delta__isnull', True)), fields=['task', 'version'], name='taskhistory_snapshot_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.15 on 2026-10-18 20:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0011_taskhistory_as_of_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskHistoryArchiveChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=255)),
+                ('offset', models.BigIntegerField()),
+                ('length', models.PositiveIntegerField()),
+                ('first_version', models.PositiveIntegerField()),
+                ('last_version', models.PositiveIntegerField()),
+                ('first_date', models.DateTimeField()),
+                ('last_date', models.DateTimeField()),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_history', to='tasks.task')),
+            ],
+            options={
+                'ordering': ['task', 'first_version'],
+                'indexes': [models.Index(fields=['task', 'first_version'], name='taskhistory_archive_idx')],
+            },
+        ),
+    ]
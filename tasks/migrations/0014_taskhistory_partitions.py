@@ -0,0 +1,217 @@
+from datetime import date
+
+from django.db import migrations, models
+from django.utils import timezone
+
+# Months of partitions created ahead of the current one
+PARTITIONS_AHEAD = 3
+
+VERSION_CHECK = 'taskhistory_version_check'
+
+POSTGRESQL_VERSION_CHECK = (
+    """
+    CREATE OR REPLACE FUNCTION {check}() RETURNS trigger AS $$
+    BEGIN
+        IF EXISTS (
+            SELECT 1 FROM {table}
+            WHERE task_id = NEW.task_id AND version = NEW.version
+                AND id <> NEW.id AND change_date <> NEW.change_date
+        ) THEN
+            RAISE unique_violation USING MESSAGE =
+                'Version ' || NEW.version || ' of task ' || NEW.task_id || ' already exists.';
+        END IF;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER {check} BEFORE INSERT OR UPDATE OF task_id, version, change_date
+        ON {table} FOR EACH ROW EXECUTE FUNCTION {check}()
+    """,
+)
+
+# The id of a new row isn't known yet before an INSERT on SQLite
+SQLITE_VERSION_CHECK = (
+    """
+    CREATE TRIGGER {check}_insert BEFORE INSERT ON {table}
+    WHEN EXISTS (
+        SELECT 1 FROM {table}
+        WHERE task_id = NEW.task_id AND version = NEW.version
+            AND change_date <> NEW.change_date
+    )
+    BEGIN SELECT RAISE(ABORT, 'This version of the task already exists.'); END
+    """,
+    """
+    CREATE TRIGGER {check}_update
+    BEFORE UPDATE OF task_id, version, change_date ON {table}
+    WHEN EXISTS (
+        SELECT 1 FROM {table}
+        WHERE task_id = NEW.task_id AND version = NEW.version AND id <> NEW.id
+    )
+    BEGIN SELECT RAISE(ABORT, 'This version of the task already exists.'); END
+    """,
+)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def create_version_check(apps, schema_editor):
+    """
+    Refuses a history entry whose task already has that version at another
+    change_date, which the (task, version, change_date) unique key lets through.
+    Entries with the same change_date are left to the unique key, so the outbox
+    drain can still skip the ones already moved.
+    """
+    table = apps.get_model('tasks', 'TaskHistory')._meta.db_table
+    statements = {
+        'postgresql': POSTGRESQL_VERSION_CHECK,
+        'sqlite': SQLITE_VERSION_CHECK,
+    }.get(schema_editor.connection.vendor, ())
+    for statement in statements:
+        schema_editor.execute(statement.format(check=VERSION_CHECK, table=table))
+
+
+def drop_version_check(apps, schema_editor):
+    table = apps.get_model('tasks', 'TaskHistory')._meta.db_table
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {VERSION_CHECK} ON {table}')
+        schema_editor.execute(f'DROP FUNCTION IF EXISTS {VERSION_CHECK}()')
+    elif vendor == 'sqlite':
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {VERSION_CHECK}_insert')
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {VERSION_CHECK}_update')
+
+
+def table_keys(cursor, table):
+    """
+    The primary, unique and foreign keys of the table as (name, definition), and
+    its other indexes as CREATE INDEX statements, to build them again with the
+    names Django gave them.
+    """
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'f')",
+        [table],
+    )
+    constraints = cursor.fetchall()
+    cursor.execute(
+        "SELECT indexdef FROM pg_indexes WHERE tablename = %s "
+        "AND indexname NOT IN (SELECT conname FROM pg_constraint "
+        "WHERE conrelid = %s::regclass)",
+        [table, table],
+    )
+    # Those of a partitioned table are created ON ONLY it, without its partitions
+    indexes = [indexdef.replace(' ON ONLY ', ' ON ') for (indexdef,) in cursor.fetchall()]
+    return constraints, indexes
+
+
+def replace_history_table(schema_editor, table, create, primary_key):
+    """
+    Moves the rows of the history to a new table created by ``create`` (run
+    with the old one renamed), then drops the old one and gives the new one its
+    keys, indexes and version check. CHECK and NOT NULL constraints are copied
+    by CREATE TABLE ... LIKE.
+    """
+    execute = schema_editor.execute
+    with schema_editor.connection.cursor() as cursor:
+        constraints, indexes = table_keys(cursor, table)
+    execute(f'ALTER TABLE {table} RENAME TO {table}_old')
+    create()
+    execute(f'INSERT INTO {table} SELECT * FROM {table}_old')
+    execute(f'DROP TABLE {table}_old')  # With its trigger, sequence and partitions
+    execute(f'ALTER SEQUENCE {table}_id_seq_new RENAME TO {table}_id_seq')
+    execute(
+        f"SELECT setval('{table}_id_seq', "
+        f"COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+    )
+    for name, definition in constraints:
+        if definition.startswith('PRIMARY KEY'):
+            definition = f'PRIMARY KEY ({primary_key})'
+        execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} {definition}')
+    for indexdef in indexes:
+        execute(indexdef)
+
+
+def create_id_sequence(execute, table):
+    """A sequence for the id: the identity of the old table goes with it."""
+    execute(f'CREATE SEQUENCE {table}_id_seq_new OWNED BY {table}.id')
+    execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{table}_id_seq_new')")
+
+
+def partition_history(apps, schema_editor):
+    """
+    On PostgreSQL, turns the history into a table partitioned by month of
+    change_date, so the archive command can drop old months instead of
+    deleting their rows. Its primary key becomes (id, change_date). There is no
+    default partition: archive_task_history keeps PARTITIONS_AHEAD months
+    created ahead, and the rows of a default partition would keep their month's
+    partition from being created.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    table = apps.get_model('tasks', 'TaskHistory')._meta.db_table
+    execute = schema_editor.execute
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'SELECT MIN(change_date), MAX(change_date) FROM {table}')
+        oldest, newest = cursor.fetchone()
+    this_month = timezone.now().date().replace(day=1)
+    first = oldest.date().replace(day=1) if oldest else this_month
+    last = max(newest.date().replace(day=1) if newest else this_month, this_month)
+
+    def create():
+        execute(
+            f'CREATE TABLE {table} (LIKE {table}_old INCLUDING DEFAULTS '
+            f'INCLUDING CONSTRAINTS) PARTITION BY RANGE (change_date)'
+        )
+        create_id_sequence(execute, table)
+        month = first
+        while month <= add_months(last, PARTITIONS_AHEAD):
+            end = add_months(month, 1)
+            execute(
+                f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month}') TO ('{end}')"
+            )
+            month = end
+
+    replace_history_table(schema_editor, table, create, 'id, change_date')
+    create_version_check(apps, schema_editor)
+
+
+def unpartition_history(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    table = apps.get_model('tasks', 'TaskHistory')._meta.db_table
+    execute = schema_editor.execute
+
+    def create():
+        execute(
+            f'CREATE TABLE {table} '
+            f'(LIKE {table}_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+        )
+        create_id_sequence(execute, table)
+
+    replace_history_table(schema_editor, table, create, 'id')
+    create_version_check(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0013_taskimportjob'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='taskhistory',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='taskhistory',
+            constraint=models.UniqueConstraint(fields=('task', 'version', 'change_date'), name='taskhistory_task_version_uniq'),
+        ),
+        migrations.RunPython(create_version_check, drop_version_check),
+        migrations.RunPython(partition_history, unpartition_history),
+    ]
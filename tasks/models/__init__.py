@@ -1,4 +1,13 @@
 from .task import Task
-from .task_history import TaskHistory
+from .task_history import TaskHistory, TaskHistoryArchiveChunk, TaskHistoryOutbox
+from .task_import_job import TaskImportJob
+from .user_task_counters import UserTaskCounters
 
-__all__ = ["Task", "TaskHistory"]
+__all__ = [
+    "Task",
+    "TaskHistory",
+    "TaskHistoryArchiveChunk",
+    "TaskHistoryOutbox",
+    "TaskImportJob",
+    "UserTaskCounters",
+]
@@ -2,11 +2,13 @@ import uuid
 from typing import Any
 
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 
 from core.models import TimeStampedModel
 from users.models import User
 
+TRACKED_FIELDS = ("title", "description", "is_completed")
+
 
 class Task(TimeStampedModel):
 
@@ -19,6 +21,36 @@ class Task(TimeStampedModel):
     user = models.ForeignKey(User, related_name="tasks", on_delete=models.CASCADE)
     latest_version = models.PositiveIntegerField(default=0)
 
+    @classmethod
+    def from_db(cls, db: str | None, field_names: Any, values: Any) -> "Task":  # noqa: ANN401
+        instance = super().from_db(db, field_names, values)
+        instance.snapshot_state()
+        return instance
+
+    def refresh_from_db(
+        self, using: str | None = None, fields: Any = None, **kwargs: Any  # noqa: ANN401
+    ) -> None:
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self.snapshot_state(fields)
+
+    def snapshot_state(self, fields: Any = None) -> None:  # noqa: ANN401
+        """
+        Remembers the persisted values of the fields tracked by the history.
+
+        When ``fields`` is given (e.g. a deferred field being loaded) only those
+        are refreshed, so pending in-memory changes to the others are kept.
+        """
+        names = TRACKED_FIELDS if fields is None else set(fields) & set(TRACKED_FIELDS)
+        state = {} if fields is None else dict(self.get_loaded_state())
+        state.update(
+            {field: self.__dict__[field] for field in names if field in self.__dict__}
+        )
+        self._loaded_state = state
+
+    def get_loaded_state(self) -> dict[str, Any]:
+        """Returns the tracked values as they were when loaded or last saved."""
+        return getattr(self, "_loaded_state", {})
+
     def clean(self) -> None:
         super().clean()
         if not self.title.strip():
@@ -30,12 +62,43 @@ class Task(TimeStampedModel):
 
     def save(self, *args: Any, **kwargs: dict[str, Any]) -> None:  # type: ignore # noqa: ANN401
         self.clean()
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and set(update_fields) & set(TRACKED_FIELDS):
+            kwargs["update_fields"] = {*update_fields, "latest_version"}  # type: ignore
+        version = self.latest_version
+        # The history row is written by the save signals; keep both in one transaction
+        try:
+            with transaction.atomic(using=kwargs.get("using"), savepoint=False):  # type: ignore
+                super().save(*args, **kwargs)
+        finally:
+            # Still the F() of the UPDATE when no history row read the version back
+            if not isinstance(self.latest_version, int):
+                self.latest_version = version
+        # Only the saved fields are persisted: unsaved changes stay pending
+        self.snapshot_state(kwargs.get("update_fields"))
 
     class Meta:  # type: ignore
         constraints = [
             models.UniqueConstraint(
                 fields=["title", "user"], name="unique_title_per_user"
             )]
+        indexes = [
+            # Keyset pagination keys: (created_at, id) and (title, id) per user
+            models.Index(
+                fields=["user", "created_at", "id"], name="task_user_created_idx"
+            ),
+            models.Index(fields=["user", "title", "id"], name="task_user_title_idx"),
+            # ?status= filter with the default ordering, stats and metrics counts
+            models.Index(
+                fields=["user", "is_completed", "created_at", "id"],
+                name="task_user_status_idx",
+            ),
+            # Partial index for the pending list ordered by title
+            models.Index(
+                fields=["user", "title", "id"],
+                condition=models.Q(is_completed=False),
+                name="task_user_pending_title_idx",
+            ),
+        ]
         verbose_name = "Task"
         verbose_name_plural = "Tasks"
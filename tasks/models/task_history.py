@@ -1,50 +1,161 @@
+import uuid
 from typing import Any, ClassVar
 
+from django.conf import settings
 from django.db import models
+from django.utils.timezone import now
 
+from tasks.domain.history import encode_changes, is_snapshot_version
 from users.models import User
 
 from .task import Task
 
+HISTORY_STORAGE_DELTA = "delta"
+
+
+class TaskHistoryEntry(models.Model):
+    """Fields shared by the history and its outbox."""
 
-class TaskHistory(models.Model):
-    objects: ClassVar[models.Manager["TaskHistory"]]
     version = models.PositiveIntegerField()
-    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="history")
     change_by = models.ForeignKey(
         User, on_delete=models.SET_NULL, null=True, blank=True
     )
-    change_date = models.DateTimeField(auto_now=True)
+    # Set when the change happens, not when the row is written (outbox drains)
+    change_date = models.DateTimeField(default=now)
     changes = models.JSONField()
     previous_states = models.JSONField()
+    # Delta entries (TASK_HISTORY_STORAGE="delta") keep only the new values here
+    # and leave changes and previous_states empty until read (tasks.domain.history)
+    delta = models.JSONField(null=True, blank=True)
 
     class Meta:
-        unique_together = ["task", "version"]
-        ordering = ["-version"]
+        abstract = True
 
-    def __str__(self) -> str:
-        return (
-            f"Task History: {self.task.title} "  # type: ignore[attr-defined]
-            f"(Version {self.version}) on {self.changes}"
-        )
+    @staticmethod
+    def encode(
+        version: int, changes: dict[str, Any], previous_states: dict[str, Any]
+    ) -> dict[str, Any]:
+        """The stored fields of an entry, according to TASK_HISTORY_STORAGE."""
+        interval = settings.TASK_HISTORY_SNAPSHOT_INTERVAL
+        if settings.TASK_HISTORY_STORAGE == HISTORY_STORAGE_DELTA and not (
+            is_snapshot_version(version, interval)
+        ):
+            delta = encode_changes(changes)
+            return {"changes": {}, "previous_states": {}, "delta": delta}
+        return {"changes": changes, "previous_states": previous_states, "delta": None}
 
     @classmethod
     def create_from_task(
         cls,
         task: Task,
-        change_by: User | None,
+        change_by_id: uuid.UUID | None,
         changes: dict[str, Any],
         previous_states: dict[str, Any],
-    ) -> "TaskHistory":
-        version = task.latest_version + 1  # type: ignore
-        history = cls(
+    ) -> "TaskHistoryEntry":
+        """
+        Writes the history entry for a task whose save already bumped
+        ``latest_version`` with an F() expression, reading the resulting version
+        back inside the same transaction.
+        """
+        version = (
+            Task.objects.filter(pk=task.pk)
+            .values_list("latest_version", flat=True)
+            .get()
+        )
+        task.latest_version = version  # type: ignore
+        return cls.objects.create(
             task=task,
-            change_by=change_by,
+            change_by_id=change_by_id,
             version=version,
-            changes=changes,
-            previous_states=previous_states,
+            **cls.encode(version, changes, previous_states),
+        )
+
+
+class TaskHistory(TaskHistoryEntry):
+    objects: ClassVar[models.Manager["TaskHistory"]]
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="history")
+
+    class Meta:
+        # The partition key (change_date, on PostgreSQL) must be part of every
+        # unique key; migration 0014 adds a trigger that still refuses a second
+        # entry with the same task and version
+        constraints = [
+            models.UniqueConstraint(
+                fields=["task", "version", "change_date"],
+                name="taskhistory_task_version_uniq",
+            ),
+        ]
+        ordering = ["-version"]
+        indexes = [
+            # Point-in-time reads: the version at a date, then the nearest
+            # snapshot before it without walking the deltas in between
+            models.Index(
+                fields=["task", "change_date", "version"],
+                name="taskhistory_task_date_idx",
+            ),
+            models.Index(
+                fields=["task", "version"],
+                condition=models.Q(delta__isnull=True),
+                name="taskhistory_snapshot_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return (
+            f"Task History: {self.task.title} "  # type: ignore[attr-defined]
+            f"(Version {self.version}) on {self.changes}"
+        )
+
+
+class TaskHistoryOutbox(TaskHistoryEntry):
+    """
+    History entries waiting to be moved to TaskHistory by the
+    drain_task_history command, when TASK_HISTORY_MODE is "outbox".
+    """
+
+    objects: ClassVar[models.Manager["TaskHistoryOutbox"]]
+    task = models.ForeignKey(
+        Task, on_delete=models.CASCADE, related_name="pending_history"
+    )
+
+    class Meta:
+        ordering = ["id"]
+        verbose_name = "Task history outbox entry"
+        verbose_name_plural = "Task history outbox"
+
+    def __str__(self) -> str:
+        return f"Pending history of {self.task_id} (Version {self.version})"  # type: ignore[attr-defined]
+
+
+class TaskHistoryArchiveChunk(models.Model):
+    """
+    Where archived history entries of a task are: ``length`` bytes at
+    ``offset`` of an archive file, a gzip member of JSON lines that may hold
+    other tasks' entries too (tasks.services.archive_service).
+    """
+
+    objects: ClassVar[models.Manager["TaskHistoryArchiveChunk"]]
+    task = models.ForeignKey(
+        Task, on_delete=models.CASCADE, related_name="archived_history"
+    )
+    path = models.CharField(max_length=255)  # Relative to TASK_HISTORY_ARCHIVE_DIR
+    offset = models.BigIntegerField()
+    length = models.PositiveIntegerField()
+    first_version = models.PositiveIntegerField()
+    last_version = models.PositiveIntegerField()
+    first_date = models.DateTimeField()
+    last_date = models.DateTimeField()
+
+    class Meta:
+        ordering = ["task", "first_version"]
+        indexes = [
+            models.Index(
+                fields=["task", "first_version"], name="taskhistory_archive_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return (
+            f"Archived history of {self.task_id} "  # type: ignore[attr-defined]
+            f"(Versions {self.first_version}-{self.last_version}) in {self.path}"
         )
-        task.latest_version = version  # type: ignore
-        task.save(update_fields=["latest_version"])  # type: ignore[arg-type]
-        history.save()
-        return history
@@ -0,0 +1,47 @@
+import uuid
+from typing import ClassVar
+
+from django.db import models
+
+from core.models import TimeStampedModel
+from users.models import User
+
+
+class TaskImportJob(TimeStampedModel):
+    """
+    An uploaded file of tasks being imported (tasks.services.import_service),
+    with the progress that POST /tasks/import/ clients poll.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        RUNNING = "running"
+        COMPLETED = "completed"
+        FAILED = "failed"
+
+    objects: ClassVar[models.Manager["TaskImportJob"]]
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="task_imports"
+    )
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    format = models.CharField(max_length=10)
+    path = models.CharField(max_length=255)  # Relative to TASK_IMPORT_DIR
+    size = models.BigIntegerField()
+    bytes_read = models.BigIntegerField(default=0)
+    rows = models.PositiveIntegerField(default=0)
+    created = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    # The first IMPORT_MAX_ERRORS failures, as {"line": ..., "errors": ...}
+    errors = models.JSONField(default=list)
+    message = models.TextField(blank=True, default="")  # Why the job failed
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta(TimeStampedModel.Meta):
+        verbose_name = "Task import job"
+        verbose_name_plural = "Task import jobs"
+
+    def __str__(self) -> str:
+        return f"Import {self.id} of {self.user_id}: {self.status}"  # type: ignore[attr-defined]
@@ -0,0 +1,26 @@
+from typing import ClassVar
+
+from django.db import models
+
+from users.models import User
+
+
+class UserTaskCounters(models.Model):
+    """
+    Denormalized task counters of a user, kept up to date with F() expressions by
+    the task signals so the statistics never need to count the tasks.
+    """
+
+    objects: ClassVar[models.Manager["UserTaskCounters"]]
+    user = models.OneToOneField(
+        User, primary_key=True, on_delete=models.CASCADE, related_name="task_counters"
+    )
+    total = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = "User task counters"
+        verbose_name_plural = "User task counters"
+
+    def __str__(self) -> str:
+        return f"Task counters of {self.user_id}: {self.completed}/{self.total}"  # type: ignore[attr-defined]
@@ -1,8 +1,222 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import json
+from typing import Any
 
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Model, Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
 
-class TaskPagination(PageNumberPagination):
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over a composite key.
+
+    The key is the queryset ordering plus a unique tiebreaker, so each page is a
+    range scan on an index instead of an OFFSET, and no COUNT(*) is needed.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    default_ordering: tuple[str, ...] = ("-created_at",)
+    tiebreaker = "id"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: APIView | None = None
+    ) -> list[Any]:
+        return self.set_page(list(self.get_page_queryset(queryset, request)))
+
+    async def apaginate_queryset(
+        self, queryset: QuerySet, request: Request, view: APIView | None = None
+    ) -> list[Any]:
+        page_queryset = self.get_page_queryset(queryset, request)
+        return self.set_page([row async for row in page_queryset])
+
+    def get_page_queryset(self, queryset: QuerySet, request: Request) -> QuerySet:
+        """The rows of the requested page plus one, to know if there is a next."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        queryset = queryset.order_by(*self.ordering)
+        if position := self.decode_cursor(request, queryset.model):
+            queryset = queryset.filter(self.get_position_filter(position))
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, rows: list[Any]) -> list[Any]:
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data: Any) -> Response:  # noqa: ANN401
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_page_size(self, request: Request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(page_size, self.max_page_size) if page_size > 0 else self.page_size
+
+    def get_ordering(self, queryset: QuerySet) -> list[str]:
+        """Uses the queryset ordering (e.g. from OrderingFilter) plus the tiebreaker."""
+        ordering = list(queryset.query.order_by) or list(self.default_ordering)
+        if self.tiebreaker not in {field.lstrip("-") for field in ordering}:
+            descending = ordering[-1].startswith("-")
+            ordering.append(f"-{self.tiebreaker}" if descending else self.tiebreaker)
+        return ordering
+
+    def get_position_filter(self, position: list[Any]) -> Q:
+        """
+        Builds the "after this row" condition of the composite key, e.g.
+        a <= x AND ((a < x) OR (a = x AND b < y)) for a descending (a, b)
+        ordering. The redundant leading bound lets the database seek the index.
+        """
+        first = self.ordering[0]
+        bound_lookup = "lte" if first.startswith("-") else "gte"
+        bound = Q(**{f"{first.lstrip('-')}__{bound_lookup}": position[0]})
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            equal = {
+                previous.lstrip("-"): value
+                for previous, value in zip(self.ordering[:index], position, strict=False)  # noqa: E501
+            }
+            condition |= Q(**equal, **{f"{name}__{lookup}": position[index]})
+        return bound & condition
+
+    def decode_cursor(
+        self, request: Request, model: type[Model]
+    ) -> list[Any] | None:
+        """
+        The position of the cursor, each value converted by its ordering field,
+        so a tampered cursor is a 404 rather than an error of the query.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            return [
+                self.parse_cursor_value(model, field.lstrip("-"), value)
+                for field, value in zip(self.ordering, position, strict=True)
+            ]
+        except (ValidationError, TypeError, ValueError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+
+    def parse_cursor_value(self, model: type[Model], name: str, value: Any) -> Any:  # noqa: ANN401
+        if isinstance(value, list | dict) or value is None:
+            msg = f"Invalid {name} in the cursor"
+            raise ValueError(msg)
+        return model._meta.get_field(name).to_python(value)  # noqa: SLF001
+
+    def encode_cursor(self, row: Model | dict[str, Any]) -> str:
+        names = [field.lstrip("-") for field in self.ordering]
+        if isinstance(row, dict):  # .values() rows
+            position = [row[name] for name in names]
+        else:
+            position = [getattr(row, name) for name in names]
+        payload = json.dumps(position, default=str, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.page[-1])
+        )
+
+
+class TaskCursorPagination(KeysetPagination):
+    default_ordering = ("-created_at",)  # Combined with "id": (created_at, id)
+
+
+class TaskHistoryCursorPagination(KeysetPagination):
+    default_ordering = ("task_id",)
+    tiebreaker = "version"  # (task_id, version) is unique
+
+
+class CursorOptInMixin:
+    """
+    Switches a paginator to keyset pagination when the "cursor" query parameter
+    is present (an empty value returns the first page).
+    """
+
+    cursor_pagination_class: type[KeysetPagination]
+    cursor_paginator: KeysetPagination | None = None
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: APIView | None = None
+    ) -> list[Model] | None:
+        cursor_paginator = self.cursor_pagination_class()
+        if cursor_paginator.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)  # type: ignore[misc]
+        self.cursor_paginator = cursor_paginator
+        return cursor_paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data: Any) -> Response:  # noqa: ANN401
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)  # type: ignore[misc]
+
+
+class TaskPagination(CursorOptInMixin, PageNumberPagination):
     page_size = 10
     page_query_param = "page"
     page_size_query_param = "page_size"
     max_page_size = 100
+    cursor_pagination_class = TaskCursorPagination
+
+    async def apaginate_queryset(
+        self, queryset: QuerySet, request: Request, view: APIView | None = None
+    ) -> list[Any] | None:
+        """Same pages as ``paginate_queryset``, queried with the async ORM."""
+        cursor_paginator = self.cursor_pagination_class()
+        if cursor_paginator.cursor_query_param in request.query_params:
+            self.cursor_paginator = cursor_paginator
+            return await cursor_paginator.apaginate_queryset(queryset, request, view)
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        paginator = self.django_paginator_class(queryset, page_size)
+        # Paginator.count is a cached_property: fill it without a sync query
+        paginator.__dict__["count"] = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            )
+            raise NotFound(msg) from exc
+        self.page.object_list = [row async for row in self.page.object_list]
+        self.request = request
+        return self.page.object_list
+
+
+class TaskHistoryPagination(CursorOptInMixin, BasePagination):
+    """History is listed in full unless a cursor is requested."""
+
+    cursor_pagination_class = TaskHistoryCursorPagination
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: APIView | None = None
+    ) -> list[Model] | None:
+        if self.cursor_pagination_class.cursor_query_param not in request.query_params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
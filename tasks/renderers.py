@@ -0,0 +1,37 @@
+import csv
+import io
+from typing import Any
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+
+class NDJSONRenderer(JSONRenderer):
+    """
+    Selects ?format=ndjson for the export endpoints, which stream their own
+    body; only error responses are rendered here, as one JSON line.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def render(self, data: Any, *args: Any, **kwargs: Any) -> bytes:  # noqa: ANN401
+        return super().render(data, *args, **kwargs) + b"\n"
+
+
+class CSVRenderer(BaseRenderer):
+    """?format=csv of the export endpoints; error responses are a one-row CSV."""
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data: Any, *_args: Any, **_kwargs: Any) -> bytes:  # noqa: ANN401
+        if data is None:
+            return b""
+        if not isinstance(data, dict):
+            data = {"detail": data}
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(data.keys())
+        writer.writerow(data.values())
+        return buffer.getvalue().encode()
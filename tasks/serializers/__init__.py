@@ -1,4 +1,13 @@
-from .task import TaskSerializer
+from .read import TaskHistoryReadSerializer, TaskReadSerializer
+from .task import TaskBulkSerializer, TaskSerializer
 from .task_history import TaskHistorySerializer
+from .task_import_job import TaskImportJobSerializer
 
-__all__ = ["TaskHistorySerializer", "TaskSerializer"]
+__all__ = [
+    "TaskBulkSerializer",
+    "TaskHistoryReadSerializer",
+    "TaskHistorySerializer",
+    "TaskImportJobSerializer",
+    "TaskReadSerializer",
+    "TaskSerializer",
+]
@@ -22,8 +22,8 @@ class TaskSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "user", "created_at", "updated_at"]
 
     def get_user(self, obj: Task) -> dict[str, Any]:
-        user = obj.user
-        return {"id": user.id, "username": user.username}
+        # Expects the user joined by the queryset (select_related) or already set
+        return {"id": obj.user_id, "username": obj.user.username}
 
     def validate_title(self, title: str) -> str:
         """Validates if the title already exists for the user."""
@@ -33,3 +33,13 @@ class TaskSerializer(serializers.ModelSerializer):
             msg = "A task with this title already exists for this user."
             raise serializers.ValidationError({"title": [msg]})  # pyrefly: ignore [bad-argument-type]  # noqa: E501
         return title
+
+
+class TaskBulkSerializer(TaskSerializer):
+    """
+    Validates one item of a bulk request. Title uniqueness is checked for the
+    whole batch at once by the bulk service instead of one query per item.
+    """
+
+    def validate_title(self, title: str) -> str:
+        return title
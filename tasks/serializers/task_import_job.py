@@ -0,0 +1,32 @@
+from rest_framework import serializers
+
+from tasks.models import TaskImportJob
+
+
+class TaskImportJobSerializer(serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField()  # Percent of the file read
+
+    class Meta:  # type: ignore
+        model = TaskImportJob
+        fields = [
+            "id",
+            "status",
+            "format",
+            "size",
+            "bytes_read",
+            "progress",
+            "rows",
+            "created",
+            "failed",
+            "errors",
+            "message",
+            "created_at",
+            "finished_at",
+        ]
+
+    def get_progress(self, obj: TaskImportJob) -> float:
+        if obj.status == TaskImportJob.Status.COMPLETED:
+            return 100.0
+        if not obj.size:
+            return 0.0
+        return round(min(obj.bytes_read / obj.size, 1) * 100, 1)
@@ -0,0 +1,133 @@
+"""
+Files of the cold task history archive (archive_task_history command).
+
+An archive file is a series of gzip members (chunks) of JSON lines, one
+archived entry per line ordered by (task, version), so ``zcat`` reads it
+whole and a chunk can be read alone. TaskHistoryArchiveChunk rows index the
+byte offset and length of the chunks holding each task's entries, so reading a
+task's archived history decompresses only those chunks.
+"""
+
+import gzip
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+
+from tasks.models import TaskHistoryArchiveChunk
+
+ARCHIVE_CHUNK_ENTRIES = 1_000
+ARCHIVED_FIELDS = (
+    "task_id",
+    "version",
+    "change_by_id",
+    "change_date",
+    "changes",
+    "previous_states",
+)
+
+
+def _encode(value: Any) -> str:  # noqa: ANN401
+    # Full precision: DjangoJSONEncoder cuts datetimes to milliseconds
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+class ArchiveWriter:
+    """Appends chunks of entries to an archive file, created on first write."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.path = Path(settings.TASK_HISTORY_ARCHIVE_DIR) / name
+        self.bytes_written = 0
+        self._file = None
+
+    def write(self, rows: list[dict[str, Any]]) -> list[TaskHistoryArchiveChunk]:
+        """
+        Writes ``rows`` (full entries ordered by task and version) and returns
+        their index rows, unsaved. The data is on disk when this returns, so the
+        index may be committed: it never points to bytes that may be lost.
+        """
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("ab")
+        index = []
+        for start in range(0, len(rows), ARCHIVE_CHUNK_ENTRIES):
+            chunk = rows[start:start + ARCHIVE_CHUNK_ENTRIES]
+            lines = "".join(
+                json.dumps(
+                    {field: row[field] for field in ARCHIVED_FIELDS},
+                    default=_encode,
+                    separators=(",", ":"),
+                ) + "\n"
+                for row in chunk
+            )
+            data = gzip.compress(lines.encode())
+            offset = self._file.tell()
+            self._file.write(data)
+            self.bytes_written += len(data)
+            index.extend(self._index(chunk, offset, len(data)))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return index
+
+    def _index(
+        self, chunk: list[dict[str, Any]], offset: int, length: int
+    ) -> list[TaskHistoryArchiveChunk]:
+        by_task: dict[Any, list[dict[str, Any]]] = {}
+        for row in chunk:
+            by_task.setdefault(row["task_id"], []).append(row)
+        return [
+            TaskHistoryArchiveChunk(
+                task_id=task_id,
+                path=self.name,
+                offset=offset,
+                length=length,
+                first_version=rows[0]["version"],
+                last_version=rows[-1]["version"],
+                first_date=rows[0]["change_date"],
+                last_date=rows[-1]["change_date"],
+            )
+            for task_id, rows in by_task.items()
+        ]
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+
+def read_archived_history(
+    task_id: Any,  # noqa: ANN401
+    *,
+    user: Any = None,  # noqa: ANN401
+    version: int | None = None,
+    at: datetime | None = None,
+) -> list[dict[str, Any]]:
+    """
+    The archived entries of a task (of ``user``, when given), as history rows
+    by descending version. With ``version``, only the chunk holding it is read;
+    with ``at``, only the last chunk starting at or before that time.
+    """
+    chunks = TaskHistoryArchiveChunk.objects.filter(task_id=task_id)
+    if user is not None:
+        chunks = chunks.filter(task__user=user)
+    if version is not None:
+        chunks = chunks.filter(first_version__lte=version, last_version__gte=version)
+    if at is not None:
+        chunks = chunks.filter(first_date__lte=at).order_by("-first_version")[:1]
+    rows = []
+    task = str(task_id)
+    for path, offset, length in chunks.values_list("path", "offset", "length"):
+        with (Path(settings.TASK_HISTORY_ARCHIVE_DIR) / path).open("rb") as file:
+            file.seek(offset)
+            lines = gzip.decompress(file.read(length)).decode().splitlines()
+        for line in lines:
+            entry = json.loads(line)
+            if entry["task_id"] == task:
+                entry["change_date"] = datetime.fromisoformat(entry["change_date"])
+                entry["delta"] = None
+                rows.append(entry)
+    rows.sort(key=lambda row: row["version"], reverse=True)
+    return rows
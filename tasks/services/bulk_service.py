@@ -0,0 +1,284 @@
+import uuid
+from http import HTTPStatus
+from typing import Any
+
+from django.db import IntegrityError, transaction
+from django.utils.timezone import now
+
+from tasks.models import Task, TaskHistory, TaskHistoryOutbox
+from tasks.models.task import TRACKED_FIELDS
+from tasks.serializers import TaskBulkSerializer, TaskSerializer
+from tasks.services.history_service import get_history_model, get_task_changes
+from tasks.signals import (
+    batch_task_changes,
+    clear_user_task_cache,
+    update_user_task_counters,
+)
+from users.models import User
+
+BULK_MAX_ITEMS = 500
+
+DUPLICATE_TITLE_MSG = "A task with this title already exists for this user."
+INVALID_ID_MSG = "A valid task id is required."
+DUPLICATE_ID_MSG = "This task appears more than once in the request."
+NOT_FOUND_MSG = "Task not found."
+
+Result = dict[str, Any]
+
+
+def _failure(index: int, status: HTTPStatus, errors: Any) -> Result:  # noqa: ANN401
+    return {"index": index, "status": status.value, "errors": errors}
+
+
+def _parse_ids(items: list[Any], results: list[Result | None]) -> dict[int, uuid.UUID]:
+    """Parses the task id of every item, recording a failure for invalid ones."""
+    ids: dict[int, uuid.UUID] = {}
+    seen: set[uuid.UUID] = set()
+    for index, item in enumerate(items):
+        raw_id = item.get("id") if isinstance(item, dict) else item
+        try:
+            task_id = uuid.UUID(str(raw_id))
+        except ValueError:
+            results[index] = _failure(index, HTTPStatus.BAD_REQUEST, {"id": [INVALID_ID_MSG]})  # noqa: E501
+            continue
+        if task_id in seen:
+            results[index] = _failure(index, HTTPStatus.BAD_REQUEST, {"id": [DUPLICATE_ID_MSG]})  # noqa: E501
+            continue
+        seen.add(task_id)
+        ids[index] = task_id
+    return ids
+
+
+def _find_title_conflicts(
+    user: User, titles: dict[int, str], own_ids: dict[int, uuid.UUID] | None = None
+) -> set[int]:
+    """
+    Returns the indexes whose title is already used by another stored task of the
+    user or by an earlier item of the same batch. One query for the whole batch.
+    """
+    own_ids = own_ids or {}
+    holders = dict(
+        Task.objects.filter(user=user, title__in=set(titles.values())).values_list(
+            "title", "id"
+        )
+    )
+    conflicts: set[int] = set()
+    seen: set[str] = set()
+    for index, title in titles.items():
+        holder = holders.get(title)
+        if title in seen or (holder is not None and holder != own_ids.get(index)):
+            conflicts.add(index)
+        seen.add(title)
+    return conflicts
+
+
+def _write_updates(tasks: list[Task], user: User) -> list[Task]:
+    """
+    Saves the tasks that really changed with one UPDATE and records their history
+    with one INSERT. Returns the changed tasks.
+    """
+    updated_at = now()
+    history_model = get_history_model()
+    changed: list[Task] = []
+    history: list[TaskHistory | TaskHistoryOutbox] = []
+    for task in tasks:
+        task.clean()
+        changes, previous_states = get_task_changes(task)
+        if not changes:
+            continue
+        task.latest_version += 1
+        task.updated_at = updated_at
+        changed.append(task)
+        history.append(
+            history_model(
+                task=task,
+                change_by_id=user.id,
+                version=task.latest_version,
+                **history_model.encode(task.latest_version, changes, previous_states),
+            )
+        )
+    Task.objects.bulk_update(changed, [*TRACKED_FIELDS, "latest_version", "updated_at"])
+    history_model.objects.bulk_create(history)  # type: ignore[arg-type]
+    return changed
+
+
+def _insert_tasks(
+    user: User, validated: dict[int, dict[str, Any]]
+) -> tuple[dict[int, Task], set[int]]:
+    """
+    Inserts the validated items whose title is free, with one INSERT, and
+    returns them with the indexes of the others. A concurrent request may take
+    a title between the check and the INSERT: the batch is then checked and
+    inserted again.
+    """
+    titles = {index: data["title"] for index, data in validated.items()}
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                conflicts = _find_title_conflicts(user, titles)
+                tasks = {
+                    index: Task(user=user, **data)
+                    for index, data in validated.items()
+                    if index not in conflicts
+                }
+                for task in tasks.values():
+                    task.clean()
+                Task.objects.bulk_create(tasks.values())
+                update_user_task_counters(
+                    user.id,
+                    total=len(tasks),
+                    completed=sum(task.is_completed for task in tasks.values()),
+                )
+        except IntegrityError:
+            if attempt:
+                raise
+        else:
+            break
+    return tasks, conflicts
+
+
+def _update_tasks(
+    user: User,
+    validated: dict[int, tuple[Task, dict[str, Any]]],
+    ids: dict[int, uuid.UUID],
+) -> tuple[list[Task], set[int]]:
+    """
+    Applies the validated changes whose new title is free and saves them. Returns
+    the changed tasks with the indexes whose title is taken. A concurrent request
+    may take a title between the check and the UPDATE: the tasks are then put
+    back as loaded, checked and updated again.
+    """
+    renamed = {
+        index: data["title"]
+        for index, (task, data) in validated.items()
+        if "title" in data and data["title"] != task.title
+    }
+    loaded = {
+        index: (task.get_loaded_state(), task.latest_version, task.updated_at)
+        for index, (task, _data) in validated.items()
+    }
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                conflicts = _find_title_conflicts(user, renamed, ids)
+                for index, (task, data) in validated.items():
+                    if index not in conflicts:
+                        for field, value in data.items():
+                            setattr(task, field, value)
+                changed = _write_updates(
+                    [
+                        task
+                        for index, (task, _data) in validated.items()
+                        if index not in conflicts
+                    ],
+                    user,
+                )
+                update_user_task_counters(
+                    user.id,
+                    completed=sum(
+                        1 if task.is_completed else -1
+                        for task in changed
+                        if task.is_completed != task.get_loaded_state()["is_completed"]
+                    ),
+                )
+        except IntegrityError:
+            if attempt:
+                raise
+            for index, (task, _data) in validated.items():
+                state, task.latest_version, task.updated_at = loaded[index]
+                for field, value in state.items():
+                    setattr(task, field, value)
+        else:
+            break
+    return changed, conflicts
+
+
+def bulk_create_tasks(
+    user: User, items: list[Any], context: dict[str, Any]
+) -> list[Result]:
+    results: list[Result | None] = [None] * len(items)
+    validated: dict[int, dict[str, Any]] = {}
+    for index, item in enumerate(items):
+        serializer = TaskBulkSerializer(data=item, context=context)
+        if serializer.is_valid():
+            validated[index] = dict(serializer.validated_data)
+        else:
+            results[index] = _failure(index, HTTPStatus.BAD_REQUEST, serializer.errors)
+
+    tasks, conflicts = _insert_tasks(user, validated)
+    for index in conflicts:
+        results[index] = _failure(index, HTTPStatus.BAD_REQUEST, {"title": [DUPLICATE_TITLE_MSG]})  # noqa: E501
+    if tasks:
+        clear_user_task_cache(user.id)
+
+    data = TaskSerializer(tasks.values(), many=True, context=context).data
+    for index, task_data in zip(tasks, data, strict=True):
+        results[index] = {
+            "index": index, "status": HTTPStatus.CREATED.value, "task": task_data
+        }
+    return results  # type: ignore[return-value]
+
+
+def bulk_update_tasks(
+    user: User, items: list[Any], context: dict[str, Any]
+) -> list[Result]:
+    results: list[Result | None] = [None] * len(items)
+    ids = _parse_ids(items, results)
+    with transaction.atomic():
+        tasks = (
+            Task.objects.select_for_update(of=("self",))
+            .select_related("user")
+            .filter(user=user)
+            .in_bulk(set(ids.values()))
+        )
+        validated: dict[int, tuple[Task, dict[str, Any]]] = {}
+        for index, task_id in ids.items():
+            if (task := tasks.get(task_id)) is None:
+                results[index] = _failure(index, HTTPStatus.NOT_FOUND, {"id": [NOT_FOUND_MSG]})  # noqa: E501
+                continue
+            serializer = TaskBulkSerializer(
+                task, data=items[index], partial=True, context=context
+            )
+            if serializer.is_valid():
+                validated[index] = (task, dict(serializer.validated_data))
+            else:
+                results[index] = _failure(index, HTTPStatus.BAD_REQUEST, serializer.errors)  # noqa: E501
+
+        changed, conflicts = _update_tasks(user, validated, ids)
+        for index in conflicts:
+            del validated[index]
+            results[index] = _failure(index, HTTPStatus.BAD_REQUEST, {"title": [DUPLICATE_TITLE_MSG]})  # noqa: E501
+    for task in changed:
+        task.snapshot_state()
+    if changed:
+        clear_user_task_cache(user.id)
+
+    for index, (task, _data) in validated.items():
+        results[index] = {
+            "index": index,
+            "status": HTTPStatus.OK.value,
+            "task": TaskSerializer(task, context=context).data,
+        }
+    return results  # type: ignore[return-value]
+
+
+def bulk_delete_tasks(
+    user: User, items: list[Any], _context: dict[str, Any]
+) -> list[Result]:
+    results: list[Result | None] = [None] * len(items)
+    ids = _parse_ids(items, results)
+    with transaction.atomic(), batch_task_changes():
+        existing = set(
+            Task.objects.filter(user=user, id__in=set(ids.values())).values_list(
+                "id", flat=True
+            )
+        )
+        Task.objects.filter(id__in=existing).delete()
+    for index, task_id in ids.items():
+        if task_id in existing:
+            results[index] = {
+                "index": index, "status": HTTPStatus.NO_CONTENT.value, "id": task_id
+            }
+        else:
+            results[index] = _failure(index, HTTPStatus.NOT_FOUND, {"id": [NOT_FOUND_MSG]})  # noqa: E501
+    return results  # type: ignore[return-value]
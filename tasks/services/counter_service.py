@@ -0,0 +1,58 @@
+from typing import Any
+
+from django.db.models import Count, F, Q
+
+from tasks.models import Task, UserTaskCounters
+
+_COUNTS = {
+    "total": Count("id"),
+    "completed": Count("id", filter=Q(is_completed=True)),
+}
+
+
+def adjust_task_counters(user_id: Any, total: int = 0, completed: int = 0) -> None:  # noqa: ANN401
+    """Atomically applies deltas to the user's counters with a single UPDATE."""
+    deltas = {
+        name: F(name) + delta
+        for name, delta in (("total", total), ("completed", completed))
+        if delta
+    }
+    if not deltas:
+        return
+    updated = UserTaskCounters.objects.filter(user_id=user_id).update(**deltas)
+    if not updated:  # First use: the count already includes this change
+        reconcile_task_counters(user_id)
+
+
+def get_task_counters(user_id: Any) -> UserTaskCounters:  # noqa: ANN401
+    try:
+        return UserTaskCounters.objects.get(user_id=user_id)
+    except UserTaskCounters.DoesNotExist:
+        return reconcile_task_counters(user_id)
+
+
+async def aget_task_counters(user_id: Any) -> UserTaskCounters:  # noqa: ANN401
+    try:
+        return await UserTaskCounters.objects.aget(user_id=user_id)
+    except UserTaskCounters.DoesNotExist:
+        return await areconcile_task_counters(user_id)
+
+
+def count_tasks(user_id: Any) -> dict[str, int]:  # noqa: ANN401
+    return Task.objects.filter(user_id=user_id).aggregate(**_COUNTS)
+
+
+def reconcile_task_counters(user_id: Any) -> UserTaskCounters:  # noqa: ANN401
+    """Recomputes the user's counters from the tasks table."""
+    counters, _created = UserTaskCounters.objects.update_or_create(
+        user_id=user_id, defaults=count_tasks(user_id)
+    )
+    return counters
+
+
+async def areconcile_task_counters(user_id: Any) -> UserTaskCounters:  # noqa: ANN401
+    counters, _created = await UserTaskCounters.objects.aupdate_or_create(
+        user_id=user_id,
+        defaults=await Task.objects.filter(user_id=user_id).aaggregate(**_COUNTS),
+    )
+    return counters
@@ -0,0 +1,95 @@
+"""
+Streaming exports of the tasks and their history.
+
+Rows are read through a server-side cursor (``.iterator()`` over ``.values()``)
+and encoded a chunk at a time, so memory doesn't grow with the account size.
+"""
+
+import csv
+import io
+import json
+import zlib
+from collections.abc import Iterable, Iterator
+from itertools import batched
+from typing import Any
+
+from django.db.models import QuerySet
+
+from tasks.serializers.read import ValuesReadSerializer
+
+EXPORT_CHUNK_SIZE = 2_000
+EXPORT_FORMAT_NDJSON = "ndjson"
+EXPORT_FORMAT_CSV = "csv"
+
+TASK_CSV_COLUMNS = (
+    "id",
+    "title",
+    "description",
+    "is_completed",
+    "created_at",
+    "updated_at",
+    "user.id",
+    "user.username",
+)
+TASK_HISTORY_CSV_COLUMNS = (
+    "task",
+    "version",
+    "change_by",
+    "change_date",
+    "changes",
+    "previous_states",
+)
+
+
+def export_rows(
+    serializer_class: type[ValuesReadSerializer],
+    queryset: QuerySet,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[list[dict[str, Any]]]:
+    """The API representation of the rows of ``queryset``, ``chunk_size`` at a time."""
+    rows = serializer_class.prepare(queryset).iterator(chunk_size=chunk_size)
+    for chunk in batched(rows, chunk_size):
+        yield serializer_class(list(chunk)).data
+
+
+def encode_ndjson(chunks: Iterable[list[dict[str, Any]]]) -> Iterator[bytes]:
+    for chunk in chunks:
+        yield "".join(
+            json.dumps(row, separators=(",", ":"), default=str) + "\n" for row in chunk
+        ).encode()
+
+
+def encode_csv(
+    chunks: Iterable[list[dict[str, Any]]], columns: tuple[str, ...]
+) -> Iterator[bytes]:
+    """
+    A header, then a line per row. Dotted columns read nested values (e.g.
+    "user.id"); dicts, as the changes of an entry, are written as JSON.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    paths = [column.split(".") for column in columns]
+    for chunk in chunks:
+        writer.writerows([_cell(row, path) for path in paths] for row in chunk)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if header := buffer.getvalue():  # Nothing to export
+        yield header.encode()
+
+
+def _cell(row: dict[str, Any], path: list[str]) -> Any:  # noqa: ANN401
+    value: Any = row
+    for key in path:
+        value = value[key]
+    return json.dumps(value, default=str) if isinstance(value, dict) else value
+
+
+def gzip_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Compresses a stream of bytes as it goes, into a gzip file."""
+    compressor = zlib.compressobj(wbits=31)  # 16 + 15: gzip header and trailer
+    for chunk in chunks:
+        if data := compressor.compress(chunk):
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,404 @@
+import json
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Min, Q, Subquery
+from django.utils import timezone
+
+from tasks.domain.history import encode_changes, is_snapshot_version, replay
+from tasks.models import Task, TaskHistory, TaskHistoryArchiveChunk, TaskHistoryOutbox
+from tasks.models.task import TRACKED_FIELDS
+from tasks.services.archive_service import ArchiveWriter, read_archived_history
+
+HISTORY_ROW_FIELDS = ("task_id", "version", "changes", "previous_states", "delta")
+
+HISTORY_MODE_OUTBOX = "outbox"
+
+
+def get_task_changes(
+    task: Task, update_fields: frozenset[str] | None = None
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """
+    Compares the task with the state it was loaded with.
+
+    Returns the changed fields (as {"old": ..., "new": ...}) and the previous
+    values of all tracked fields. The database is only queried when some tracked
+    field was deferred and its stored value is therefore unknown.
+    """
+    previous_states = dict(task.get_loaded_state())
+    if missing := [field for field in TRACKED_FIELDS if field not in previous_states]:
+        stored = Task.objects.filter(pk=task.pk).values(*missing).first()
+        if stored is None:
+            return {}, {}
+        previous_states.update(stored)
+    fields = [
+        field for field in TRACKED_FIELDS
+        if update_fields is None or field in update_fields
+    ]
+    changes = {
+        field: {"old": previous_states[field], "new": getattr(task, field)}
+        for field in fields
+        if previous_states[field] != getattr(task, field)
+    }
+    return changes, {field: previous_states[field] for field in TRACKED_FIELDS}
+
+
+def get_history_model() -> type[TaskHistory | TaskHistoryOutbox]:
+    """Where new history entries are written, according to TASK_HISTORY_MODE."""
+    if settings.TASK_HISTORY_MODE == HISTORY_MODE_OUTBOX:
+        return TaskHistoryOutbox
+    return TaskHistory
+
+
+def drain_history_outbox(batch_size: int = 500) -> int:
+    """
+    Moves up to ``batch_size`` outbox entries to TaskHistory with one INSERT and
+    returns how many were moved.
+
+    Versions were assigned from ``latest_version`` when the change was saved, so
+    the order of each task's history does not depend on the drain order. Rows
+    locked by another drainer are skipped, and entries already present are
+    ignored, so running several drainers or retrying a batch is safe.
+    """
+    with transaction.atomic():
+        entries = list(
+            TaskHistoryOutbox.objects.select_for_update(skip_locked=True)
+            .order_by("id")[:batch_size]
+        )
+        if not entries:
+            return 0
+        TaskHistory.objects.bulk_create(
+            [
+                TaskHistory(
+                    task_id=entry.task_id,  # type: ignore[attr-defined]
+                    version=entry.version,
+                    change_by_id=entry.change_by_id,  # type: ignore[attr-defined]
+                    change_date=entry.change_date,
+                    changes=entry.changes,
+                    previous_states=entry.previous_states,
+                    delta=entry.delta,
+                )
+                for entry in entries
+            ],
+            ignore_conflicts=True,
+        )
+        TaskHistoryOutbox.objects.filter(id__in=[entry.id for entry in entries]).delete()  # type: ignore[attr-defined]  # noqa: E501
+    return len(entries)
+
+
+def decode_history(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Fills ``changes`` and ``previous_states`` of the delta entries among
+    ``rows`` (dicts with at least HISTORY_ROW_FIELDS), in place.
+
+    Entries are rebuilt from the other rows when they hold the whole chain
+    since each snapshot (e.g. a full history list); otherwise the missing
+    entries are read with two queries for all the tasks together.
+    """
+    by_task: dict[Any, dict[int, dict[str, Any]]] = defaultdict(dict)
+    for row in rows:
+        by_task[row["task_id"]][row["version"]] = row
+    ranges = {}
+    for task_id, entries in by_task.items():
+        if unresolved := _replay(entries):
+            ranges[task_id] = (min(unresolved), max(unresolved))
+    if not ranges:
+        return rows
+    bases = dict(
+        TaskHistory.objects.filter(
+            _any_of(
+                Q(task_id=task_id, version__lte=low, delta__isnull=True)
+                for task_id, (low, _high) in ranges.items()
+            )
+        )
+        .order_by()
+        .values("task_id")
+        .annotate(base=Max("version"))
+        .values_list("task_id", "base")
+    )
+    chain = TaskHistory.objects.filter(
+        _any_of(
+            Q(task_id=task_id, version__gte=bases.get(task_id, 0), version__lte=high)
+            for task_id, (_low, high) in ranges.items()
+        )
+    ).values(*HISTORY_ROW_FIELDS)
+    for row in chain:
+        # Rows already in ``rows`` are the ones filled in
+        by_task[row["task_id"]].setdefault(row["version"], row)
+    for task_id in ranges:
+        _replay(by_task[task_id])
+    return rows
+
+
+def _replay(entries: dict[int, dict[str, Any]]) -> list[int]:
+    """Replays one task's entries; returns the versions it couldn't rebuild."""
+    replay([entries[version] for version in sorted(entries)])
+    return [
+        version for version, entry in entries.items()
+        if entry["delta"] is not None and not entry["previous_states"]
+    ]
+
+
+def _any_of(conditions: Any) -> Q:  # noqa: ANN401
+    combined = Q(pk__in=[])
+    for condition in conditions:
+        combined |= condition
+    return combined
+
+
+def decode_history_entry(entry: TaskHistory) -> TaskHistory:
+    """``decode_history`` for a model instance."""
+    if entry.delta is not None:
+        row = {field: getattr(entry, field) for field in HISTORY_ROW_FIELDS}
+        decode_history([row])
+        entry.changes, entry.previous_states = row["changes"], row["previous_states"]
+    return entry
+
+
+@dataclass
+class TaskState:
+    """A task's tracked fields after one of its changes (version 0: as created)."""
+
+    version: int
+    change_date: datetime | None
+    fields: dict[str, Any]
+
+
+def task_version_at(task: Task, at: datetime) -> int | None:
+    """
+    The version ``task`` had at ``at``: that of its last change until then, 0
+    without any, None if it didn't exist yet.
+    """
+    if at < task.created_at:
+        return None
+    version = (
+        TaskHistory.objects.filter(task=task, change_date__lte=at)
+        .order_by("-change_date", "-version")
+        .values_list("version", flat=True)
+        .first()
+    )
+    if version is None:
+        archived = read_archived_history(task.pk, at=at)
+        version = next(
+            (row["version"] for row in archived if row["change_date"] <= at), None
+        )
+    return version or 0
+
+
+def task_state_as_of(task: Task, version: int) -> TaskState | None:
+    """
+    The task after its change ``version``, or None if that change isn't in
+    the history.
+
+    One query reads the entries from the nearest snapshot at or before the
+    version up to it, which are at most TASK_HISTORY_SNAPSHOT_INTERVAL (one
+    with full storage) whatever the length of the history. Archived versions
+    are read from the archive chunk holding them.
+    """
+    if version > task.latest_version:
+        return None
+    if version == 0 and task.latest_version == 0:
+        return TaskState(0, None, {field: getattr(task, field) for field in TRACKED_FIELDS})  # noqa: E501
+    # Version 0 is what the first change found
+    target = max(version, 1)
+    snapshot = (
+        TaskHistory.objects.filter(task=task, version__lte=target, delta__isnull=True)
+        .order_by("-version")
+        .values("version")[:1]
+    )
+    rows = list(
+        TaskHistory.objects.filter(
+            task=task, version__gte=Subquery(snapshot), version__lte=target
+        )
+        .order_by("version")
+        .values(*HISTORY_ROW_FIELDS, "change_date")
+    )
+    replay(rows)
+    entry = rows[-1] if rows and rows[-1]["version"] == target else None
+    if entry is None or (entry["delta"] is not None and not entry["previous_states"]):
+        # Archived, or an entry of the chain is missing
+        archived = read_archived_history(task.pk, version=target)
+        entry = next((row for row in archived if row["version"] == target), None)
+        if entry is None:
+            return None
+    if version == 0:
+        return TaskState(0, None, dict(entry["previous_states"]))
+    fields = {
+        **entry["previous_states"],
+        **{field: change["new"] for field, change in entry["changes"].items()},
+    }
+    return TaskState(version, entry["change_date"], fields)
+
+
+@dataclass
+class HistoryRewrite:
+    entries: int = 0
+    rewritten: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+
+def _stored_size(row: dict[str, Any]) -> int:
+    return sum(
+        len(json.dumps(row[field]))
+        for field in ("changes", "previous_states", "delta")
+        if row[field] is not None
+    )
+
+
+def rewrite_task_history(
+    task_ids: list[Any], interval: int, *, expand: bool = False, dry_run: bool = False
+) -> HistoryRewrite:
+    """
+    Re-encodes the whole history of the tasks: deltas with a snapshot every
+    ``interval`` versions, or every entry in full with ``expand``. An entry
+    whose previous version is missing is kept in full. The tasks are locked,
+    so no entry is added to them meanwhile.
+    """
+    result = HistoryRewrite()
+    with transaction.atomic():
+        # Saving a task updates its row first: this waits for those in progress
+        list(Task.objects.select_for_update().filter(id__in=task_ids).values_list("id"))
+        rows = list(
+            TaskHistory.objects.filter(task_id__in=task_ids)
+            .order_by("task_id", "version")
+            .values("id", *HISTORY_ROW_FIELDS)
+        )
+        stored = {row["id"]: _stored_size(row) for row in rows}
+        decode_history(rows)
+        changed: list[TaskHistory] = []
+        previous: dict[str, Any] | None = None
+        for row in rows:
+            if row["delta"] is not None and not row["previous_states"]:
+                continue  # Could not be rebuilt: left as it is
+            follows = (
+                previous is not None
+                and previous["task_id"] == row["task_id"]
+                and previous["version"] == row["version"] - 1
+            )
+            previous = row
+            if expand or not follows or is_snapshot_version(row["version"], interval):
+                fields = {**row, "delta": None}
+            else:
+                delta = encode_changes(row["changes"])
+                fields = {**row, "changes": {}, "previous_states": {}, "delta": delta}
+            result.entries += 1
+            result.bytes_before += stored[row["id"]]
+            result.bytes_after += _stored_size(fields)
+            if fields["delta"] != row["delta"]:  # Decoding left "delta" as stored
+                result.rewritten += 1
+                changed.append(TaskHistory(**fields))
+        if not dry_run:
+            TaskHistory.objects.bulk_update(
+                changed, ["changes", "previous_states", "delta"], batch_size=500
+            )
+    return result
+
+
+def expand_first_entries(task_ids: list[Any], since: datetime) -> int:
+    """
+    Stores in full the first entry of each task from ``since`` on, so it no
+    longer depends on the entries before it, which may then be removed.
+    Returns how many were delta entries.
+    """
+    firsts = (
+        TaskHistory.objects.filter(task_id__in=task_ids, change_date__gte=since)
+        .order_by()
+        .values("task_id")
+        .annotate(first=Min("version"))
+        .values_list("task_id", "first")
+    )
+    rows = list(
+        TaskHistory.objects.filter(
+            _any_of(Q(task_id=task_id, version=first) for task_id, first in firsts),
+            delta__isnull=False,
+        ).values("id", *HISTORY_ROW_FIELDS)
+    )
+    decode_history(rows)
+    TaskHistory.objects.bulk_update(
+        [
+            TaskHistory(
+                id=row["id"],
+                changes=row["changes"],
+                previous_states=row["previous_states"],
+                delta=None,
+            )
+            for row in rows
+            if row["previous_states"]
+        ],
+        ["changes", "previous_states", "delta"],
+    )
+    return len(rows)
+
+
+@dataclass
+class HistoryArchive:
+    tasks: int = 0
+    entries: int = 0
+    bytes_written: int = 0
+    files: list[str] = field(default_factory=list)
+
+
+def archive_task_history(
+    cutoff: datetime, *, batch_size: int = 200, delete: bool = False
+) -> HistoryArchive:
+    """
+    Moves the history entries older than ``cutoff`` to a new archive file
+    (tasks.services.archive_service), or only deletes them with ``delete``.
+
+    Tasks are handled in batches, each in a transaction: its entries are read
+    and decoded, written in full to the file, indexed, then deleted. The first
+    entry kept of each task is stored in full first, so the remaining history
+    is still decodable on its own.
+    """
+    result = HistoryArchive()
+    writer = ArchiveWriter(f"task-history-{timezone.now():%Y%m%dT%H%M%S%f}.jsonl.gz")
+    last_id = None
+    try:
+        while True:
+            tasks = Task.objects.order_by("id").values_list("id", flat=True)
+            if last_id is not None:
+                tasks = tasks.filter(id__gt=last_id)
+            task_ids = list(tasks[:batch_size])
+            if not task_ids:
+                break
+            last_id = task_ids[-1]
+            _archive_batch(task_ids, cutoff, writer, result, delete=delete)
+    finally:
+        writer.close()
+    if writer.bytes_written:
+        result.files.append(writer.name)
+        result.bytes_written = writer.bytes_written
+    return result
+
+
+def _archive_batch(
+    task_ids: list[Any],
+    cutoff: datetime,
+    writer: ArchiveWriter,
+    result: HistoryArchive,
+    *,
+    delete: bool,
+) -> None:
+    with transaction.atomic():
+        rows = list(
+            TaskHistory.objects.select_for_update()
+            .filter(task_id__in=task_ids, change_date__lt=cutoff)
+            .order_by("task_id", "version")
+            .values("id", *HISTORY_ROW_FIELDS, "change_by_id", "change_date")
+        )
+        if not rows:
+            return
+        if not delete:
+            decode_history(rows)
+            TaskHistoryArchiveChunk.objects.bulk_create(writer.write(rows))
+        expand_first_entries(task_ids, cutoff)
+        TaskHistory.objects.filter(
+            id__in=[row["id"] for row in rows], change_date__lt=cutoff
+        ).delete()
+    result.tasks += len({row["task_id"] for row in rows})
+    result.entries += len(rows)
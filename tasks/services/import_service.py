@@ -0,0 +1,270 @@
+"""
+Imports of tasks from uploaded NDJSON or CSV files (POST /tasks/import/).
+
+The upload is copied to TASK_IMPORT_DIR and read back a line at a time, in
+chunks of IMPORT_CHUNK_SIZE rows: each chunk is validated, checked for title
+collisions with one query and inserted with one bulk_create, in its own
+transaction, so memory doesn't grow with the file. bulk_create sends no
+post_save signals: the counters and the task cache generation move once per
+chunk, with the rows.
+
+The job's progress is saved with each chunk too. A job left running by a
+worker that died (its progress not saved for IMPORT_STALE_AFTER) is claimed
+again by process_task_imports, which resumes after the last saved chunk.
+"""
+
+import csv
+import io
+import json
+import logging
+import threading
+import uuid
+from collections.abc import Iterator
+from datetime import timedelta
+from itertools import batched, islice
+from pathlib import Path
+from typing import IO, Any
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import IntegrityError, connections, transaction
+from django.db.models import Q
+from django.utils.timezone import now
+
+from tasks.models import Task, TaskImportJob
+from tasks.serializers import TaskBulkSerializer
+from tasks.services.bulk_service import DUPLICATE_TITLE_MSG, _find_title_conflicts
+from tasks.signals import clear_user_task_cache, update_user_task_counters
+from users.models import User
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = 1_000
+IMPORT_MAX_ERRORS = 100  # Failures kept on the job; the rest are only counted
+IMPORT_STALE_AFTER = timedelta(minutes=5)
+IMPORT_FORMAT_NDJSON = "ndjson"
+IMPORT_FORMAT_CSV = "csv"
+IMPORT_FORMATS = (IMPORT_FORMAT_NDJSON, IMPORT_FORMAT_CSV)
+IMPORT_MODE_SYNC = "sync"
+IMPORT_MODE_THREAD = "thread"
+
+INVALID_JSON_MSG = "Invalid JSON."
+NOT_AN_OBJECT_MSG = "Expected a JSON object."
+NO_TITLE_COLUMN_MSG = 'The CSV header has no "title" column.'
+IMPORT_FAILED_MSG = "The file could not be imported."
+
+# (line number, item, errors): errors is set when the line couldn't be parsed
+ParsedRow = tuple[int, dict[str, Any] | None, dict[str, Any] | None]
+
+
+def _ndjson_rows(file: IO[bytes]) -> Iterator[ParsedRow]:
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError:
+            yield line_number, None, {"non_field_errors": [INVALID_JSON_MSG]}
+            continue
+        if not isinstance(item, dict):
+            yield line_number, None, {"non_field_errors": [NOT_AN_OBJECT_MSG]}
+            continue
+        yield line_number, item, None
+
+
+def _csv_rows(file: IO[bytes]) -> Iterator[ParsedRow]:
+    """
+    Rows of a CSV file with a header, as the one of GET /tasks/export/?format=csv.
+    Empty cells are left out, as are the columns the import doesn't read.
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text)
+        if "title" not in (reader.fieldnames or ()):
+            raise ValueError(NO_TITLE_COLUMN_MSG)
+        for row in reader:
+            item = {
+                key: value for key, value in row.items() if key is not None and value
+            }
+            yield reader.line_num, item, None
+    finally:
+        text.detach()  # Or collecting the wrapper would close the file
+
+
+def import_file_path(job: TaskImportJob) -> Path:
+    return Path(settings.TASK_IMPORT_DIR) / job.path
+
+
+def create_import_job(
+    user: User, upload: UploadedFile, import_format: str
+) -> TaskImportJob:
+    """Copies the upload to TASK_IMPORT_DIR, a chunk at a time, and records its job."""
+    job = TaskImportJob(user=user, format=import_format, size=upload.size or 0)
+    job.path = f"{job.id}.{import_format}"
+    path = import_file_path(job)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as file:
+        for data in upload.chunks():
+            file.write(data)
+    job.save()
+    return job
+
+
+def start_import_job(job: TaskImportJob) -> None:
+    """
+    Runs the job according to TASK_IMPORT_MODE: later, by the process_task_imports
+    command ("queue"), during the request ("sync") or in a thread once the
+    request's transaction commits ("thread"; a job cut short by a worker restart
+    is finished by the command).
+    """
+    if settings.TASK_IMPORT_MODE == IMPORT_MODE_SYNC:
+        run_import_job(job.id)
+        job.refresh_from_db()
+    elif settings.TASK_IMPORT_MODE == IMPORT_MODE_THREAD:
+        transaction.on_commit(
+            lambda: threading.Thread(
+                target=_run_in_thread,
+                args=(job.id,),
+                name=f"task-import-{job.id}",
+                daemon=True,
+            ).start()
+        )
+
+
+def _run_in_thread(job_id: uuid.UUID) -> None:
+    try:
+        run_import_job(job_id)
+    finally:
+        connections.close_all()  # The thread's own connections
+
+
+def _claimable() -> Q:
+    """Pending jobs, and running ones whose worker stopped saving progress."""
+    return Q(status=TaskImportJob.Status.PENDING) | Q(
+        status=TaskImportJob.Status.RUNNING,
+        updated_at__lt=now() - IMPORT_STALE_AFTER,
+    )
+
+
+def run_pending_imports() -> int:
+    """
+    Runs the pending jobs and resumes the stale ones, oldest first. Returns how
+    many were run.
+    """
+    jobs = TaskImportJob.objects.filter(_claimable()).order_by("created_at")
+    return sum(
+        run_import_job(job_id) is not None
+        for job_id in jobs.values_list("id", flat=True)
+    )
+
+
+def run_import_job(job_id: uuid.UUID) -> TaskImportJob | None:
+    """
+    Imports the file of a pending or stale job, from the first row not imported
+    yet, and deletes it. The job is claimed first, so two workers never import
+    the same file; returns None when it couldn't be claimed.
+    """
+    claimed = TaskImportJob.objects.filter(_claimable(), id=job_id).update(
+        status=TaskImportJob.Status.RUNNING, updated_at=now()
+    )
+    if not claimed:
+        return None
+    job = TaskImportJob.objects.select_related("user").get(id=job_id)
+    path = import_file_path(job)
+    try:
+        with path.open("rb") as file:
+            _import_rows(job, file)
+    except (ValueError, csv.Error) as exc:  # Not a readable NDJSON or CSV file
+        job.status = TaskImportJob.Status.FAILED
+        job.message = str(exc)
+    except Exception:
+        logger.exception("Task import %s failed", job.id)
+        job.status = TaskImportJob.Status.FAILED
+        job.message = IMPORT_FAILED_MSG
+    else:
+        job.status = TaskImportJob.Status.COMPLETED
+        job.bytes_read = job.size
+    finally:
+        job.finished_at = now()
+        job.save()
+        path.unlink(missing_ok=True)
+    return job
+
+
+def _import_rows(job: TaskImportJob, file: IO[bytes]) -> None:
+    rows = _csv_rows(file) if job.format == IMPORT_FORMAT_CSV else _ndjson_rows(file)
+    # Resumed: the rows of the chunks already saved are parsed again, not imported
+    for chunk in batched(islice(rows, job.rows, None), IMPORT_CHUNK_SIZE):
+        _import_chunk(job, chunk, bytes_read=file.tell())
+
+
+def _import_chunk(
+    job: TaskImportJob, chunk: tuple[ParsedRow, ...], bytes_read: int
+) -> None:
+    """
+    Validates and inserts a chunk of rows, then saves the job's progress in the
+    same transaction. When a concurrent request takes one of the titles between
+    the check and the INSERT, the chunk is checked and inserted again.
+    """
+    validated: dict[int, dict[str, Any]] = {}
+    failures: list[dict[str, Any]] = []
+    for line, item, errors in chunk:
+        if errors is None:
+            serializer = TaskBulkSerializer(data=item)
+            if serializer.is_valid():
+                validated[line] = dict(serializer.validated_data)
+                continue
+            errors = serializer.errors
+        failures.append({"line": line, "errors": errors})
+    titles = {line: data["title"] for line, data in validated.items()}
+
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                conflicts = _find_title_conflicts(job.user, titles)
+                tasks = [
+                    Task(user=job.user, **data)
+                    for line, data in validated.items()
+                    if line not in conflicts
+                ]
+                for task in tasks:
+                    task.clean()
+                Task.objects.bulk_create(tasks)
+                update_user_task_counters(
+                    job.user_id,  # type: ignore[attr-defined]
+                    total=len(tasks),
+                    completed=sum(task.is_completed for task in tasks),
+                )
+                if tasks:
+                    clear_user_task_cache(job.user_id)  # type: ignore[attr-defined]
+                failures.extend(
+                    {"line": line, "errors": {"title": [DUPLICATE_TITLE_MSG]}}
+                    for line in conflicts
+                )
+                _save_progress(job, len(chunk), len(tasks), failures, bytes_read)
+        except IntegrityError:
+            if attempt:
+                raise
+        else:
+            return
+
+
+def _save_progress(
+    job: TaskImportJob,
+    rows: int,
+    created: int,
+    failures: list[dict[str, Any]],
+    bytes_read: int,
+) -> None:
+    job.rows += rows
+    job.created += created
+    job.failed += len(failures)
+    job.bytes_read = bytes_read
+    room = IMPORT_MAX_ERRORS - len(job.errors)
+    if room > 0:
+        job.errors.extend(sorted(failures, key=lambda failure: failure["line"])[:room])
+    job.save(
+        update_fields=[
+            "rows", "created", "failed", "bytes_read", "errors", "updated_at"
+        ]
+    )
@@ -0,0 +1,99 @@
+"""
+Monthly partitions of the task history on PostgreSQL, where migration 0014
+partitions it by change_date. Elsewhere the history is a plain table and
+these functions do nothing.
+"""
+
+import re
+from datetime import UTC, date, datetime
+
+from django.db import connection
+from django.utils import timezone
+
+from tasks.models import TaskHistory
+
+PARTITIONS_AHEAD = 3
+HISTORY_TABLE = TaskHistory._meta.db_table  # noqa: SLF001
+
+_MONTH_SUFFIX = re.compile(r"_p(\d{4})(\d{2})$")
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def is_history_partitioned() -> bool:
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+            "WHERE partrelid = %s::regclass)",
+            [HISTORY_TABLE],
+        )
+        return cursor.fetchone()[0]
+
+
+def history_partitions() -> dict[str, date]:
+    """The monthly partitions of the history, by name, with their first day."""
+    if not is_history_partitioned():
+        return {}
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = %s::regclass",
+            [HISTORY_TABLE],
+        )
+        names = [name for (name,) in cursor.fetchall()]
+    partitions = {}
+    for name in names:
+        if match := _MONTH_SUFFIX.search(name):
+            partitions[name] = date(int(match[1]), int(match[2]), 1)
+    return partitions
+
+
+def ensure_history_partitions(months_ahead: int = PARTITIONS_AHEAD) -> list[str]:
+    """
+    Creates the partitions of this month and the next ``months_ahead`` ones
+    that don't exist yet. The history has no default partition, so an entry
+    dated past the last partition is refused: keep this running daily. Returns
+    the names of those created.
+    """
+    if not is_history_partitioned():
+        return []
+    existing = history_partitions()
+    this_month = timezone.now().date().replace(day=1)
+    created = []
+    with connection.cursor() as cursor:
+        for count in range(months_ahead + 1):
+            month = _add_months(this_month, count)
+            name = f"{HISTORY_TABLE}_p{month:%Y%m}"
+            if name in existing:
+                continue
+            cursor.execute(
+                f"CREATE TABLE {name} PARTITION OF {HISTORY_TABLE} "  # noqa: S608
+                f"FOR VALUES FROM ('{month}') TO ('{_add_months(month, 1)}')"
+            )
+            created.append(name)
+    return created
+
+
+def drop_history_partitions(before: datetime) -> list[str]:
+    """
+    Drops the empty monthly partitions ending at or before ``before``, which
+    reclaims their space at once, without waiting for VACUUM. Returns their
+    names.
+    """
+    dropped = []
+    with connection.cursor() as cursor:
+        for name, month in sorted(history_partitions().items()):
+            end = datetime.combine(_add_months(month, 1), datetime.min.time(), UTC)
+            if end > before:
+                continue
+            cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {name})")  # noqa: S608
+            if not cursor.fetchone()[0]:
+                cursor.execute(f"DROP TABLE {name}")
+                dropped.append(name)
+    return dropped
@@ -1,22 +1,109 @@
-from django.db.models import Count, Q
+from datetime import UTC, datetime, timedelta, tzinfo
+from typing import Any
 
-from tasks.domain import TaskStats
+from django.db.models import Count, Q, QuerySet
+from django.db.models.functions import TruncDate
+from django.utils.timezone import now
+
+from core.cache import asingle_flight, single_flight
+from tasks.cache import (
+    TASK_METRICS_TIMEOUT,
+    TASK_STATS_TIMEOUT,
+    atask_metrics_cache_keys,
+    atask_stats_cache_keys,
+    task_metrics_cache_keys,
+    task_stats_cache_keys,
+)
+from tasks.domain import DailyTaskCount, TaskDistribution, TaskStats
 from tasks.models import Task
+from tasks.services.counter_service import aget_task_counters, get_task_counters
 from users.models import User
 
 
 def calculate_task_stats(user: User) -> TaskStats:
-    stats = Task.objects.filter(user=user).aggregate(
-        total=Count("id"),
-        completed=Count("id", filter=Q(is_completed=True)),
+    """Reads the denormalized counters of the user: one primary key lookup."""
+    counters = get_task_counters(user.id)
+    return TaskStats.from_counts(counters.total, counters.completed)
+
+
+async def acalculate_task_stats(user: User) -> TaskStats:
+    counters = await aget_task_counters(user.id)
+    return TaskStats.from_counts(counters.total, counters.completed)
+
+
+def _distribution_rows(user: User, start_date: datetime, tz: tzinfo) -> QuerySet:
+    return (
+        Task.objects.filter(user=user, created_at__gte=start_date)
+        .annotate(day=TruncDate("created_at", tzinfo=tz))
+        .values("day")
+        .annotate(
+            created=Count("id"),
+            completed=Count("id", filter=Q(is_completed=True)),
+        )
+        .order_by("day")
+    )
+
+
+def _build_distribution(days: int, rows: list[dict[str, Any]]) -> TaskDistribution:
+    return TaskDistribution(
+        days=days,
+        daily_counts=tuple(
+            DailyTaskCount(day=row["day"], created=row["created"], completed=row["completed"])  # noqa: E501
+            for row in rows
+        ),
     )
-    total = stats["total"]
-    completed = stats["completed"]
-    pending = total - completed
-    percentage = (completed / total * 100) if total > 0 else 0.0
-    return TaskStats(
-        total_tasks=total,
-        completed_tasks=completed,
-        pending_tasks=pending,
-        completion_percentage=percentage,
+
+
+def calculate_task_distribution(
+    user: User, days: int, start_date: datetime, tz: tzinfo = UTC
+) -> TaskDistribution:
+    """
+    Counts the tasks created per day since ``start_date``, bucketing the days in
+    ``tz`` (UTC by default). The grouping runs in the database.
+    """
+    return _build_distribution(days, list(_distribution_rows(user, start_date, tz)))
+
+
+async def acalculate_task_distribution(
+    user: User, days: int, start_date: datetime, tz: tzinfo = UTC
+) -> TaskDistribution:
+    rows = _distribution_rows(user, start_date, tz)
+    return _build_distribution(days, [row async for row in rows])
+
+
+# Cached responses of the stats and metrics endpoints: one computation per key
+# even when many requests miss at once (see core.cache)
+
+
+@single_flight(lambda user: task_stats_cache_keys(user.id), TASK_STATS_TIMEOUT)
+def cached_task_stats(user: User) -> dict[str, Any]:
+    return calculate_task_stats(user).as_dict()
+
+
+@asingle_flight(lambda user: atask_stats_cache_keys(user.id), TASK_STATS_TIMEOUT)
+async def acached_task_stats(user: User) -> dict[str, Any]:
+    return (await acalculate_task_stats(user)).as_dict()
+
+
+@single_flight(
+    lambda user, *args: task_metrics_cache_keys(user.id, *args), TASK_METRICS_TIMEOUT
+)
+def cached_task_metrics(
+    user: User, days: int, tz: tzinfo, include_completed: bool  # noqa: FBT001
+) -> dict[str, Any]:
+    distribution = calculate_task_distribution(
+        user, days, now() - timedelta(days=days), tz
+    )
+    return distribution.as_dict(include_completed=include_completed)
+
+
+@asingle_flight(
+    lambda user, *args: atask_metrics_cache_keys(user.id, *args), TASK_METRICS_TIMEOUT
+)
+async def acached_task_metrics(
+    user: User, days: int, tz: tzinfo, include_completed: bool  # noqa: FBT001
+) -> dict[str, Any]:
+    distribution = await acalculate_task_distribution(
+        user, days, now() - timedelta(days=days), tz
     )
+    return distribution.as_dict(include_completed=include_completed)
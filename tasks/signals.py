@@ -1,64 +1,123 @@
 import logging
-import weakref
-from typing import TYPE_CHECKING, Any
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
 
-from django.core.cache import cache
+from django.db.models import F
 from django.db.models.base import Model
 from django.db.models.signals import post_delete, post_save, pre_save
-from django.db.utils import DatabaseError
 from django.dispatch import receiver
 
-from .models import Task, TaskHistory
+from users.models import User
 
-if TYPE_CHECKING:
-    from users.models import User
+from .cache import bump_task_cache_generation
+from .models import Task
+from .services.counter_service import adjust_task_counters
+from .services.history_service import get_history_model, get_task_changes
 
 logger = logging.getLogger(__name__)
 
-# Armazena referências fracas a instâncias que já passaram pelo cache ou histórico
-_cleared_cache = weakref.WeakSet()
-_created_history = weakref.WeakSet()
 
-@receiver([post_delete, post_save], sender=Task)
-def clear_task_cache(sender: type[Model], instance: Task, **_kwargs: dict[str, Any]) -> None:  # noqa: E501 # pylint: disable=unused-argument
-    if instance in _cleared_cache:
+@dataclass
+class _TaskBatch:
+    users: set[Any] = field(default_factory=set)
+    totals: Counter = field(default_factory=Counter)
+    completed: Counter = field(default_factory=Counter)
+
+
+# Lote em andamento: limpeza de cache e contadores aplicados uma vez no final
+_current_batch: ContextVar[_TaskBatch | None] = ContextVar("task_batch", default=None)
+
+
+def clear_user_task_cache(user_id: Any) -> None:  # noqa: ANN401
+    if (batch := _current_batch.get()) is not None:
+        batch.users.add(user_id)
         return
-    _cleared_cache.add(instance)  # Mark this instance as cleared
-    user_id = instance.user.id
     logger.info("Clearing task cache for user: %s", user_id)
-    cache.delete(f"user_{user_id}_tasks")  # Remove task list cache
-    cache.delete(f"user_stats_{user_id}")  # Remove statistics cache
-    cache.delete(f"user_{user_id}_metrics")  # Remove metrics cache
+    bump_task_cache_generation(user_id)  # Invalidates list pages, stats and metrics
 
 
-@receiver(pre_save, sender=Task)
-def create_task_history(sender: type[Model], instance: Task, **_kwargs: dict[str, Any]) -> None:  # noqa: E501 # pylint: disable=unused-argument
-    if instance in _created_history or instance._state.adding:  # Verifica se já estamos no meio de uma criação de TaskHistory  # noqa: E501, SLF001
+def update_user_task_counters(user_id: Any, total: int = 0, completed: int = 0) -> None:  # noqa: ANN401
+    if (batch := _current_batch.get()) is not None:
+        batch.totals[user_id] += total
+        batch.completed[user_id] += completed
+        return
+    adjust_task_counters(user_id, total=total, completed=completed)
+
+
+@contextmanager
+def batch_task_changes() -> Iterator[None]:
+    """
+    Defers cache clearing and counter updates until the block exits, then applies
+    them once per affected user.
+    """
+    if _current_batch.get() is not None:  # Already inside a batch
+        yield
         return
+    batch = _TaskBatch()
+    token = _current_batch.set(batch)
     try:
-        original = Task.objects.get(pk=instance.pk)
-    except Task.DoesNotExist:
+        yield
+    finally:
+        _current_batch.reset(token)
+    for user_id in batch.totals.keys() | batch.completed.keys():
+        update_user_task_counters(
+            user_id, total=batch.totals[user_id], completed=batch.completed[user_id]
+        )
+    for user_id in batch.users:
+        clear_user_task_cache(user_id)
+
+
+@receiver([post_delete, post_save], sender=Task)
+def clear_task_cache(sender: type[Model], instance: Task, **_kwargs: dict[str, Any]) -> None:  # noqa: E501 # pylint: disable=unused-argument
+    clear_user_task_cache(instance.user_id)  # type: ignore[attr-defined]
+
+
+@receiver(post_delete, sender=Task)
+def decrement_task_counters(sender: type[Model], instance: Task, origin: Any = None, **_kwargs: dict[str, Any]) -> None:  # noqa: ANN401, E501 # pylint: disable=unused-argument
+    if isinstance(origin, User):  # Deleted with the user, counters included
         return
-    original = Task.objects.get(pk=instance.pk)
-    changes = {}
-    for field in ["title", "description", "is_completed"]:
-        original_value = getattr(original, field)
-        new_value = getattr(instance, field)
-        if original_value != new_value:
-            changes[field] = {"old": original_value, "new": new_value}
+    update_user_task_counters(
+        instance.user_id,  # type: ignore[attr-defined]
+        total=-1,
+        completed=-int(instance.get_loaded_state().get("is_completed", instance.is_completed)),  # noqa: E501
+    )
+
+
+@receiver(pre_save, sender=Task)
+def prepare_task_history(sender: type[Model], instance: Task, update_fields: frozenset[str] | None = None, **_kwargs: dict[str, Any]) -> None:  # noqa: E501 # pylint: disable=unused-argument
+    if instance._state.adding:  # noqa: SLF001
+        return
+    changes, previous_states = get_task_changes(instance, update_fields)
+    # Written by the task's own UPDATE as an expression, never from memory: a
+    # stale instance would otherwise move the version back
     if changes:
-        try:
-            _created_history.add(instance)
-            user: User = instance.user
-            TaskHistory.create_from_task(
-                task=instance,
-                change_by=user,
-                changes=changes,
-                previous_states={
-                    "title": original.title,
-                    "description": original.description,
-                    "is_completed": original.is_completed,
-                },
+        instance.latest_version = F("latest_version") + 1  # type: ignore
+        instance._pending_history = (changes, previous_states)  # noqa: SLF001
+    else:
+        instance.latest_version = F("latest_version")  # type: ignore
+
+
+@receiver(post_save, sender=Task)
+def record_task_changes(sender: type[Model], instance: Task, created: bool, **_kwargs: dict[str, Any]) -> None:  # noqa: E501, FBT001 # pylint: disable=unused-argument
+    if created:
+        update_user_task_counters(
+            instance.user_id, total=1, completed=int(instance.is_completed)  # type: ignore[attr-defined]
+        )
+        return
+    if pending := instance.__dict__.pop("_pending_history", None):
+        changes, previous_states = pending
+        get_history_model().create_from_task(
+            task=instance,
+            change_by_id=instance.user_id,  # type: ignore[attr-defined]
+            changes=changes,
+            previous_states=previous_states,
+        )
+        if "is_completed" in changes:
+            update_user_task_counters(
+                instance.user_id,  # type: ignore[attr-defined]
+                completed=1 if instance.is_completed else -1,
             )
-        except DatabaseError:
-            logger.exception("Error saving task history: %s")
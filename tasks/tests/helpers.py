@@ -0,0 +1,26 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetMixin(TestCase):
+    """Assertions that pin how many queries a block of code may run."""
+
+    @contextmanager
+    def assertQueryBudget(self, budget: int, label: str = "") -> Iterator[None]:  # noqa: N802
+        """Fails when the block runs more than ``budget`` queries, listing them."""
+        with CaptureQueriesContext(connection) as context:
+            yield
+        executed = len(context.captured_queries)
+        if executed > budget:
+            queries = "\n".join(
+                f"{number}. {query['sql']}"
+                for number, query in enumerate(context.captured_queries, start=1)
+            )
+            self.fail(
+                f"{label or 'Block'} ran {executed} queries, budget is {budget}:\n"
+                f"{queries}"
+            )
@@ -0,0 +1,98 @@
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tasks.models import Task
+from users.models import User
+
+
+class AsyncTaskViewsTest(TestCase):
+    """The async read endpoints must answer exactly like the sync ones."""
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="João", password="João123")
+        self.token = str(AccessToken.for_user(self.user))
+        self.tasks = [
+            Task.objects.create(
+                title=f"Task {number}", user=self.user, is_completed=number % 3 == 0
+            )
+            for number in range(12)
+        ]
+
+    def sync_get(self, url: str, params: dict | None = None) -> object:
+        cache.clear()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        return client.get(url, params)
+
+    def async_get(self, url: str, params: dict | None = None, **headers: str) -> object:
+        cache.clear()
+        headers.setdefault("Authorization", f"Bearer {self.token}")
+        with override_settings(ROOT_URLCONF="core.async_urls"):
+            return async_to_sync(AsyncClient().get)(url, params, headers=headers)
+
+    def assertSameResponse(self, url: str, params: dict | None = None) -> None:  # noqa: N802
+        expected = self.sync_get(url, params)
+        response = self.async_get(url, params)
+        self.assertEqual(response.status_code, expected.status_code, response.content)  # type: ignore[attr-defined]
+        self.assertEqual(response.content, expected.content)  # type: ignore[attr-defined]
+
+    def test_list(self) -> None:
+        for params in (
+            {},
+            {"status": "pending", "ordering": "title"},
+            {"status": "bogus"},
+            {"page_size": 5, "page": 2},
+            {"page": "last"},
+            {"page": 99},
+            {"cursor": "", "page_size": 5},
+        ):
+            with self.subTest(params=params):
+                self.assertSameResponse("/tasks/", params)
+
+    def test_cursor_next_page(self) -> None:
+        first = self.sync_get("/tasks/", {"cursor": "", "page_size": 5}).json()  # type: ignore[attr-defined]
+        self.assertSameResponse(first["next"].removeprefix("http://testserver"))
+
+    def test_retrieve(self) -> None:
+        self.assertSameResponse(f"/tasks/{self.tasks[0].pk}/")
+        self.assertSameResponse("/tasks/00000000-0000-0000-0000-000000000000/")
+
+    def test_stats_and_metrics(self) -> None:
+        self.assertSameResponse("/tasks/stats/")
+        self.assertSameResponse("/tasks/metrics/", {"days": 3, "completed": "true"})
+        self.assertSameResponse("/tasks/metrics/", {"days": 0})
+
+    def test_authentication_errors(self) -> None:
+        response = self.async_get("/tasks/", Authorization="")
+        self.assertEqual(response.status_code, 401)  # type: ignore[attr-defined]
+        self.assertEqual(response["WWW-Authenticate"], 'Bearer realm="api"')  # type: ignore[index]
+        response = self.async_get("/tasks/", Authorization="Bearer invalid")
+        self.assertEqual(response.status_code, 401)  # type: ignore[attr-defined]
+
+    def test_writes_go_to_the_sync_views(self) -> None:
+        with override_settings(ROOT_URLCONF="core.async_urls"):
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+            response = client.post("/tasks/", {"title": "New Task"}, format="json")
+            self.assertEqual(response.status_code, 201)
+            response = client.delete(f"/tasks/{self.tasks[0].pk}/")
+            self.assertEqual(response.status_code, 204)
+
+    def test_cached_metrics_and_stats_refresh_after_a_write(self) -> None:
+        self.async_get("/tasks/")  # Clears the cache
+        with override_settings(ROOT_URLCONF="core.async_urls"):
+            get = async_to_sync(AsyncClient().get)
+            headers = {"Authorization": f"Bearer {self.token}"}
+            metrics = get("/tasks/metrics/", headers=headers).json()
+            stats = get("/tasks/stats/", headers=headers).json()
+            Task.objects.create(title="New Task", user=self.user)
+            new_metrics = get("/tasks/metrics/", headers=headers).json()
+            new_stats = get("/tasks/stats/", headers=headers).json()
+        self.assertEqual(
+            sum(new_metrics["task_distribution"].values()),
+            sum(metrics["task_distribution"].values()) + 1,
+        )
+        self.assertEqual(new_stats["total_tasks"], stats["total_tasks"] + 1)
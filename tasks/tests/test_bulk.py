@@ -0,0 +1,287 @@
+import json
+import uuid
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tasks.models import Task, TaskHistory, TaskImportJob, UserTaskCounters
+from tasks.services.bulk_service import _find_title_conflicts
+from users.models import User
+
+
+class TaskBulkEndpointTest(TestCase):
+    url = "/tasks/bulk/"
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="João", password="João123")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.task = Task.objects.create(title="Existing Task", user=self.user)
+
+    def test_bulk_create(self) -> None:
+        payload = [
+            {"title": "First"},
+            {"title": "Existing Task"},
+            {"title": "First"},
+            {"title": "   "},
+            {"title": "Second", "description": "desc", "is_completed": True},
+        ]
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, 200)
+        statuses = [result["status"] for result in response.json()["results"]]
+        self.assertEqual(statuses, [201, 400, 400, 400, 201])
+        self.assertEqual(
+            set(Task.objects.values_list("title", flat=True)),
+            {"Existing Task", "First", "Second"},
+        )
+        created = response.json()["results"][4]["task"]
+        self.assertTrue(created["is_completed"])
+        self.assertEqual(created["user"]["username"], "João")
+
+    def test_bulk_create_runs_a_fixed_number_of_queries(self) -> None:
+        payload = [{"title": f"Task {i}"} for i in range(50)]
+        # title check + INSERT + counters UPDATE, in a savepoint of the test's
+        # transaction (a transaction of its own in a request)
+        with self.assertNumQueries(5):
+            self.client.post(self.url, payload, format="json")
+        self.assertEqual(Task.objects.count(), 51)
+        self.assertEqual(UserTaskCounters.objects.get(user=self.user).total, 51)
+
+    def test_bulk_create_retries_when_a_title_is_taken_meanwhile(self) -> None:
+        conflicts = [set()]  # The first check misses the task created below
+        Task.objects.create(title="Taken", user=self.user)
+
+        def find_title_conflicts(user: User, titles: dict[int, str]) -> set[int]:
+            return conflicts.pop() if conflicts else _find_title_conflicts(user, titles)
+
+        with patch(
+            "tasks.services.bulk_service._find_title_conflicts", find_title_conflicts
+        ):
+            response = self.client.post(
+                self.url, [{"title": "Taken"}, {"title": "Free"}], format="json"
+            )
+        statuses = [result["status"] for result in response.json()["results"]]
+        self.assertEqual(statuses, [400, 201])
+        self.assertEqual(UserTaskCounters.objects.get(user=self.user).total, 3)
+
+    def test_bulk_update_writes_history(self) -> None:
+        other = Task.objects.create(title="Other Task", user=self.user)
+        payload = [
+            {"id": str(self.task.id), "is_completed": True},
+            {"id": str(other.id), "title": "Existing Task"},
+            {"id": str(uuid.uuid4()), "title": "Missing"},
+            {"id": "not-a-uuid"},
+        ]
+        response = self.client.patch(self.url, payload, format="json")
+        statuses = [result["status"] for result in response.json()["results"]]
+        self.assertEqual(statuses, [200, 400, 404, 400])
+        self.task.refresh_from_db()
+        self.assertTrue(self.task.is_completed)
+        self.assertEqual(self.task.latest_version, 1)
+        history = TaskHistory.objects.get()
+        self.assertEqual(history.task_id, self.task.id)
+        self.assertEqual(history.changes, {"is_completed": {"old": False, "new": True}})
+        self.assertEqual(history.change_by, self.user)
+        counters = UserTaskCounters.objects.get(user=self.user)
+        self.assertEqual((counters.total, counters.completed), (2, 1))
+
+    def test_bulk_update_retries_when_a_title_is_taken_meanwhile(self) -> None:
+        other = Task.objects.create(title="Other Task", user=self.user)
+        Task.objects.create(title="Taken", user=self.user)
+        conflicts = [set()]  # The first check misses the task created above
+
+        def find_title_conflicts(
+            user: User, titles: dict[int, str], own_ids: dict[int, uuid.UUID]
+        ) -> set[int]:
+            if conflicts:
+                return conflicts.pop()
+            return _find_title_conflicts(user, titles, own_ids)
+
+        payload = [
+            {"id": str(self.task.id), "is_completed": True},
+            {"id": str(other.id), "title": "Taken"},
+        ]
+        with patch(
+            "tasks.services.bulk_service._find_title_conflicts", find_title_conflicts
+        ):
+            response = self.client.patch(self.url, payload, format="json")
+        statuses = [result["status"] for result in response.json()["results"]]
+        self.assertEqual(statuses, [200, 400])
+        other.refresh_from_db()
+        self.assertEqual((other.title, other.latest_version), ("Other Task", 0))
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.latest_version, 1)
+        self.assertEqual(TaskHistory.objects.get().task_id, self.task.id)
+        counters = UserTaskCounters.objects.get(user=self.user)
+        self.assertEqual((counters.total, counters.completed), (3, 1))
+
+    def test_bulk_delete(self) -> None:
+        other_user = User.objects.create_user(username="Maria", password="Maria123")
+        foreign = Task.objects.create(title="Foreign", user=other_user)
+        payload = [str(self.task.id), str(foreign.id)]
+        response = self.client.delete(self.url, payload, format="json")
+        statuses = [result["status"] for result in response.json()["results"]]
+        self.assertEqual(statuses, [204, 404])
+        self.assertFalse(Task.objects.filter(id=self.task.id).exists())
+        self.assertTrue(Task.objects.filter(id=foreign.id).exists())
+        self.assertEqual(UserTaskCounters.objects.get(user=self.user).total, 0)
+        self.assertEqual(UserTaskCounters.objects.get(user=other_user).total, 1)
+
+    def test_bulk_requires_a_list(self) -> None:
+        response = self.client.post(self.url, {"title": "Single"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(TASK_IMPORT_MODE="sync")
+class TaskImportTest(TestCase):
+    url = "/tasks/import/"
+
+    def setUp(self) -> None:
+        import_dir = TemporaryDirectory()
+        self.addCleanup(import_dir.cleanup)
+        self.import_dir = Path(import_dir.name)
+        settings_override = override_settings(TASK_IMPORT_DIR=self.import_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(username="João", password="João123")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Task.objects.create(title="Existing Task", user=self.user)
+
+    def upload(self, name: str, lines: list[str], **data: str) -> dict:
+        content = "\n".join(lines).encode()
+        response = self.client.post(
+            self.url,
+            {"file": SimpleUploadedFile(name, content), **data},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, 202, response.content)
+        return response.json()
+
+    def test_import_ndjson(self) -> None:
+        lines = [
+            json.dumps({"title": "First", "description": "desc"}),
+            json.dumps({"title": "Existing Task"}),
+            "",
+            "not json",
+            json.dumps({"title": "First"}),
+            json.dumps(["a list"]),
+            json.dumps({"title": "   "}),
+            json.dumps({"title": "Second", "is_completed": True}),
+        ]
+        with patch("tasks.services.import_service.IMPORT_CHUNK_SIZE", 2), patch(
+            "tasks.services.import_service.clear_user_task_cache"
+        ) as clear_cache:
+            job = self.upload("tasks.ndjson", lines)
+
+        self.assertEqual(job["status"], "completed")
+        self.assertEqual(job["progress"], 100.0)
+        self.assertEqual((job["rows"], job["created"], job["failed"]), (7, 2, 5))
+        self.assertEqual([error["line"] for error in job["errors"]], [2, 4, 5, 6, 7])
+        self.assertEqual(
+            job["errors"][0]["errors"],
+            {"title": ["A task with this title already exists for this user."]},
+        )
+        self.assertEqual(
+            set(Task.objects.values_list("title", flat=True)),
+            {"Existing Task", "First", "Second"},
+        )
+        # Once per chunk that created tasks: the first and the last
+        self.assertEqual(clear_cache.call_count, 2)
+        counters = UserTaskCounters.objects.get(user=self.user)
+        self.assertEqual((counters.total, counters.completed), (3, 1))
+        self.assertFalse(any(self.import_dir.iterdir()))  # File removed
+
+    def test_import_csv(self) -> None:
+        lines = [
+            "id,title,description,is_completed",
+            f'{uuid.uuid4()},From CSV,"with, comma",true',
+            ",Pending,,",
+            ",,no title,",
+        ]
+        job = self.upload("export.csv", lines)
+
+        self.assertEqual(job["format"], "csv")
+        self.assertEqual((job["created"], job["failed"]), (2, 1))
+        self.assertEqual(job["errors"][0]["line"], 4)
+        task = Task.objects.get(title="From CSV")
+        self.assertEqual(task.description, "with, comma")
+        self.assertTrue(task.is_completed)
+        self.assertFalse(Task.objects.get(title="Pending").is_completed)
+
+    def test_import_fails_without_a_title_column(self) -> None:
+        job = self.upload("tasks.txt", ["name", "Task"], format="csv")
+        self.assertEqual(job["status"], "failed")
+        self.assertEqual(job["message"], 'The CSV header has no "title" column.')
+
+    def test_import_validates_the_request(self) -> None:
+        response = self.client.post(self.url, {}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(
+            self.url,
+            {"file": SimpleUploadedFile("tasks.xml", b"<tasks/>"), "format": "xml"},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(TaskImportJob.objects.exists())
+
+    @override_settings(TASK_IMPORT_MODE="queue")
+    def test_queued_import_is_polled_until_run_by_the_command(self) -> None:
+        response = self.client.post(
+            self.url,
+            {"file": SimpleUploadedFile("tasks.ndjson", b'{"title": "Queued"}\n')},
+            format="multipart",
+        )
+        job = response.json()
+        self.assertEqual((job["status"], job["progress"]), ("pending", 0.0))
+        status_url = f"{self.url}{job['id']}/"
+        self.assertTrue(response["Location"].endswith(status_url))
+
+        call_command("process_task_imports", stdout=StringIO())
+
+        job = self.client.get(status_url).json()
+        self.assertEqual((job["status"], job["created"]), ("completed", 1))
+        self.assertTrue(Task.objects.filter(title="Queued").exists())
+
+        other = APIClient()
+        other.force_authenticate(
+            User.objects.create_user(username="Maria", password="Maria123")
+        )
+        self.assertEqual(other.get(status_url).status_code, 404)
+        self.assertEqual(self.client.get(f"{self.url}not-a-uuid/").status_code, 404)
+
+    @override_settings(TASK_IMPORT_MODE="queue")
+    def test_stale_running_import_is_resumed(self) -> None:
+        lines = [json.dumps({"title": title}) for title in ("A", "B", "C")]
+        job = TaskImportJob.objects.get(id=self.upload("tasks.ndjson", lines)["id"])
+        # A worker imported the first chunk, one row, then died
+        Task.objects.create(title="A", user=self.user)
+        TaskImportJob.objects.filter(id=job.id).update(
+            status=TaskImportJob.Status.RUNNING, rows=1, created=1
+        )
+        call_command("process_task_imports", stdout=StringIO())
+        job.refresh_from_db()
+        self.assertEqual(job.status, TaskImportJob.Status.RUNNING)  # Still fresh
+
+        TaskImportJob.objects.filter(id=job.id).update(
+            updated_at=timezone.now() - timedelta(minutes=10)
+        )
+        with patch("tasks.services.import_service.IMPORT_CHUNK_SIZE", 1):
+            call_command("process_task_imports", stdout=StringIO())
+        job.refresh_from_db()
+        self.assertEqual(job.status, TaskImportJob.Status.COMPLETED)
+        self.assertEqual((job.rows, job.created, job.failed), (3, 3, 0))
+        self.assertEqual(
+            sorted(Task.objects.values_list("title", flat=True)),
+            ["A", "B", "C", "Existing Task"],
+        )
+        self.assertFalse(any(self.import_dir.iterdir()))
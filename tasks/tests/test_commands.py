@@ -0,0 +1,57 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from tasks.management.commands.check_query_plans import find_sequential_scans
+from tasks.models import Task, UserTaskCounters
+from users.models import User
+
+
+class CheckQueryPlansCommandTest(TestCase):
+    def test_endpoint_queries_use_indexes(self) -> None:
+        output = StringIO()
+        call_command(
+            "check_query_plans", users=5, tasks_per_user=200, stdout=output
+        )
+        self.assertIn("No sequential scans found.", output.getvalue())
+        self.assertFalse(Task.objects.exists())  # Seeded data is rolled back
+
+    def test_detects_full_table_scans(self) -> None:
+        plan = [
+            "SEARCH tasks_task USING INDEX task_user_created_idx (user_id=?)",
+            "SCAN tasks_taskhistory",
+            "SCAN tasks_task USING COVERING INDEX task_user_status_idx",
+        ]
+        self.assertEqual(find_sequential_scans(plan), ["SCAN tasks_taskhistory"])
+
+
+class RepairTaskCountersCommandTest(TestCase):
+    def test_repairs_drifted_and_missing_counters(self) -> None:
+        user = User.objects.create_user(username="João", password="João123")
+        other = User.objects.create_user(username="Maria", password="Maria123")
+        Task.objects.create(title="Done", user=user, is_completed=True)
+        Task.objects.create(title="Pending", user=user)
+        Task.objects.create(title="Other", user=other)
+        UserTaskCounters.objects.filter(user=user).update(total=7, completed=0)
+        UserTaskCounters.objects.filter(user=other).delete()
+
+        output = StringIO()
+        call_command("repair_task_counters", stdout=output)
+
+        self.assertIn("Repaired 1 drifted and 1 missing counters.", output.getvalue())
+        counters = UserTaskCounters.objects.get(user=user)
+        self.assertEqual((counters.total, counters.completed), (2, 1))
+        counters = UserTaskCounters.objects.get(user=other)
+        self.assertEqual((counters.total, counters.completed), (1, 0))
+
+
+class BenchCommandTest(TestCase):
+    def test_reports_every_endpoint_cold_and_warm(self) -> None:
+        output = StringIO()
+        call_command("bench", users=2, tasks_per_user=50, repeat=3, stdout=output)
+        lines = output.getvalue().splitlines()
+        self.assertIn("p99 ms", lines[3])
+        stats = [line.split() for line in lines if "/tasks/stats/" in line]
+        self.assertEqual([line[2] for line in stats], ["cold", "warm"])
+        self.assertFalse(Task.objects.exists())  # Seeded data is rolled back
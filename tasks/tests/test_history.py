@@ -0,0 +1,451 @@
+import gzip
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tasks.domain.history import diff_text, patch_text
+from tasks.models import (
+    Task,
+    TaskHistory,
+    TaskHistoryArchiveChunk,
+    TaskHistoryOutbox,
+    UserTaskCounters,
+)
+from tasks.services.bulk_service import bulk_update_tasks
+from tasks.services.history_service import drain_history_outbox
+from tasks.services.statistics_service import calculate_task_stats
+from users.models import User
+
+
+class TaskHistoryRecordingTest(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="João", password="João123")
+        Task.objects.create(
+            title="Example Task", description="Task description", user=self.user
+        )
+        self.task = Task.objects.select_related("user").get(title="Example Task")
+
+    def test_update_writes_history_in_three_queries(self) -> None:
+        self.task.title = "Updated Task"
+        with self.assertNumQueries(3):  # UPDATE task, SELECT version, INSERT history
+            self.task.save()
+        history = TaskHistory.objects.get(task=self.task)
+        self.assertEqual(history.version, 1)
+        self.assertEqual(history.change_by, self.user)
+        self.assertEqual(
+            history.changes, {"title": {"old": "Example Task", "new": "Updated Task"}}
+        )
+        self.assertEqual(
+            history.previous_states,
+            {
+                "title": "Example Task",
+                "description": "Task description",
+                "is_completed": False,
+            },
+        )
+
+    def test_toggle_writes_history_in_four_queries(self) -> None:
+        self.task.is_completed = True
+        with self.assertNumQueries(4):  # + UPDATE of the completed counter
+            self.task.save()
+        self.task.is_completed = False
+        with self.assertNumQueries(4):
+            self.task.save()
+        self.assertEqual(self.task.latest_version, 2)
+        self.assertEqual(
+            list(TaskHistory.objects.values_list("version", flat=True)), [2, 1]
+        )
+
+    def test_noop_save_does_not_write_history(self) -> None:
+        with self.assertNumQueries(1):  # UPDATE task only
+            self.task.save()
+        self.assertFalse(TaskHistory.objects.exists())
+        self.assertEqual(self.task.latest_version, 0)
+
+    def test_stale_noop_save_keeps_the_version(self) -> None:
+        stale = Task.objects.get(pk=self.task.pk)
+        self.task.title = "Updated Task"
+        self.task.save()
+        stale.save()
+        self.assertEqual(stale.latest_version, 0)
+        stale.refresh_from_db()
+        self.assertEqual(stale.latest_version, 1)
+        stale.description = "Edited after"
+        stale.save()
+        self.assertEqual(stale.latest_version, 2)
+        self.assertEqual(
+            list(TaskHistory.objects.values_list("version", flat=True)), [2, 1]
+        )
+
+    def test_a_version_is_recorded_once_per_task(self) -> None:
+        self.task.title = "Updated Task"
+        self.task.save()
+        entry = TaskHistory.objects.get(task=self.task)
+        entry.pk = None
+        entry.change_date += timedelta(seconds=1)  # Not caught by the unique key
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            entry.save()
+        self.assertEqual(TaskHistory.objects.filter(task=self.task).count(), 1)
+
+    def test_update_fields_limits_tracked_changes(self) -> None:
+        self.task.title = "Updated Task"
+        self.task.description = "Not saved"
+        self.task.save(update_fields=["title"])
+        history = TaskHistory.objects.get(task=self.task)
+        self.assertEqual(list(history.changes), ["title"])
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.latest_version, 1)
+        self.assertEqual(self.task.description, "Task description")
+
+    def test_fields_left_out_of_update_fields_stay_pending(self) -> None:
+        self.task.title = "Updated Task"
+        self.task.description = "Saved later"
+        self.task.save(update_fields=["title"])
+        self.task.save()
+        history = TaskHistory.objects.get(task=self.task, version=2)
+        self.assertEqual(
+            history.changes,
+            {"description": {"old": "Task description", "new": "Saved later"}},
+        )
+
+    def test_deferred_fields_are_fetched_once(self) -> None:
+        task = Task.objects.select_related("user").defer("description").get(
+            pk=self.task.pk
+        )
+        task.title = "Updated Task"
+        with self.assertNumQueries(4):  # + SELECT of the deferred description
+            task.save(update_fields=["title"])
+        history = TaskHistory.objects.get(task=task)
+        self.assertEqual(history.previous_states["description"], "Task description")
+
+
+class UserTaskCountersTest(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="João", password="João123")
+
+    def counters(self) -> tuple[int, int]:
+        counters = UserTaskCounters.objects.get(user=self.user)
+        return counters.total, counters.completed
+
+    def test_counters_follow_creates_toggles_and_deletes(self) -> None:
+        task = Task.objects.create(title="First", user=self.user)
+        Task.objects.create(title="Second", user=self.user, is_completed=True)
+        self.assertEqual(self.counters(), (2, 1))
+        task.is_completed = True
+        task.save()
+        self.assertEqual(self.counters(), (2, 2))
+        task.title = "Renamed"
+        task.save()
+        self.assertEqual(self.counters(), (2, 2))
+        task.delete()
+        self.assertEqual(self.counters(), (1, 1))
+
+    def test_stats_read_the_counters(self) -> None:
+        Task.objects.create(title="First", user=self.user, is_completed=True)
+        Task.objects.create(title="Second", user=self.user)
+        with self.assertNumQueries(1):
+            stats = calculate_task_stats(self.user)
+        self.assertEqual(stats.as_dict()["completion_percentage"], "50.00%")
+        self.assertEqual(stats.pending_tasks, 1)
+
+    def test_missing_counters_are_rebuilt(self) -> None:
+        Task.objects.create(title="First", user=self.user)
+        UserTaskCounters.objects.all().delete()
+        self.assertEqual(calculate_task_stats(self.user).total_tasks, 1)
+        self.assertEqual(self.counters(), (1, 0))
+
+    def test_deleting_the_user_does_not_recreate_its_counters(self) -> None:
+        Task.objects.create(title="First", user=self.user, is_completed=True)
+        Task.objects.create(title="Second", user=self.user)
+        self.user.delete()
+        self.assertFalse(UserTaskCounters.objects.exists())
+
+
+@override_settings(TASK_HISTORY_MODE="outbox")
+class TaskHistoryOutboxTest(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="João", password="João123")
+        self.task = Task.objects.create(title="Example Task", user=self.user)
+
+    def test_changes_wait_in_the_outbox_until_drained(self) -> None:
+        self.task.title = "Updated Task"
+        self.task.save()
+        self.task.is_completed = True
+        self.task.save()
+        bulk_update_tasks(self.user, [{"id": str(self.task.id), "title": "Bulk"}], {})
+        self.assertFalse(TaskHistory.objects.exists())
+        pending = list(TaskHistoryOutbox.objects.all())
+        self.assertEqual([entry.version for entry in pending], [1, 2, 3])
+
+        self.assertEqual(drain_history_outbox(batch_size=2), 2)
+        self.assertEqual(drain_history_outbox(batch_size=2), 1)
+        self.assertFalse(TaskHistoryOutbox.objects.exists())
+        history = list(TaskHistory.objects.filter(task=self.task))
+        self.assertEqual([entry.version for entry in history], [3, 2, 1])
+        self.assertEqual(
+            [entry.change_date for entry in reversed(history)],
+            [entry.change_date for entry in pending],
+        )
+        self.assertEqual(history[1].changes, {"is_completed": {"old": False, "new": True}})  # noqa: E501
+
+    def test_draining_an_entry_twice_keeps_one_history_row(self) -> None:
+        self.task.title = "Updated Task"
+        self.task.save()
+        entry = TaskHistoryOutbox.objects.get()
+        drain_history_outbox()
+        entry.pk = None
+        entry.save()  # E.g. a batch retried after its delete was lost
+        drain_history_outbox()
+        self.assertEqual(TaskHistory.objects.filter(task=self.task).count(), 1)
+
+    def test_drain_command(self) -> None:
+        self.task.title = "Updated Task"
+        self.task.save()
+        out = StringIO()
+        call_command("drain_task_history", stdout=out)
+        self.assertIn("Moved 1 history entries.", out.getvalue())
+        self.assertEqual(TaskHistory.objects.get().version, 1)
+
+
+class DeltaHistoryTest(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="João", password="João123")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def edit(self, title: str, edits: int = 10) -> Task:
+        """A task with ``edits`` small edits of a long description."""
+        task = Task.objects.create(title=title, user=self.user)
+        words = [f"word{number}" for number in range(200)]
+        for number in range(edits):
+            words[number * 7 % 200] = f"edit{number}"
+            task.description = " ".join(words)
+            if number % 3 == 0:
+                task.is_completed = not task.is_completed
+            task.save()
+        return task
+
+    def history(self, task: Task) -> dict[int, dict]:
+        entries = self.client.get("/tasks-history/", {"task": str(task.pk)}).json()
+        return {entry["version"]: entry for entry in entries}
+
+    def cursor_pages(self, page_size: int) -> list[dict]:
+        results = []
+        response = self.client.get(
+            "/tasks-history/", {"cursor": "", "page_size": page_size}
+        )
+        while True:
+            body = response.json()
+            results.extend(body["results"])
+            if body["next"] is None:
+                return results
+            response = self.client.get(body["next"])
+
+    def test_text_diff_round_trip(self) -> None:
+        old = "The quick brown fox jumps over the lazy dog. " * 20
+        for new in (old.replace("lazy", "sleepy", 1), old[:-60], "Fresh " + old, ""):
+            self.assertEqual(patch_text(old, diff_text(old, new)), new)
+        self.assertLess(len(str(diff_text(old, old.replace("fox", "cat", 1)))), 40)
+
+    def test_text_diff_of_long_descriptions_is_bounded(self) -> None:
+        old = " ".join(f"word{number}" for number in range(10_000))  # About 90 KB
+        new = old.replace("word5000", "edited", 1)
+        self.assertEqual(diff_text(old, new), [old.index("word5000"), -8, "edited"])
+
+        scattered = old.replace("word1", "edited").replace("word9", "edited")
+        with patch("tasks.domain.history.SequenceMatcher") as matcher:
+            diff = diff_text(old, scattered)
+        matcher.assert_not_called()  # Too many tokens changed: replaced whole
+        self.assertEqual(patch_text(old, diff), scattered)
+
+    @override_settings(TASK_HISTORY_STORAGE="delta", TASK_HISTORY_SNAPSHOT_INTERVAL=4)
+    def test_delta_entries_read_like_full_ones(self) -> None:
+        task = self.edit("Delta")
+        with override_settings(TASK_HISTORY_STORAGE="full"):
+            expected = self.history(self.edit("Full"))
+        snapshots = TaskHistory.objects.filter(task=task, delta__isnull=True)
+        self.assertEqual(
+            sorted(snapshots.values_list("version", flat=True)), [1, 5, 9]
+        )
+        # The whole chain in one response, or pages starting in its middle
+        for entries in (
+            list(self.history(task).values()),
+            [entry for entry in self.cursor_pages(3) if entry["task"] == str(task.pk)],
+        ):
+            self.assertEqual(len(entries), 10)
+            for entry in entries:
+                full = expected[entry["version"]]
+                self.assertEqual(entry["changes"], full["changes"])
+                self.assertEqual(
+                    entry["previous_states"],
+                    {**full["previous_states"], "title": "Delta"},
+                )
+        entry = TaskHistory.objects.get(task=task, version=7)
+        detail = self.client.get(f"/tasks-history/{entry.pk}/").json()
+        self.assertEqual(detail["changes"], expected[7]["changes"])
+
+    def test_compact_command_converts_and_expands(self) -> None:
+        self.edit("Example Task")
+        fields = ("version", "changes", "previous_states")
+        original = list(TaskHistory.objects.values(*fields))
+        listed = self.client.get("/tasks-history/").json()
+        out = StringIO()
+        call_command("compact_task_history", interval=4, stdout=out)
+        self.assertIn("Rewrote 7 of 10 history entries", out.getvalue())
+        self.assertEqual(TaskHistory.objects.filter(delta__isnull=True).count(), 3)
+        self.assertEqual(self.client.get("/tasks-history/").json(), listed)
+
+        call_command("compact_task_history", expand=True, stdout=StringIO())
+        self.assertEqual(list(TaskHistory.objects.values(*fields)), original)
+
+
+class TaskAsOfTest(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="João", password="João123")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.task = Task.objects.create(
+            title="Example Task", description="First draft", user=self.user
+        )
+        self.states = [self.state()]  # By version
+        for number in range(1, 11):
+            self.task.description = f"{self.task.description} and edit {number}"
+            self.task.is_completed = number % 3 == 0
+            self.task.save()
+            self.states.append(self.state())
+        self.url = f"/tasks/{self.task.pk}/as-of/"
+
+    def state(self) -> dict:
+        return {
+            "title": self.task.title,
+            "description": self.task.description,
+            "is_completed": self.task.is_completed,
+        }
+
+    def assert_versions_rebuilt(self) -> None:
+        for version, state in enumerate(self.states):
+            response = self.client.get(self.url, {"version": version})
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+            body = response.json()
+            self.assertEqual(body["version"], version)
+            self.assertEqual({field: body[field] for field in state}, state)
+
+    def test_versions_are_rebuilt_with_full_storage(self) -> None:
+        self.assert_versions_rebuilt()
+
+    @override_settings(TASK_HISTORY_STORAGE="delta", TASK_HISTORY_SNAPSHOT_INTERVAL=4)
+    def test_versions_are_rebuilt_from_the_nearest_snapshot(self) -> None:
+        call_command("compact_task_history", interval=4, stdout=StringIO())
+        self.assert_versions_rebuilt()
+        with self.assertNumQueries(2):  # The task, then versions 5 to 7
+            self.client.get(self.url, {"version": 7})
+
+    def test_at_returns_the_version_of_that_time(self) -> None:
+        start = self.task.created_at
+        for version in range(1, 11):
+            TaskHistory.objects.filter(task=self.task, version=version).update(
+                change_date=start + timedelta(hours=version)
+            )
+        at = (start + timedelta(hours=3, minutes=30)).isoformat()
+        body = self.client.get(self.url, {"at": at}).json()
+        self.assertEqual(body["version"], 3)
+        self.assertEqual(body["description"], self.states[3]["description"])
+        at = (start + timedelta(minutes=30)).isoformat()
+        self.assertEqual(self.client.get(self.url, {"at": at}).json()["version"], 0)
+
+    def test_invalid_or_unknown_versions(self) -> None:
+        for params in ({}, {"version": 1, "at": "2025-01-01"}, {"version": "x"},
+                       {"version": -1}, {"at": "yesterday"}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST, params)
+        before = (self.task.created_at - timedelta(days=1)).isoformat()
+        for params in ({"version": 11}, {"at": before}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND, params)
+        other = User.objects.create_user(username="Maria", password="Maria123")
+        self.client.force_authenticate(other)
+        response = self.client.get(self.url, {"version": 1})
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+
+@override_settings(TASK_HISTORY_STORAGE="delta", TASK_HISTORY_SNAPSHOT_INTERVAL=4)
+class TaskHistoryArchiveTest(TestCase):
+    def setUp(self) -> None:
+        archive_dir = TemporaryDirectory()
+        self.addCleanup(archive_dir.cleanup)
+        self.archive_dir = Path(archive_dir.name)
+        settings_override = override_settings(TASK_HISTORY_ARCHIVE_DIR=self.archive_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(username="João", password="João123")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.task = Task.objects.create(title="Example Task", user=self.user)
+        for number in range(1, 11):
+            self.task.description = f"{self.task.description} edit {number}".strip()
+            self.task.save()
+        # Versions 1 to 6 are old; 7 and 8 are deltas on the snapshot at 5
+        old = timezone.now() - timedelta(days=100)
+        Task.objects.filter(pk=self.task.pk).update(created_at=old)
+        for version in range(1, 7):
+            TaskHistory.objects.filter(task=self.task, version=version).update(
+                change_date=old + timedelta(hours=version)
+            )
+        self.params = {"task": str(self.task.pk), "archived": "true"}
+        self.history = self.client.get("/tasks-history/", self.params).json()
+
+    def test_old_entries_are_archived_and_stay_readable(self) -> None:
+        out = StringIO()
+        with patch("tasks.services.archive_service.ARCHIVE_CHUNK_ENTRIES", 4):
+            call_command("archive_task_history", older_than=30, stdout=out)
+        self.assertIn("Archived 6 history entries of 1 tasks", out.getvalue())
+        self.assertEqual(TaskHistoryArchiveChunk.objects.count(), 2)
+        kept = TaskHistory.objects.filter(task=self.task)
+        self.assertEqual(sorted(kept.values_list("version", flat=True)), [7, 8, 9, 10])
+        self.assertIsNone(kept.get(version=7).delta)  # No longer needs version 5
+        (archive,) = self.archive_dir.iterdir()
+        with gzip.open(archive, "rt") as file:
+            self.assertEqual(len(file.readlines()), 6)
+
+        self.assertEqual(self.client.get("/tasks-history/", self.params).json(), self.history)  # noqa: E501
+        live = self.client.get("/tasks-history/", {"task": str(self.task.pk)}).json()
+        self.assertEqual(live, self.history[:4])
+        url = f"/tasks/{self.task.pk}/as-of/"
+        self.assertEqual(
+            self.client.get(url, {"version": 3}).json()["description"],
+            "edit 1 edit 2 edit 3",
+        )
+        at = self.history[-2]["change_date"]  # Version 2
+        self.assertEqual(self.client.get(url, {"at": at}).json()["version"], 2)
+
+    def test_delete_drops_old_entries(self) -> None:
+        out = StringIO()
+        call_command("archive_task_history", older_than=30, delete=True, stdout=out)
+        self.assertIn("Deleted 6 history entries", out.getvalue())
+        self.assertEqual(list(self.archive_dir.iterdir()), [])
+        self.assertEqual(
+            self.client.get("/tasks-history/", self.params).json(), self.history[:4]
+        )
+        url = f"/tasks/{self.task.pk}/as-of/"
+        self.assertEqual(self.client.get(url, {"version": 8}).status_code, HTTPStatus.OK)  # noqa: E501
+        response = self.client.get(url, {"version": 3})
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_retention_must_be_set(self) -> None:
+        with self.assertRaises(CommandError):
+            call_command("archive_task_history", stdout=StringIO())
+
+    def test_archived_needs_a_task(self) -> None:
+        for params in ({"archived": "true"}, {**self.params, "cursor": ""}):
+            response = self.client.get("/tasks-history/", params)
+            self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
@@ -0,0 +1,66 @@
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from tasks.models import Task, TaskHistory
+from tasks.services.counter_service import reconcile_task_counters
+from tasks.tests.helpers import QueryBudgetMixin
+from users.models import User
+
+PAGE_SIZES = (10, 100)
+
+
+class EndpointQueryBudgetTest(QueryBudgetMixin):
+    """The query count of every read endpoint must not grow with the page size."""
+
+    def setUp(self) -> None:
+        cache.clear()  # Measure the database path, not cached responses
+        self.user = User.objects.create_user(username="João", password="João123")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        tasks = Task.objects.bulk_create(
+            Task(title=f"Task {number}", user=self.user, is_completed=number % 2 == 0)
+            for number in range(150)
+        )
+        TaskHistory.objects.bulk_create(
+            TaskHistory(
+                task=task,
+                change_by=self.user,
+                version=1,
+                changes={"is_completed": {"old": False, "new": True}},
+                previous_states={},
+            )
+            for task in tasks
+        )
+        reconcile_task_counters(self.user.id)  # bulk_create skips the signals
+        self.task = tasks[0]
+
+    def get(self, budget: int, url: str, params: dict | None = None) -> None:
+        with self.assertQueryBudget(budget, f"GET {url} {params}"):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+
+    def test_task_list(self) -> None:
+        for page_size in PAGE_SIZES:
+            self.get(2, "/tasks/", {"page_size": page_size})  # COUNT + page
+            self.get(1, "/tasks/", {"page_size": page_size, "cursor": ""})
+
+    def test_task_retrieve(self) -> None:
+        self.get(1, f"/tasks/{self.task.pk}/")
+
+    def test_history_list(self) -> None:
+        for page_size in PAGE_SIZES:
+            self.get(1, "/tasks-history/", {"page_size": page_size, "cursor": ""})
+        self.get(1, "/tasks-history/")
+        self.get(1, "/tasks-history/", {"task": str(self.task.pk)})
+
+    def test_task_as_of(self) -> None:
+        Task.objects.filter(pk=self.task.pk).update(latest_version=1)
+        self.get(2, f"/tasks/{self.task.pk}/as-of/", {"version": 1})  # Task + chain
+        self.get(3, f"/tasks/{self.task.pk}/as-of/", {"at": "2100-01-01T00:00:00Z"})
+
+    def test_stats(self) -> None:
+        self.get(1, "/tasks/stats/")
+
+    def test_metrics(self) -> None:
+        for days in (10, 100):
+            self.get(1, "/tasks/metrics/", {"days": days})
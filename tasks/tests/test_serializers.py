@@ -0,0 +1,58 @@
+import json
+
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from tasks.models import Task, TaskHistory
+from tasks.serializers import (
+    TaskHistoryReadSerializer,
+    TaskHistorySerializer,
+    TaskReadSerializer,
+    TaskSerializer,
+)
+from users.models import User
+
+
+class ReadSerializerTest(TestCase):
+    """The .values() serializers must render the same JSON as the model ones."""
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="João", password="João123")
+        task = Task.objects.create(title="First Task", user=self.user)
+        Task.objects.create(
+            title="Ação", description="Descrição", is_completed=True, user=self.user
+        )
+        task.is_completed = True
+        task.save()
+        task.title = "Renamed"
+        task.save()
+
+    def assertSameJSON(self, model_data: object, read_data: object) -> None:  # noqa: N802
+        render = JSONRenderer().render
+        self.assertEqual(render(model_data), render(read_data))
+
+    def test_task_output_matches_task_serializer(self) -> None:
+        queryset = Task.objects.filter(user=self.user).order_by("title")
+        self.assertSameJSON(
+            TaskSerializer(queryset, many=True).data,
+            TaskReadSerializer(TaskReadSerializer.prepare(queryset)).data,
+        )
+
+    def test_history_output_matches_history_serializer(self) -> None:
+        queryset = TaskHistory.objects.filter(task__user=self.user)
+        self.assertEqual(queryset.count(), 2)
+        self.assertSameJSON(
+            TaskHistorySerializer(queryset, many=True).data,
+            TaskHistoryReadSerializer(TaskHistoryReadSerializer.prepare(queryset)).data,
+        )
+
+    def test_list_endpoints_render_the_same_json(self) -> None:
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get("/tasks/", {"cursor": "", "ordering": "title"})
+        tasks = Task.objects.filter(user=self.user).order_by("title", "id")
+        self.assertEqual(
+            response.json()["results"],
+            json.loads(JSONRenderer().render(TaskSerializer(tasks, many=True).data)),
+        )
@@ -0,0 +1,324 @@
+import base64
+import csv
+import gzip
+import io
+import json
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils.timezone import now
+from rest_framework.test import APIClient
+
+from tasks.cache import get_task_cache_generation, task_stats_cache_keys
+from tasks.models import Task
+from tasks.services.export_service import (
+    TASK_CSV_COLUMNS,
+    TASK_HISTORY_CSV_COLUMNS,
+)
+from users.models import User
+
+
+class TaskListCacheTest(TestCase):
+    url = "/tasks/"
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="João", password="João123")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.task = Task.objects.create(title="First Task", user=self.user)
+
+    def titles(self, response: object) -> list[str]:
+        return [task["title"] for task in response.json()["results"]]  # type: ignore[attr-defined]
+
+    def test_cached_page_is_served_without_queries(self) -> None:
+        first = self.client.get(self.url, {"ordering": "title"})
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url, {"ordering": "title"})
+        self.assertEqual(first.json(), second.json())
+
+    def test_pages_are_cached_per_query(self) -> None:
+        Task.objects.create(title="Second Task", user=self.user, is_completed=True)
+        self.client.get(self.url)
+        response = self.client.get(self.url, {"status": "completed"})
+        self.assertEqual(self.titles(response), ["Second Task"])
+        response = self.client.get(self.url, {"ordering": "title", "page_size": 1})
+        self.assertEqual(self.titles(response), ["First Task"])
+
+    def test_writes_invalidate_cached_pages(self) -> None:
+        self.client.get(self.url)
+        self.client.post(self.url, {"title": "Second Task"}, format="json")
+        self.assertEqual(self.titles(self.client.get(self.url)), ["Second Task", "First Task"])  # noqa: E501
+        self.client.patch(f"{self.url}{self.task.id}/", {"title": "Renamed"}, format="json")  # noqa: E501
+        self.assertEqual(self.titles(self.client.get(self.url)), ["Second Task", "Renamed"])  # noqa: E501
+        self.client.delete(f"{self.url}{self.task.id}/")
+        self.assertEqual(self.titles(self.client.get(self.url)), ["Second Task"])
+
+    def test_pages_are_not_shared_between_users(self) -> None:
+        self.client.get(self.url)
+        other = User.objects.create_user(username="Maria", password="Maria123")
+        self.client.force_authenticate(other)
+        self.assertEqual(self.titles(self.client.get(self.url)), [])
+
+
+class TaskCacheInvalidationTest(TestCase):
+    """Stats and metrics are cached like the list pages, under the same generation."""
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="João", password="João123")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.task = Task.objects.create(title="First Task", user=self.user)
+
+    def metrics(self) -> dict:
+        response = self.client.get("/tasks/metrics/", {"completed": "true"})
+        return response.json()  # type: ignore[attr-defined]
+
+    def stats(self) -> dict:
+        return self.client.get("/tasks/stats/").json()  # type: ignore[attr-defined]
+
+    def test_cached_reads_run_no_queries(self) -> None:
+        self.metrics()
+        self.stats()
+        with self.assertNumQueries(0):
+            self.metrics()
+            self.stats()
+
+    def test_metrics_and_stats_refresh_after_writes(self) -> None:
+        today = now().strftime("%d/%m/%Y")
+        self.assertEqual(self.metrics()["task_distribution"][today], 1)
+        self.assertEqual(self.stats()["total_tasks"], 1)
+
+        self.client.post("/tasks/", {"title": "Second Task"}, format="json")
+        self.assertEqual(self.metrics()["task_distribution"][today], 2)
+        self.assertEqual(self.stats()["total_tasks"], 2)
+
+        self.client.patch(f"/tasks/{self.task.id}/", {"is_completed": True}, format="json")  # noqa: E501
+        self.assertEqual(self.metrics()["completed_distribution"][today], 1)
+        self.assertEqual(self.stats()["completed_tasks"], 1)
+
+        self.client.delete("/tasks/bulk/", [str(self.task.id)], format="json")
+        self.assertEqual(self.metrics()["task_distribution"][today], 1)
+        self.assertEqual(self.stats()["total_tasks"], 1)
+
+    def test_metrics_are_not_shared_between_users(self) -> None:
+        self.metrics()
+        other = User.objects.create_user(username="Maria", password="Maria123")
+        self.client.force_authenticate(other)
+        self.assertEqual(sum(self.metrics()["task_distribution"].values()), 0)
+
+    def test_read_started_before_a_write_cannot_cache_stale_data(self) -> None:
+        self.stats()
+        old_key = task_stats_cache_keys(self.user.id).key  # Read in flight...
+        old_entry = cache.get(old_key)
+        Task.objects.create(title="Second Task", user=self.user)
+        cache.set(old_key, old_entry)  # ...stores its result late
+        self.assertEqual(self.stats()["total_tasks"], 2)
+
+    def test_generation_is_bumped_again_on_commit(self) -> None:
+        generation = get_task_cache_generation(self.user.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.title = "Renamed"
+            self.task.save()
+            self.assertEqual(get_task_cache_generation(self.user.id), generation + 1)
+        self.assertEqual(get_task_cache_generation(self.user.id), generation + 2)
+
+
+class TaskCursorPaginationTest(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="João", password="João123")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Task.objects.bulk_create(
+            Task(title=f"Task {number:02}", user=self.user) for number in range(25)
+        )
+        # Ties on created_at must be broken by the id
+        Task.objects.filter(title__lt="Task 10").update(created_at=now())
+
+    def walk(self, url: str, params: dict) -> list[dict]:
+        results: list[dict] = []
+        response = self.client.get(url, {**params, "cursor": ""})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            self.assertNotIn("count", body)
+            results.extend(body["results"])
+            if body["next"] is None:
+                return results
+            response = self.client.get(body["next"])
+
+    def test_walks_every_task_once_in_default_order(self) -> None:
+        results = self.walk("/tasks/", {"page_size": 4})
+        expected = list(
+            Task.objects.order_by("-created_at", "-id").values_list("title", flat=True)
+        )
+        self.assertEqual([task["title"] for task in results], expected)
+
+    def test_honors_title_ordering(self) -> None:
+        results = self.walk("/tasks/", {"page_size": 7, "ordering": "-title"})
+        expected = [f"Task {number:02}" for number in reversed(range(25))]
+        self.assertEqual([task["title"] for task in results], expected)
+
+    def test_filters_apply_to_cursor_pages(self) -> None:
+        Task.objects.filter(title__in=["Task 03", "Task 20"]).update(is_completed=True)
+        results = self.walk("/tasks/", {"status": "completed", "ordering": "title"})
+        self.assertEqual([task["title"] for task in results], ["Task 03", "Task 20"])
+
+    def test_invalid_cursor(self) -> None:
+        response = self.client.get("/tasks/", {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_tampered_cursor_values(self) -> None:
+        task = Task.objects.first()
+        created_at, task_id = task.created_at.isoformat(), str(task.id)
+        cases = {
+            "/tasks/": [
+                ["yesterday", task_id],
+                [created_at, "not-a-uuid"],
+                [[created_at], task_id],
+                [created_at, {"id": task_id}],
+                [None, task_id],
+            ],
+            "/tasks-history/": [["not-a-uuid", 1], [task_id, "one"], [task_id, [1]]],
+        }
+        for url, positions in cases.items():
+            for position in positions:
+                cursor = base64.urlsafe_b64encode(json.dumps(position).encode())
+                response = self.client.get(url, {"cursor": cursor.decode()})
+                self.assertEqual(response.status_code, 404, position)
+                self.assertEqual(response.json(), {"detail": "Invalid cursor"})
+
+    def test_page_number_mode_is_unchanged(self) -> None:
+        body = self.client.get("/tasks/", {"page": 3}).json()
+        self.assertEqual(body["count"], 25)
+        self.assertEqual(len(body["results"]), 5)
+
+    def test_history_cursor_pagination(self) -> None:
+        for task in Task.objects.filter(title__in=["Task 01", "Task 02"]):
+            for number in range(3):
+                task.description = f"Version {number}"
+                task.save()
+        self.assertEqual(len(self.client.get("/tasks-history/").json()), 6)
+        results = self.walk("/tasks-history/", {"page_size": 4})
+        keys = [(entry["task"], entry["version"]) for entry in results]
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(keys), 6)
+
+
+class TaskMetricsTest(TestCase):
+    url = "/tasks/metrics/"
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="João", password="João123")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        today = now().replace(hour=1, minute=30)
+        for number, (days_ago, completed) in enumerate(
+            [(0, False), (0, True), (1, True), (3, False), (30, False)]
+        ):
+            task = Task.objects.create(
+                title=f"Task {number}", user=self.user, is_completed=completed
+            )
+            Task.objects.filter(pk=task.pk).update(
+                created_at=today - timedelta(days=days_ago)
+            )
+        self.today = today
+
+    def day(self, days_ago: int, hours: int = 0) -> str:
+        return (self.today - timedelta(days=days_ago, hours=hours)).strftime("%d/%m/%Y")
+
+    def test_distribution_format_is_unchanged(self) -> None:
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {"days": 7})
+        self.assertEqual(
+            response.content,
+            json.dumps(
+                {
+                    "days": 7,
+                    "task_distribution": {
+                        self.day(3): 1, self.day(1): 1, self.day(0): 2
+                    },
+                },
+                separators=(",", ":"),
+            ).encode(),
+        )
+
+    def test_completed_distribution(self) -> None:
+        response = self.client.get(self.url, {"days": 7, "completed": "true"})
+        self.assertEqual(
+            response.json()["completed_distribution"],
+            {self.day(3): 0, self.day(1): 1, self.day(0): 1},
+        )
+
+    def test_days_are_bucketed_in_the_requested_time_zone(self) -> None:
+        # 01:30 UTC is still the previous day in São Paulo (UTC-3)
+        response = self.client.get(self.url, {"days": 7, "tz": "America/Sao_Paulo"})
+        self.assertEqual(
+            response.json()["task_distribution"],
+            {self.day(3, 3): 1, self.day(1, 3): 1, self.day(0, 3): 2},
+        )
+
+    def test_invalid_time_zone(self) -> None:
+        response = self.client.get(self.url, {"tz": "Mars/Olympus"})
+        self.assertEqual(response.status_code, 400)
+
+
+class TaskExportTest(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="João", password="João123")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        for number in range(5):
+            task = Task.objects.create(
+                title=f"Task {number}",
+                description="Line one\nline, two",
+                user=self.user,
+            )
+            task.is_completed = number % 2 == 0
+            task.save()
+        other = User.objects.create_user(username="Maria", password="Maria123")
+        Task.objects.create(title="Not mine", user=other)
+
+    def export(self, url: str, params: dict | None = None) -> bytes:
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("attachment", response["Content-Disposition"])
+        return b"".join(response.streaming_content)
+
+    def test_ndjson_matches_the_list(self) -> None:
+        listed = self.client.get("/tasks/", {"page_size": 100}).json()["results"]
+        lines = self.export("/tasks/export/").decode().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], listed)
+        lines = self.export("/tasks/export/", {"status": "pending"}).splitlines()
+        self.assertEqual(len(lines), 2)
+
+    def test_csv_and_gzip(self) -> None:
+        body = self.export("/tasks/export/", {"format": "csv", "ordering": "title"})
+        rows = list(csv.DictReader(io.StringIO(body.decode())))
+        titles = [row["title"] for row in rows]
+        self.assertEqual(titles, [f"Task {number}" for number in range(5)])
+        self.assertEqual(rows[0]["description"], "Line one\nline, two")
+        self.assertEqual(rows[0]["user.username"], "João")
+        params = {"format": "csv", "compress": "gzip"}
+        compressed = self.export("/tasks/export/", params)
+        self.assertEqual(len(gzip.decompress(compressed).decode().splitlines()), 1 + 5 * 2)  # noqa: E501
+        empty = self.export("/tasks/export/", {"format": "csv", "status": "none"})
+        self.assertEqual(empty.decode().splitlines(), [",".join(TASK_CSV_COLUMNS)])
+
+    def test_history_export(self) -> None:
+        listed = self.client.get("/tasks-history/").json()
+        lines = self.export("/tasks-history/export/").decode().splitlines()
+        exported = [json.loads(line) for line in lines]
+        self.assertEqual(len(exported), 3)  # Saving the completed tasks
+        key = lambda entry: (entry["task"], entry["version"])  # noqa: E731
+        self.assertEqual(sorted(exported, key=key), sorted(listed, key=key))
+        pending = self.export("/tasks-history/export/", {"status": "pending"})
+        self.assertEqual(pending, b"")
+        body = self.export("/tasks-history/export/", {"format": "csv"}).decode()
+        self.assertEqual(body.splitlines()[0], ",".join(TASK_HISTORY_CSV_COLUMNS))
+
+    def test_invalid_parameters(self) -> None:
+        self.assertEqual(self.client.get("/tasks/export/", {"format": "xml"}).status_code, 404)  # noqa: E501
+        response = self.client.get("/tasks/export/", {"compress": "zip"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.content), {"error": "Invalid compress parameter"})  # noqa: E501
@@ -0,0 +1,124 @@
+from collections.abc import Awaitable, Callable
+from functools import wraps
+from http import HTTPStatus
+from typing import Any
+from uuid import UUID
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException, NotAuthenticated, NotFound
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from tasks.cache import TASK_LIST_TIMEOUT, atask_list_cache_key
+from tasks.models import Task
+from tasks.serializers import TaskReadSerializer
+from tasks.services.statistics_service import (
+    acached_task_metrics,
+    acached_task_stats,
+)
+from tasks.views.task import TaskViewSet, parse_metrics_params
+from users.authentication import AsyncJWTAuthentication
+from users.models import User
+
+AsyncHandler = Callable[..., Awaitable[HttpResponse]]
+
+_renderer = JSONRenderer()
+
+
+def _authentication() -> AsyncJWTAuthentication:
+    """The first of DEFAULT_AUTHENTICATION_CLASSES, which must support async."""
+    return api_settings.DEFAULT_AUTHENTICATION_CLASSES[0]()
+
+
+def _render(data: Any, status: int = HTTPStatus.OK) -> HttpResponse:  # noqa: ANN401
+    """Renders like the DRF views, so both modes return the same bytes."""
+    return HttpResponse(
+        _renderer.render(data), status=status, content_type=_renderer.media_type
+    )
+
+
+def _error(request: HttpRequest, exc: APIException) -> HttpResponse:
+    """Same body and headers as DRF's exception handler for ``exc``."""
+    data = exc.detail if isinstance(exc.detail, list | dict) else {"detail": exc.detail}
+    response = _render(data, exc.status_code)
+    if exc.status_code == HTTPStatus.UNAUTHORIZED:
+        response["WWW-Authenticate"] = _authentication().authenticate_header(request)  # type: ignore[arg-type]
+    return response
+
+
+def async_get(sync_view: Callable[..., HttpResponse]) -> Callable[[AsyncHandler], AsyncHandler]:  # noqa: E501
+    """
+    Serves GET requests with the decorated coroutine, called with the
+    authenticated user; any other method is handled by ``sync_view``.
+    """
+
+    def decorator(handler: AsyncHandler) -> AsyncHandler:
+        @csrf_exempt  # Token authentication only, as in the DRF views
+        @wraps(handler)
+        async def view(request: HttpRequest, **kwargs: Any) -> HttpResponse:  # noqa: ANN401
+            if request.method != "GET":
+                return await sync_to_async(sync_view)(request, **kwargs)
+            try:
+                authenticated = await _authentication().aauthenticate(request)
+                if authenticated is None:
+                    raise NotAuthenticated
+                return await handler(request, authenticated[0], **kwargs)
+            except APIException as exc:
+                return _error(request, exc)
+
+        return view
+
+    return decorator
+
+
+@async_get(TaskViewSet.as_view({"get": "list", "post": "create"}))
+async def task_list(request: HttpRequest, user: User) -> HttpResponse:
+    """GET /tasks/ with the filters, ordering, pagination and cache of the sync view."""
+    cache_key = await atask_list_cache_key(user.id, request.get_host(), request.GET)
+    if (cached_page := await cache.aget(cache_key)) is not None:
+        return _render(cached_page)
+    drf_request = Request(request)
+    drf_request.user = user
+    view = TaskViewSet(
+        request=drf_request, args=(), kwargs={}, format_kwarg=None, action="list"
+    )
+    rows = TaskReadSerializer.prepare(view.filter_queryset(view.get_queryset()))
+    paginator = view.paginator
+    page = await paginator.apaginate_queryset(rows, drf_request, view)  # type: ignore[union-attr]
+    data = paginator.get_paginated_response(TaskReadSerializer(page).data).data  # type: ignore[union-attr]
+    await cache.aset(cache_key, data, TASK_LIST_TIMEOUT)
+    return _render(data)
+
+
+@async_get(
+    TaskViewSet.as_view({
+        "get": "retrieve",
+        "put": "update",
+        "patch": "partial_update",
+        "delete": "destroy",
+    })
+)
+async def task_detail(request: HttpRequest, user: User, pk: UUID) -> HttpResponse:
+    rows = TaskReadSerializer.prepare(Task.objects.filter(user=user, pk=pk))
+    if (row := await rows.afirst()) is None:
+        msg = "No Task matches the given query."
+        raise NotFound(msg)
+    return _render(TaskReadSerializer([row]).data[0])
+
+
+@async_get(TaskViewSet.as_view({"get": "get_task_stats"}))
+async def task_stats(request: HttpRequest, user: User) -> HttpResponse:
+    return _render(await acached_task_stats(user))
+
+
+@async_get(TaskViewSet.as_view({"get": "task_metrics"}))
+async def task_metrics(request: HttpRequest, user: User) -> HttpResponse:
+    try:
+        days, tz, include_completed = parse_metrics_params(request.GET)
+    except ValueError as exc:
+        return _render({"error": str(exc)}, HTTPStatus.BAD_REQUEST)
+    return _render(await acached_task_metrics(user, days, tz, include_completed))
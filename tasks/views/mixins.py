@@ -0,0 +1,72 @@
+from http import HTTPStatus
+from typing import Any
+
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from tasks.renderers import CSVRenderer, NDJSONRenderer
+from tasks.serializers.read import ValuesReadSerializer
+from tasks.services.export_service import (
+    EXPORT_FORMAT_CSV,
+    encode_csv,
+    encode_ndjson,
+    export_rows,
+    gzip_stream,
+)
+
+
+class ValuesListModelMixin:
+    """
+    Lists with ``read_serializer_class`` from ``.values()`` rows instead of
+    model instances; the JSON is the same as with ``serializer_class``.
+    """
+
+    read_serializer_class: type[ValuesReadSerializer]
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:  # noqa: ANN401
+        serializer_class = self.read_serializer_class
+        rows = serializer_class.prepare(self.filter_queryset(self.get_queryset()))  # type: ignore[attr-defined]
+        page = self.paginate_queryset(rows)  # type: ignore[attr-defined]
+        if page is not None:
+            return self.get_paginated_response(serializer_class(page).data)  # type: ignore[attr-defined]
+        return Response(serializer_class(rows).data)
+
+
+export_renderers = [NDJSONRenderer, CSVRenderer]
+
+
+class ExportMixin:
+    """
+    Streams a queryset rendered by ``read_serializer_class`` as NDJSON (the
+    default) or CSV, chosen with ?format= or the Accept header, and gzips it
+    on the fly with ?compress=gzip. Export actions set ``export_renderers`` as
+    their renderer_classes, which select the format.
+    """
+
+    export_name: str
+    export_csv_columns: tuple[str, ...]
+    read_serializer_class: type[ValuesReadSerializer]
+
+    def stream_export(
+        self, request: Request, queryset: QuerySet
+    ) -> StreamingHttpResponse | Response:
+        compress = request.query_params.get("compress", "")
+        if compress not in {"", "gzip"}:
+            return Response(
+                {"error": "Invalid compress parameter"}, status=HTTPStatus.BAD_REQUEST
+            )
+        renderer = request.accepted_renderer
+        chunks = export_rows(self.read_serializer_class, queryset)
+        if renderer.format == EXPORT_FORMAT_CSV:
+            body = encode_csv(chunks, self.export_csv_columns)
+        else:
+            body = encode_ndjson(chunks)
+        filename = f"{self.export_name}.{renderer.format}"
+        content_type = renderer.media_type
+        if compress:
+            body, filename, content_type = gzip_stream(body), f"{filename}.gz", "application/gzip"  # noqa: E501
+        response = StreamingHttpResponse(body, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
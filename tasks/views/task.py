@@ -1,13 +1,14 @@
-from collections import Counter
-from datetime import timedelta
+import uuid
+from datetime import datetime
 from http import HTTPStatus
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from django.core.cache import cache
 from django.db.models import QuerySet
-from django.utils.decorators import method_decorator
-from django.utils.timezone import now
-from django.views.decorators.cache import cache_page
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import get_current_timezone, is_naive, make_aware
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets
 from rest_framework.decorators import action
@@ -18,17 +19,91 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import BaseSerializer
 
+from tasks.cache import TASK_LIST_TIMEOUT, task_list_cache_key
 from tasks.filters import TaskFilter
-from tasks.models import Task
+from tasks.models import Task, TaskImportJob
 from tasks.pagination import TaskPagination
-from tasks.serializers import TaskSerializer
-from tasks.services.statistics_service import calculate_task_stats
+from tasks.serializers import (
+    TaskImportJobSerializer,
+    TaskReadSerializer,
+    TaskSerializer,
+)
+from tasks.serializers.read import format_datetime
+from tasks.services.bulk_service import (
+    BULK_MAX_ITEMS,
+    bulk_create_tasks,
+    bulk_delete_tasks,
+    bulk_update_tasks,
+)
+from tasks.services.export_service import TASK_CSV_COLUMNS
+from tasks.services.history_service import task_state_as_of, task_version_at
+from tasks.services.import_service import (
+    IMPORT_FORMAT_CSV,
+    IMPORT_FORMAT_NDJSON,
+    IMPORT_FORMATS,
+    create_import_job,
+    start_import_job,
+)
+from tasks.services.statistics_service import cached_task_metrics, cached_task_stats
+from tasks.views.mixins import ExportMixin, ValuesListModelMixin, export_renderers
 
 if TYPE_CHECKING:
+    from django.http import QueryDict
+
     from users.models import User
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+def parse_metrics_params(params: "QueryDict") -> tuple[int, ZoneInfo, bool]:
+    """
+    Reads the days, tz and completed parameters of the metrics endpoint. Raises
+    ValueError with the message of the error response when one is invalid.
+    """
+    try:
+        days = int(params.get("days", 7))
+    except ValueError as exc:
+        msg = "Invalid days parameter"
+        raise ValueError(msg) from exc
+    if days < 1:
+        msg = '"days" parameter must be greater than 0'
+        raise ValueError(msg)
+    try:
+        tz = ZoneInfo(params.get("tz", "UTC"))
+    except (ValueError, ZoneInfoNotFoundError) as exc:
+        msg = "Invalid tz parameter"
+        raise ValueError(msg) from exc
+    include_completed = params.get("completed", "").lower() in {"1", "true"}
+    return days, tz, include_completed
+
+
+def parse_as_of_params(params: "QueryDict") -> tuple[int | None, datetime | None]:
+    """
+    Reads the version or at parameter of the as-of endpoint, exactly one of
+    which is given. Raises ValueError with the message of the error response.
+    """
+    if ("version" in params) == ("at" in params):
+        msg = 'Provide either the "version" or the "at" parameter'
+        raise ValueError(msg)
+    if "version" in params:
+        try:
+            version = int(params["version"])
+        except ValueError as exc:
+            msg = "Invalid version parameter"
+            raise ValueError(msg) from exc
+        if version < 0:
+            msg = '"version" parameter must not be negative'
+            raise ValueError(msg)
+        return version, None
+    try:
+        at = parse_datetime(params["at"])
+    except ValueError:
+        at = None
+    if at is None:
+        msg = "Invalid at parameter"
+        raise ValueError(msg)
+    return None, make_aware(at) if is_naive(at) else at
+
+
+class TaskViewSet(ExportMixin, ValuesListModelMixin, viewsets.ModelViewSet):
     """
     ViewSet to manage tasks.
     Supports:
@@ -56,13 +131,27 @@ class TaskViewSet(viewsets.ModelViewSet):
     - You can adjust the number of items per page using the 'page_size' query parameter:
     - GET /tasks?page_size=20
     - The maximum allowed value for 'page_size' is 100.
+    - Keyset pagination is used instead when a 'cursor' is given (empty for the first page):
+    - GET /tasks?cursor=&ordering=title
+    - The response holds a "next" link carrying the cursor of the following page and,
+      unlike page numbers, deep pages cost the same as the first one.
 
     Additional Endpoints:
     - GET /tasks/stats/ → Retrieves task statistics (total, completed, pending, completion rate).
     - GET /tasks/metrics/?days=<n> → Retrieves the number of tasks created over the last `n` days.
+    - GET /tasks/:id/as-of/?version=<n> or ?at=<datetime> → The task as it was after a change.
+    - GET /tasks/export/?format=ndjson|csv → Streams every task, with the filters and ordering above.
+    - POST /tasks/import/ → Creates tasks from an NDJSON or CSV file, in the background.
+    - GET /tasks/import/:job_id/ → The progress of an import.
+
+    Bulk Endpoints (a JSON array in the body, per-item results in the response):
+    - POST /tasks/bulk/ → Creates several tasks: [{"title": ..., "description": ...}, ...]
+    - PATCH /tasks/bulk/ → Updates several tasks: [{"id": ..., "is_completed": true}, ...]
+    - DELETE /tasks/bulk/ → Deletes several tasks: ["<task_id>", ...]
     """  # noqa: E501
 
     serializer_class = TaskSerializer  # type: ignore[override]
+    read_serializer_class = TaskReadSerializer  # Lists from .values() rows
     permission_classes = [IsAuthenticated]
     filter_backends = [  # type: ignore[override]
         DjangoFilterBackend,
@@ -72,18 +161,51 @@ class TaskViewSet(viewsets.ModelViewSet):
     filterset_class = TaskFilter  # Here, it is configured to allow filtering by the 'is_completed' field.  # noqa: E501
     ordering_fields = ["created_at", "title"]
     ordering = ["-created_at"]
+    export_name = "tasks"
+    export_csv_columns = TASK_CSV_COLUMNS
 
     @action(detail=False, url_path="stats")
     def get_task_stats(self, request: Request) -> Response:
         user = cast("User", request.user)
-        cache_key = f"user_stats_{user.id}"
-        if cached_data := cache.get(cache_key):
-            return Response(cached_data)
-        stats = calculate_task_stats(user).as_dict()
-        cache.set(cache_key, stats, 300)
-        return Response(stats)
-
-    @method_decorator(cache_page(60 * 5, key_prefix=lambda r: f"user_{r.user.id}_metrics"))  # noqa: E501 # type: ignore
+        return Response(cached_task_stats(user))
+
+    @action(detail=False, methods=["post", "patch", "delete"], url_path="bulk")
+    def bulk(self, request: Request) -> Response:
+        """
+        Applies a batch of creations, updates or deletions in a single request.
+
+        Each item is validated on its own: invalid items are reported in the
+        results while the valid ones are applied. Title uniqueness is checked
+        with one query per batch and the cache is cleared once.
+
+        Response format:
+        {
+            "results": [
+                {"index": 0, "status": 201, "task": {...}},
+                {"index": 1, "status": 400, "errors": {"title": ["..."]}}
+            ]
+        }
+        """
+        items = request.data
+        if not isinstance(items, list):
+            return Response(
+                {"error": "Expected a list of items."}, status=HTTPStatus.BAD_REQUEST
+            )
+        if len(items) > BULK_MAX_ITEMS:
+            return Response(
+                {"error": f"A batch cannot contain more than {BULK_MAX_ITEMS} items."},
+                status=HTTPStatus.BAD_REQUEST,
+            )
+        handlers = {
+            "POST": bulk_create_tasks,
+            "PATCH": bulk_update_tasks,
+            "DELETE": bulk_delete_tasks,
+        }
+        results = handlers[request.method](  # type: ignore[index]
+            cast("User", request.user), items, self.get_serializer_context()
+        )
+        return Response({"results": results}, status=HTTPStatus.OK)
+
     @action(detail=False, url_path="metrics")
     def task_metrics(self, request: Request) -> Response:
         """
@@ -91,9 +213,12 @@ class TaskViewSet(viewsets.ModelViewSet):
 
         Query Parameters:
         - days (optional, default=7): Number of past days to consider.
+        - tz (optional, default=UTC): IANA time zone used to split the days.
+        - completed (optional, default=false): Also return, per day, how many of the
+          tasks created that day are completed.
 
         Example Request:
-        GET /tasks/metrics?days=14
+        GET /tasks/metrics?days=14&tz=America/Sao_Paulo&completed=true
 
         Response format:
         {
@@ -102,40 +227,146 @@ class TaskViewSet(viewsets.ModelViewSet):
                 "10/02/2025": 3,
                 "11/02/2025": 5,
                 "12/02/2025": 2
+            },
+            "completed_distribution": {  # only with completed=true
+                "10/02/2025": 1,
+                "11/02/2025": 5,
+                "12/02/2025": 0
             }
         }
         """
         try:
-            days = int(request.query_params.get("days", 7))
-            if days < 1:
-                return Response(
-                    {"error": '"days" parameter must be greater than 0'},
-                    status=HTTPStatus.BAD_REQUEST,
-                )
-        except ValueError:
+            days, tz, include_completed = parse_metrics_params(request.query_params)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=HTTPStatus.BAD_REQUEST)
+        user = cast("User", request.user)
+        return Response(
+            cached_task_metrics(user, days, tz, include_completed),
+            status=HTTPStatus.OK,
+        )
+
+    @action(detail=False, url_path="export", renderer_classes=export_renderers)
+    def export(self, request: Request) -> StreamingHttpResponse | Response:
+        """
+        Streams all the tasks of the user, filtered by ?status= and sorted by
+        ?ordering= like the list, without pagination.
+
+        Query Parameters:
+        - format (optional, default=ndjson): ndjson (a task per line, as in the
+          list) or csv.
+        - compress (optional): gzip.
+        """
+        return self.stream_export(request, self.filter_queryset(self.get_queryset()))
+
+    @action(detail=False, methods=["post"], url_path="import")
+    def import_tasks(self, request: Request) -> Response:
+        """
+        Creates tasks from an uploaded file, in the background: the response
+        holds the import job, whose progress is polled at /tasks/import/<id>/.
+
+        Form fields (multipart):
+        - file: One task per line, as JSON objects (NDJSON) or CSV rows under a
+          header, with the title, description and is_completed fields.
+        - format (optional): ndjson or csv; by default, csv for .csv files and
+          ndjson otherwise.
+
+        Invalid lines and titles already taken are skipped and reported in the
+        job's errors, by line number.
+        """
+        upload = request.FILES.get("file")
+        if upload is None:
             return Response(
-                {"error": "Invalid days parameter"}, status=HTTPStatus.BAD_REQUEST
+                {"error": "A file is required."}, status=HTTPStatus.BAD_REQUEST
             )
-        start_date = now() - timedelta(days=days)
-        tasks = Task.objects.filter(user=request.user, created_at__gte=start_date)
-        task_count_by_day = Counter(task.created_at.date() for task in tasks)
-        ordered_metrics = {
-            date.strftime("%d/%m/%Y"): count
-            for date, count in sorted(task_count_by_day.items())
-        }
+        import_format = request.data.get("format") or (
+            IMPORT_FORMAT_CSV
+            if (upload.name or "").lower().endswith(".csv")
+            else IMPORT_FORMAT_NDJSON
+        )
+        if import_format not in IMPORT_FORMATS:
+            return Response(
+                {"error": f"Invalid format, expected one of: {', '.join(IMPORT_FORMATS)}"},  # noqa: E501
+                status=HTTPStatus.BAD_REQUEST,
+            )
+        job = create_import_job(cast("User", request.user), upload, import_format)
+        start_import_job(job)
         return Response(
-            {"days": days, "task_distribution": ordered_metrics}, status=HTTPStatus.OK
+            TaskImportJobSerializer(job).data,
+            status=HTTPStatus.ACCEPTED,
+            headers={"Location": request.build_absolute_uri(f"{job.id}/")},
+        )
+
+    @action(detail=False, url_path=r"import/(?P<job_id>[^/.]+)")
+    def import_job(self, request: Request, job_id: str) -> Response:
+        """The progress of an import job of the user; see import_tasks."""
+        try:
+            job = TaskImportJob.objects.get(user=request.user, id=uuid.UUID(job_id))
+        except (ValueError, TaskImportJob.DoesNotExist):
+            return Response(
+                {"error": "Import job not found."}, status=HTTPStatus.NOT_FOUND
+            )
+        return Response(TaskImportJobSerializer(job).data)
+
+    @action(detail=True, url_path="as-of")
+    def as_of(self, request: Request, pk: str | None = None) -> Response:
+        """
+        Rebuilds the task as it was after one of its changes, from the history.
+
+        Query Parameters (exactly one):
+        - version: The version to return; 0 is the task as created.
+        - at: An ISO 8601 date and time (in the current time zone when naive);
+          returns the version the task had then.
+
+        Response format:
+        {
+            "id": "...",
+            "version": 3,
+            "change_date": "2025-02-12T10:00:00Z",  # null for version 0
+            "title": "...",
+            "description": "...",
+            "is_completed": true
+        }
+        """
+        try:
+            version, at = parse_as_of_params(request.query_params)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=HTTPStatus.BAD_REQUEST)
+        task = self.get_object()
+        if at is not None:
+            version = task_version_at(task, at)
+        state = None if version is None else task_state_as_of(task, version)
+        if state is None:
+            return Response(
+                {"error": "No version of the task matches the given query."},
+                status=HTTPStatus.NOT_FOUND,
+            )
+        change_date = state.change_date
+        if change_date is not None:
+            change_date = format_datetime(change_date, get_current_timezone())
+        return Response({
+            "id": str(task.pk),
+            "version": state.version,
+            "change_date": change_date,
+            **state.fields,
+        })
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:  # noqa: ANN401
+        """
+        Serves list pages from the cache. Pages are stored per user under the
+        current generation, which every write bumps, so no page is ever stale.
+        """
+        cache_key = task_list_cache_key(
+            request.user.id, request.get_host(), request.query_params
         )
+        if (cached_page := cache.get(cache_key)) is not None:
+            return Response(cached_page)
+        response = super().list(request, *args, **kwargs)
+        cache.set(cache_key, response.data, TASK_LIST_TIMEOUT)
+        return response
 
     def get_queryset(self) -> QuerySet:  # type: ignore
-        cache_key = f"user_{self.request.user.id}_tasks"  # Unique key for each user
-        if task_ids := cache.get(cache_key):
-            return Task.objects.filter(id__in=task_ids)
-        queryset = Task.objects.filter(user=self.request.user)
-        cache.set(
-            cache_key, list(queryset.values_list("id", flat=True)), timeout=300
-        )  # 5 minute cache
-        return queryset
+        # The serializer renders the owner of every task: join it, no N+1
+        return Task.objects.filter(user=self.request.user).select_related("user")
 
     def perform_create(self, serializer: BaseSerializer) -> None:
         user = self.request.user
@@ -1,26 +1,50 @@
 
 import uuid
+from typing import Any
 
 from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
 
-from tasks.models import TaskHistory
-from tasks.serializers import TaskHistorySerializer
+from tasks.filters import TaskFilter
+from tasks.models import Task, TaskHistory
+from tasks.pagination import TaskHistoryPagination
+from tasks.serializers import TaskHistoryReadSerializer, TaskHistorySerializer
+from tasks.services.archive_service import read_archived_history
+from tasks.services.export_service import TASK_HISTORY_CSV_COLUMNS
+from tasks.services.history_service import decode_history_entry
+from tasks.views.mixins import ExportMixin, ValuesListModelMixin, export_renderers
 
 
-class TaskHistoryViewSet(viewsets.ReadOnlyModelViewSet):
+class TaskHistoryViewSet(
+    ExportMixin, ValuesListModelMixin, viewsets.ReadOnlyModelViewSet
+):
     """
     ViewSet to manage task history.
     Supports:
     - List all task history entries (GET /task-history)
     - List history entries for a specific task(GET /task-history?task=<task_id>)
+    - Include its archived entries (GET /task-history?task=<task_id>&archived=true)
+    - Stream the whole history (GET /task-history/export/?format=ndjson|csv)
+
+    Pagination:
+    - The full history is returned unless a cursor is requested with ?cursor=
+      (empty for the first page), which pages by (task, version) and returns a
+      "next" link holding the cursor of the following page.
     """
 
     queryset = TaskHistory.objects.all()
     serializer_class = TaskHistorySerializer  # type: ignore[bad-override]
+    read_serializer_class = TaskHistoryReadSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TaskHistoryPagination  # pyrefly: ignore [bad-override]
+    export_name = "tasks-history"
+    export_csv_columns = TASK_HISTORY_CSV_COLUMNS
 
     def get_queryset(self) -> QuerySet:  # type: ignore
         """
@@ -34,14 +58,55 @@ class TaskHistoryViewSet(viewsets.ReadOnlyModelViewSet):
 
         Raises ValidationError with HTTP 400 if the provided UUID is invalid.
         """
-        task_id = self.request.GET.get("task", None)
-        if task_id:
-            try:
-                task_uuid = uuid.UUID(task_id.strip().strip('"“”'))
-            except (ValueError, TypeError) as exc:
-                msg = "Invalid UUID format in 'task' parameter."
-                raise ValidationError(msg) from exc
+        task_uuid = self.get_task_id()
+        if task_uuid:
             return TaskHistory.objects.filter(
                 task_id=task_uuid, task__user=self.request.user
             )
         return TaskHistory.objects.filter(task__user=self.request.user)
+
+    def get_task_id(self) -> uuid.UUID | None:
+        task_id = self.request.GET.get("task", None)
+        if not task_id:
+            return None
+        try:
+            return uuid.UUID(task_id.strip().strip('"“”'))
+        except (ValueError, TypeError) as exc:
+            msg = "Invalid UUID format in 'task' parameter."
+            raise ValidationError(msg) from exc
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:  # noqa: ANN401
+        """
+        With ?archived=true the entries of the task moved to the archive by
+        archive_task_history follow those in the table. It needs ?task= and
+        returns the whole history of the task, without a cursor.
+        """
+        if request.query_params.get("archived", "").lower() not in {"1", "true"}:
+            return super().list(request, *args, **kwargs)
+        task_id = self.get_task_id()
+        if task_id is None or "cursor" in request.query_params:
+            msg = "The 'archived' parameter needs 'task' and no 'cursor'."
+            raise ValidationError(msg)
+        response = super().list(request, *args, **kwargs)
+        archived = read_archived_history(task_id, user=request.user)
+        response.data = [*response.data, *TaskHistoryReadSerializer(archived).data]
+        return response
+
+    def get_object(self) -> TaskHistory:
+        return decode_history_entry(super().get_object())
+
+    @action(detail=False, url_path="export", renderer_classes=export_renderers)
+    def export(self, request: Request) -> StreamingHttpResponse | Response:
+        """
+        Streams the history entries of the user by task and version, those of
+        one task with ?task=, of the tasks in a status with ?status= (as in
+        /tasks/), in the format (?format=ndjson|csv) and compression
+        (?compress=gzip) of /tasks/export/. Archived entries are not included.
+        """
+        queryset = self.get_queryset()
+        if "status" in request.query_params:
+            tasks = TaskFilter(
+                request.query_params, queryset=Task.objects.filter(user=request.user)
+            ).qs
+            queryset = queryset.filter(task__in=tasks.values("id"))
+        return self.stream_export(request, queryset.order_by("task_id", "version"))
@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"  # type: ignore
     name = "users"
+
+    def ready(self) -> None:
+        from django.contrib.auth.password_validation import (
+            get_default_password_validators,
+        )
+
+        from . import signals  # pylint: disable=all
+
+        # Built once per process (the list is cached): CommonPasswordValidator
+        # reads its 20k passwords here, at startup, not on the first request
+        get_default_password_validators()
@@ -0,0 +1,8 @@
+from django.urls import path
+
+from users.async_views import login
+
+# Async endpoints, mounted in front of users.urls by core.async_urls
+urlpatterns = [
+    path("users/login/", login),
+]
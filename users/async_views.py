@@ -0,0 +1,47 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import update_last_login
+from django.http import HttpRequest, HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.response import Response
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.views import TokenObtainPairView
+
+from users.hashers import aauthenticate_user
+
+_sync_login = TokenObtainPairView.as_view()
+
+
+@csrf_exempt
+async def login(request: HttpRequest) -> HttpResponse:
+    """
+    POST /users/login/ for the async serving mode, with the same responses as
+    TokenObtainPairView. The password is checked in the hasher thread pool
+    instead of the thread shared by all the sync views.
+    """
+    if request.method != "POST":
+        return await sync_to_async(_sync_login)(request)
+    view = TokenObtainPairView(args=(), kwargs={}, format_kwarg=None)
+    drf_request = view.initialize_request(request)
+    view.request = drf_request
+    view.headers = view.default_response_headers
+    try:
+        view.initial(drf_request)
+        serializer = view.get_serializer()
+        attrs = serializer.to_internal_value(drf_request.data)
+        user = await aauthenticate_user(
+            attrs[serializer.username_field], attrs["password"]
+        )
+        if user is None:
+            raise AuthenticationFailed(  # noqa: TRY301
+                serializer.error_messages["no_active_account"], "no_active_account"
+            )
+        if api_settings.UPDATE_LAST_LOGIN:
+            await sync_to_async(update_last_login)(None, user)
+        refresh = serializer.get_token(user)
+        response = Response(
+            {"refresh": str(refresh), "access": str(refresh.access_token)}
+        )
+    except Exception as exc:  # noqa: BLE001
+        response = view.handle_exception(exc)
+    return view.finalize_response(drf_request, response).render()
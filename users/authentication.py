@@ -0,0 +1,99 @@
+from typing import Any
+
+from django.http import HttpRequest
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from users.cache import (
+    USER_INACTIVE,
+    USER_MISSING,
+    aget_user_status,
+    get_user_status,
+)
+from users.models import TokenUser, User
+
+
+class AsyncJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication for async views: the token checks are the same and the
+    user is loaded with the async ORM.
+    """
+
+    async def aauthenticate(self, request: HttpRequest) -> tuple[User, Token] | None:
+        header = self.get_header(request)  # type: ignore[arg-type]
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token: Token) -> User:
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as exc:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from exc
+        try:
+            user = await User.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+        except User.DoesNotExist as exc:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found"
+            ) from exc
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+        return user
+
+
+class TokenUserAuthentication(AsyncJWTAuthentication):
+    """
+    Authenticates without the per-request user SELECT: ``request.user`` is a
+    TokenUser built from the token's user id, loaded on first access to any
+    other field. Deleted and deactivated users are still refused, from their
+    status cached by users.cache.
+
+    CHECK_REVOKE_TOKEN needs the password hash, so with it enabled the user is
+    loaded as usual.
+    """
+
+    def get_user(self, validated_token: Token) -> User:
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+        user_id = self.get_user_id(validated_token)
+        self.check_status(get_user_status(user_id))
+        return TokenUser.from_id(user_id)
+
+    async def aget_user(self, validated_token: Token) -> User:
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return await super().aget_user(validated_token)
+        user_id = self.get_user_id(validated_token)
+        self.check_status(await aget_user_status(user_id))
+        return TokenUser.from_id(user_id)
+
+    @staticmethod
+    def get_user_id(validated_token: Token) -> Any:  # noqa: ANN401
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as exc:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from exc
+
+    @staticmethod
+    def check_status(status: str) -> None:
+        if status == USER_MISSING:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if status == USER_INACTIVE:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
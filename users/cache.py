@@ -0,0 +1,94 @@
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+
+from users.models import User
+
+USER_ACTIVE = "active"
+USER_INACTIVE = "inactive"
+USER_MISSING = "missing"
+
+RATE_PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def _status_key(user_id: Any) -> str:  # noqa: ANN401
+    return f"user_{user_id}_auth_status"
+
+
+def _status_query(user_id: Any) -> Any:  # noqa: ANN401
+    return User.objects.filter(pk=user_id).values_list("is_active", flat=True)
+
+
+def _status(is_active: bool | None) -> str:  # noqa: FBT001
+    if is_active is None:
+        return USER_MISSING
+    return USER_ACTIVE if is_active else USER_INACTIVE
+
+
+def get_user_status(user_id: Any) -> str:  # noqa: ANN401
+    """
+    Whether the user may authenticate, cached for USER_STATUS_CACHE_TIMEOUT
+    seconds. Saves and deletes of the user refresh it right away; changes that
+    skip the signals (e.g. queryset.update) are picked up when it expires.
+    """
+    key = _status_key(user_id)
+    if (status := cache.get(key)) is None:
+        status = _status(_status_query(user_id).first())
+        cache.set(key, status, settings.USER_STATUS_CACHE_TIMEOUT)
+    return status
+
+
+async def aget_user_status(user_id: Any) -> str:  # noqa: ANN401
+    key = _status_key(user_id)
+    if (status := await cache.aget(key)) is None:
+        status = _status(await _status_query(user_id).afirst())
+        await cache.aset(key, status, settings.USER_STATUS_CACHE_TIMEOUT)
+    return status
+
+
+def set_user_status(user_id: Any, status: str) -> None:  # noqa: ANN401
+    cache.set(_status_key(user_id), status, settings.USER_STATUS_CACHE_TIMEOUT)
+
+
+def _blacklist_key(jti: str) -> str:
+    return f"jwt_blacklist_{jti}"
+
+
+def blacklist_token(jti: str, expires_at: int) -> bool:
+    """
+    Blacklists a token until its expiry (a Unix timestamp), after which it is
+    refused anyway. Returns False if it already was: the add is atomic, so of
+    concurrent refreshes with the same token only one may rotate it.
+    """
+    timeout = max(1, expires_at - int(time.time()))
+    return cache.add(_blacklist_key(jti), 1, timeout)
+
+
+def is_token_blacklisted(jti: str) -> bool:
+    return cache.get(_blacklist_key(jti)) is not None
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """Parses a DRF style rate ("10/min") into (requests, period in seconds)."""
+    requests, period = rate.split("/")
+    return int(requests), RATE_PERIODS[period[0]]
+
+
+def hit_refresh_limit(user_id: Any) -> int | None:  # noqa: ANN401
+    """
+    Counts a token refresh of the user in the current JWT_REFRESH_RATE window.
+    Returns the seconds until the window ends if the limit is exceeded.
+    """
+    limit, period = parse_rate(settings.JWT_REFRESH_RATE)
+    now = int(time.time())
+    window = now // period
+    key = f"user_{user_id}_refreshes_{window}"
+    cache.add(key, 0, period)
+    try:
+        count = cache.incr(key)
+    except ValueError:  # Expired between the add and the incr
+        count = 1
+        cache.set(key, count, period)
+    return (window + 1) * period - now if count > limit else None
@@ -0,0 +1,85 @@
+"""
+Password hashers whose cost comes from the settings, so it can be tuned per
+deployment (see PASSWORD_HASHER in core/settings.py).
+
+Django rehashes a password when it is checked with a hasher other than the
+preferred one, or with a different cost, so switching profile or cost upgrades
+the stored hashes on each user's next login.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+    make_password,
+    verify_password,
+)
+
+from users.models import User
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    @property
+    def iterations(self) -> int:  # type: ignore[override]
+        return settings.PASSWORD_HASHER_COST["pbkdf2_iterations"]
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    @property
+    def work_factor(self) -> int:  # type: ignore[override]
+        return settings.PASSWORD_HASHER_COST["scrypt_work_factor"]
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    @property
+    def time_cost(self) -> int:  # type: ignore[override]
+        return settings.PASSWORD_HASHER_COST["argon2_time_cost"]
+
+    @property
+    def memory_cost(self) -> int:  # type: ignore[override]
+        return settings.PASSWORD_HASHER_COST["argon2_memory_cost"]
+
+    @property
+    def parallelism(self) -> int:  # type: ignore[override]
+        return settings.PASSWORD_HASHER_COST["argon2_parallelism"]
+
+
+# Hashing holds no lock on the interpreter (hashlib and argon2-cffi release the
+# GIL), so each thread keeps a core busy
+_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count(), thread_name_prefix="password-hasher"
+)
+
+
+async def run_hasher(func: Any, *args: Any) -> Any:  # noqa: ANN401
+    return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+
+
+async def aauthenticate_user(username: str, password: str) -> User | None:
+    """
+    Async counterpart of ModelBackend.authenticate for the async login view.
+
+    Django's aauthenticate runs on the single thread shared by all sync code
+    and acheck_password hashes on the event loop; here the hashing runs in a
+    thread pool, so concurrent logins use every core without blocking the loop.
+    """
+    user = await User.objects.filter(username=username).afirst()
+    if user is None:
+        # Hash anyway, so a missing user takes as long as a wrong password
+        await run_hasher(make_password, password)
+        return None
+    is_correct, must_update = await run_hasher(
+        verify_password, password, user.password
+    )
+    if not is_correct:
+        return None
+    if must_update:
+        user.password = await run_hasher(make_password, password)
+        await user.asave(update_fields=["password"])
+    return user if user.is_active else None
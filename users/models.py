@@ -1,6 +1,7 @@
 # ruff: noqa: EM101, TRY003
 
 import uuid
+from typing import Any
 
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
 from django.db import models
@@ -41,3 +42,25 @@ class User(AbstractBaseUser):
 
     def __str__(self) -> str:
         return str(self.username)
+
+
+class TokenUser(User):
+    """
+    User authenticated from a JWT without reading the database: only the id is
+    set. The first access to any other field loads all of them in one query.
+    """
+
+    class Meta:
+        proxy = True
+
+    @classmethod
+    def from_id(cls, user_id: Any) -> "TokenUser":  # noqa: ANN401
+        return cls.from_db(None, ["id"], [cls._meta.pk.to_python(user_id)])  # type: ignore[union-attr]
+
+    def refresh_from_db(
+        self, using: str | None = None, fields: Any = None, **kwargs: Any  # noqa: ANN401
+    ) -> None:
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred.issuperset(fields):
+            fields = deferred  # Loading one deferred field: load the whole row
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
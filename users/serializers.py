@@ -1,8 +1,21 @@
 from typing import Any
 
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed, Throttled
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
 
+from users.cache import (
+    USER_ACTIVE,
+    get_user_status,
+    hit_refresh_limit,
+    is_token_blacklisted,
+)
 from users.models import User
+from users.tokens import RefreshToken
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -26,3 +39,47 @@ class UserSerializer(serializers.ModelSerializer):
         if not attrs.get("password"):
             raise serializers.ValidationError({"password": ["This field is required."]})
         return attrs
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    """
+    Same as simplejwt's, without database access: the user's status comes
+    from the cache and rotated tokens are blacklisted there. Refreshes are
+    limited per user to JWT_REFRESH_RATE.
+    """
+
+    token_class = RefreshToken
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, str]:
+        refresh = self.token_class(attrs["refresh"])
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        if (wait := hit_refresh_limit(user_id)) is not None:
+            raise Throttled(wait)
+        if get_user_status(user_id) != USER_ACTIVE:
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"], "no_active_account"
+            )
+
+        data = {"access": str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            # A token refreshed twice concurrently is rotated only once
+            if api_settings.BLACKLIST_AFTER_ROTATION and not refresh.blacklist():
+                raise TokenError(_("Token is blacklisted"))
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data["refresh"] = str(refresh)
+        return data
+
+
+class TokenVerifySerializer(jwt_serializers.TokenVerifySerializer):
+    def validate(self, attrs: dict[str, Any]) -> dict[Any, Any]:
+        token = UntypedToken(attrs["token"])
+        if is_token_blacklisted(token.get(api_settings.JTI_CLAIM)):
+            msg = "Token is blacklisted"
+            raise serializers.ValidationError(msg)
+        return {}
+
+
+class TokenBlacklistSerializer(jwt_serializers.TokenBlacklistSerializer):
+    token_class = RefreshToken
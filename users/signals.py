@@ -0,0 +1,20 @@
+from typing import Any
+
+from django.db.models.base import Model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import USER_ACTIVE, USER_INACTIVE, USER_MISSING, set_user_status
+from .models import User
+
+
+@receiver(post_save, sender=User)
+def refresh_user_status(sender: type[Model], instance: User, **_kwargs: dict[str, Any]) -> None:  # noqa: E501 # pylint: disable=unused-argument
+    if "is_active" in instance.get_deferred_fields():
+        return  # Saved without loading it: the status did not change
+    set_user_status(instance.pk, USER_ACTIVE if instance.is_active else USER_INACTIVE)
+
+
+@receiver(post_delete, sender=User)
+def forget_user_status(sender: type[Model], instance: User, **_kwargs: dict[str, Any]) -> None:  # noqa: E501 # pylint: disable=unused-argument
+    set_user_status(instance.pk, USER_MISSING)
@@ -0,0 +1,93 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tasks.tests.helpers import QueryBudgetMixin
+from users.authentication import TokenUserAuthentication
+from users.cache import USER_ACTIVE, get_user_status
+from users.models import TokenUser, User
+
+
+class TokenUserAuthenticationTest(QueryBudgetMixin, TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(username="João", password="João123")
+        self.request = APIRequestFactory().get(
+            "/tasks/", HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+        self.authentication = TokenUserAuthentication()
+
+    def authenticate(self) -> User:
+        user, _token = self.authentication.authenticate(self.request)  # type: ignore[misc]
+        return user
+
+    def test_authenticates_without_loading_the_user(self) -> None:
+        self.authenticate()  # Caches the status
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+        self.assertIsInstance(user, TokenUser)
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertTrue(user.is_authenticated)
+
+    def test_loads_every_field_on_first_access(self) -> None:
+        user = self.authenticate()
+        with self.assertNumQueries(1):
+            self.assertEqual(user.username, "João")
+            self.assertTrue(user.is_active)
+            self.assertEqual(user.password, self.user.password)
+
+    def test_async_authenticates_without_loading_the_user(self) -> None:
+        self.authenticate()
+        with self.assertNumQueries(0):
+            user, _token = async_to_sync(self.authentication.aauthenticate)(self.request)  # type: ignore[misc]  # noqa: E501
+        self.assertIsInstance(user, TokenUser)
+
+    def test_deactivated_user_is_refused(self) -> None:
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaisesMessage(AuthenticationFailed, "User is inactive"):
+            self.authenticate()
+
+    def test_deleted_user_is_refused(self) -> None:
+        self.authenticate()
+        self.user.delete()
+        with self.assertRaisesMessage(AuthenticationFailed, "User not found"):
+            self.authenticate()
+
+    def test_update_without_signals_applies_when_the_status_expires(self) -> None:
+        self.authenticate()
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.authenticate()  # Still cached as active
+        cache.clear()  # Expired
+        with self.assertRaisesMessage(AuthenticationFailed, "User is inactive"):
+            self.authenticate()
+
+    def test_saving_the_lazy_user_keeps_its_status(self) -> None:
+        user = self.authenticate()
+        user.save(update_fields=["last_login"])
+        self.assertEqual(get_user_status(self.user.pk), USER_ACTIVE)
+
+    # The views read DEFAULT_AUTHENTICATION_CLASSES when they are defined
+    @mock.patch.object(APIView, "authentication_classes", [TokenUserAuthentication])
+    def test_endpoints(self) -> None:
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=self.request.META["HTTP_AUTHORIZATION"])
+        client.get("/tasks/")  # Caches the status and the page
+        with self.assertQueryBudget(0, "Cached task list"):
+            response = client.get("/tasks/")
+        self.assertEqual(response.status_code, 200)
+
+        response = client.post("/tasks/", {"title": "New task"})
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()["user"]["username"], "João")
+
+        with self.assertQueryBudget(1, "User profile"):
+            response = client.get("/users/me/")
+        self.assertEqual(response.json()["user"]["username"], "João")
@@ -0,0 +1,75 @@
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.test import AsyncClient, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from users.models import User
+
+FAST_COST = {
+    **settings.PASSWORD_HASHER_COST,
+    "pbkdf2_iterations": 1_000,
+    "scrypt_work_factor": 2**10,
+}
+PBKDF2_FIRST = [
+    "users.hashers.TunedPBKDF2PasswordHasher",
+    "users.hashers.TunedScryptPasswordHasher",
+]
+SCRYPT_FIRST = PBKDF2_FIRST[::-1]
+
+
+@override_settings(PASSWORD_HASHER_COST=FAST_COST, PASSWORD_HASHERS=PBKDF2_FIRST)
+class PasswordHasherTest(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="João", password="João123")
+
+    def sync_login(self, **data: str) -> object:
+        data = {"username": "João", "password": "João123", **data}
+        return APIClient().post("/users/login/", data)
+
+    def async_login(self, **data: str) -> object:
+        data = {"username": "João", "password": "João123", **data}
+        with override_settings(ROOT_URLCONF="core.async_urls"):
+            return async_to_sync(AsyncClient().post)("/users/login/", data)
+
+    def stored_hash(self) -> str:
+        return User.objects.values_list("password", flat=True).get(pk=self.user.pk)
+
+    def test_login_upgrades_the_hasher(self) -> None:
+        for login in (self.sync_login, self.async_login):
+            with self.subTest(login=login.__name__):
+                self.user.set_password("João123")
+                self.user.save()
+                self.assertTrue(self.stored_hash().startswith("pbkdf2_sha256$1000$"))
+                with override_settings(PASSWORD_HASHERS=SCRYPT_FIRST):
+                    response = login()
+                    self.assertEqual(response.status_code, 200)  # type: ignore[attr-defined]
+                    self.assertTrue(self.stored_hash().startswith("scrypt$"))
+                    self.assertEqual(login().status_code, 200)  # type: ignore[attr-defined]
+
+    def test_login_upgrades_the_cost(self) -> None:
+        cost = {**FAST_COST, "pbkdf2_iterations": 2_000}
+        with override_settings(PASSWORD_HASHER_COST=cost):
+            self.async_login()
+        self.assertTrue(self.stored_hash().startswith("pbkdf2_sha256$2000$"))
+
+    def test_async_login_answers_like_the_sync_one(self) -> None:
+        expected = self.sync_login()
+        response = self.async_login()
+        self.assertEqual(response.status_code, 200)  # type: ignore[attr-defined]
+        self.assertEqual(response.json().keys(), expected.json().keys())  # type: ignore[attr-defined]
+
+        for case in ({"password": "wrong"}, {"username": "Maria"}, {"password": ""}):
+            with self.subTest(case=case):
+                expected = self.sync_login(**case)
+                response = self.async_login(**case)
+                self.assertEqual(response.status_code, expected.status_code)  # type: ignore[attr-defined]
+                self.assertEqual(response.content, expected.content)  # type: ignore[attr-defined]
+                self.assertEqual(
+                    response.get("WWW-Authenticate"),  # type: ignore[attr-defined]
+                    expected.get("WWW-Authenticate"),  # type: ignore[attr-defined]
+                )
+
+    def test_inactive_user_cannot_log_in(self) -> None:
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.async_login().status_code, 401)  # type: ignore[attr-defined]
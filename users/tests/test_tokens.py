@@ -0,0 +1,63 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.models import User
+
+
+class TokenRefreshTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user(username="João", password="João123")
+        self.refresh = str(RefreshToken.for_user(self.user))
+        self.client = APIClient()
+
+    def post_refresh(self, refresh: str) -> object:
+        return self.client.post("/users/token/refresh/", {"refresh": refresh})
+
+    def test_refresh_rotates_without_queries(self) -> None:
+        with self.assertNumQueries(0):  # The user status was cached by the save
+            response = self.post_refresh(self.refresh)
+        self.assertEqual(response.status_code, 200, response.content)  # type: ignore[attr-defined]
+        self.assertIn("access", response.json())  # type: ignore[attr-defined]
+        self.assertNotEqual(response.json()["refresh"], self.refresh)  # type: ignore[attr-defined]
+
+    def test_rotated_token_is_refused(self) -> None:
+        self.post_refresh(self.refresh)
+        response = self.post_refresh(self.refresh)
+        self.assertEqual(response.status_code, 401)  # type: ignore[attr-defined]
+        self.assertEqual(response.json()["code"], "token_not_valid")  # type: ignore[attr-defined]
+
+        response = self.client.post("/users/token/verify/", {"token": self.refresh})
+        self.assertEqual(response.status_code, 400)
+
+    def test_blacklisted_token_is_refused(self) -> None:
+        response = self.client.post(
+            "/users/token/blacklist/", {"refresh": self.refresh}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.post_refresh(self.refresh).status_code, 401)  # type: ignore[attr-defined]
+
+    def test_inactive_user_is_refused(self) -> None:
+        self.user.is_active = False
+        self.user.save()
+        response = self.post_refresh(self.refresh)
+        self.assertEqual(response.status_code, 401)  # type: ignore[attr-defined]
+        self.assertEqual(
+            response.json()["detail"],  # type: ignore[attr-defined]
+            "No active account found for the given token.",
+        )
+
+    @override_settings(JWT_REFRESH_RATE="2/min")
+    def test_refreshes_are_rate_limited_per_user(self) -> None:
+        refresh = self.refresh
+        for _ in range(2):
+            refresh = self.post_refresh(refresh).json()["refresh"]  # type: ignore[attr-defined]
+        response = self.post_refresh(refresh)
+        self.assertEqual(response.status_code, 429)  # type: ignore[attr-defined]
+        self.assertIn("Retry-After", response)
+
+        other = User.objects.create_user(username="Maria", password="Maria123")
+        response = self.post_refresh(str(RefreshToken.for_user(other)))
+        self.assertEqual(response.status_code, 200)  # type: ignore[attr-defined]
@@ -0,0 +1,28 @@
+from typing import Any
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from users.cache import blacklist_token, is_token_blacklisted
+
+
+class RefreshToken(tokens.RefreshToken):
+    """
+    RefreshToken blacklisted in the cache instead of the token_blacklist app's
+    tables: one key per token, expiring with it.
+    """
+
+    def verify(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        self.check_blacklist()
+        super().verify(*args, **kwargs)
+
+    def check_blacklist(self) -> None:
+        if is_token_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self) -> bool:  # type: ignore[override]
+        """Returns False if the token was already blacklisted."""
+        jti = self.payload[api_settings.JTI_CLAIM]
+        return blacklist_token(jti, self.payload["exp"])